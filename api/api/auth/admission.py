@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+import math
+import time
+
+from fastapi import HTTPException, status
+
+from api.core.cache import TTLCache
+from api.core.config import settings
+from api.models.user import ApiServiceTier
+
+@dataclass(frozen=True)
+class TierLimits:
+    """
+    Admission limits of one service tier.
+    """
+
+    requests_per_second: float
+    burst: int
+    max_concurrent_requests: int
+    max_results: int
+    shed_threshold: float
+
+    @classmethod
+    def from_settings(cls, tier: ApiServiceTier) -> "TierLimits":
+        return cls(requests_per_second=getattr(settings, f"{tier.value}_requests_per_second"),
+                   burst=getattr(settings, f"{tier.value}_burst"),
+                   max_concurrent_requests=getattr(settings, f"{tier.value}_max_concurrent_requests"),
+                   max_results=getattr(settings, f"{tier.value}_max_results"),
+                   shed_threshold=getattr(settings, f"{tier.value}_shed_threshold"))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `burst` tokens and refills at a fixed rate.
+    Every admitted request takes one token.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Takes a token if one is available.
+
+        :return: 0 if a token was taken, otherwise the number of seconds until the next token is available.
+        """
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+
+@dataclass
+class Admission:
+    """
+    An admitted request, as returned by the `admit_request` dependency.
+    """
+
+    user_id: str
+    tier: ApiServiceTier
+    limits: TierLimits
+
+    def cap_results(self, limit: int) -> int:
+        """
+        Caps a requested number of results at the maximum of the caller's tier.
+
+        :param limit: The number of results the client asked for.
+
+        :return: The number of results to return.
+        """
+
+        return min(limit, self.limits.max_results)
+
+
+class AdmissionController:
+    """
+    Decides per request whether to admit it, based on the caller's service tier.
+    Requests are rejected with 429 Too Many Requests and a Retry-After header when:
+
+    * the worker is saturated: in-flight requests have reached the tier's share of the worker's capacity.
+      Lower tiers have lower shares, so free traffic is shed first and premium traffic keeps headroom;
+    * the tier already has its maximum number of requests in flight;
+    * the user's token bucket is empty.
+
+    State is kept per worker process, which keeps admission free of database round trips.
+    """
+
+    def __init__(self, max_concurrent_requests: int, buckets_size: int):
+        self.max_concurrent_requests = max_concurrent_requests
+        self.limits = {tier: TierLimits.from_settings(tier) for tier in ApiServiceTier}
+        self.in_flight = 0
+        self.tier_in_flight = {tier: 0 for tier in ApiServiceTier}
+        self.rejections = {(tier, reason): 0 for tier in ApiServiceTier for reason in ("shed", "concurrency", "rate_limit")}
+
+        # An idle bucket is full again after burst / rate seconds, so expiring it then loses nothing
+        max_refill_seconds = max(limits.burst / limits.requests_per_second for limits in self.limits.values())
+        self.buckets = TTLCache(max_size=buckets_size, ttl_seconds=max_refill_seconds)
+
+    def reject(self, tier: ApiServiceTier, reason: str, retry_after_seconds: float):
+        self.rejections[(tier, reason)] += 1
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                            detail="Rate limit exceeded, please retry later" if reason == "rate_limit" else "Service busy, please retry shortly",
+                            headers={"Retry-After": str(max(1, math.ceil(retry_after_seconds)))})
+
+    def admit(self, user_id: str, tier: ApiServiceTier) -> Admission:
+        """
+        Admits a request or rejects it. Admitted requests must be released with `release` once they complete.
+
+        :param user_id: The id of the requesting user.
+        :param tier: The user's service tier.
+
+        :return: The admission, carrying the tier's limits.
+
+        :raises HTTPException: 429 with a Retry-After header if the request is not admitted.
+        """
+
+        limits = self.limits[tier]
+        if self.in_flight >= limits.shed_threshold * self.max_concurrent_requests:
+            self.reject(tier, "shed", 1)
+        if self.tier_in_flight[tier] >= limits.max_concurrent_requests:
+            self.reject(tier, "concurrency", 1)
+
+        # Buckets are keyed by tier as well, so a tier change applies the new rate right away
+        bucket_key = (user_id, tier)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            bucket = TokenBucket(limits.requests_per_second, limits.burst)
+        self.buckets.set(bucket_key, bucket, ttl_seconds=limits.burst / limits.requests_per_second)
+
+        retry_after_seconds = bucket.take()
+        if retry_after_seconds:
+            self.reject(tier, "rate_limit", retry_after_seconds)
+
+        self.in_flight += 1
+        self.tier_in_flight[tier] += 1
+        return Admission(user_id=user_id, tier=tier, limits=limits)
+
+    def release(self, admission: Admission):
+        self.in_flight -= 1
+        self.tier_in_flight[admission.tier] -= 1
+
+    def stats(self) -> dict[str, float]:
+        stats = {"max_concurrent_requests": self.max_concurrent_requests, "in_flight": self.in_flight}
+        for tier in ApiServiceTier:
+            stats[f"{tier.value}_in_flight"] = self.tier_in_flight[tier]
+        for (tier, reason), count in self.rejections.items():
+            stats[f"{tier.value}_rejected_{reason}"] = count
+
+        return stats
+
+
+admission_controller = AdmissionController(max_concurrent_requests=settings.max_concurrent_requests,
+                                           buckets_size=settings.rate_limit_buckets_size)
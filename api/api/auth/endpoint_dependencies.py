@@ -1,13 +1,92 @@
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
+import hashlib
+import time
+from typing import AsyncIterator
 
+from api.auth.admission import Admission, admission_controller
 from api.auth.security import ALGORITHM
+from api.core.cache import TTLCache
 from api.core.config import settings
-from api.models.user import User
+from api.core.metrics import jwt_decode_duration
+from api.core.single_flight import SingleFlight
+from api.models.user import ApiServiceTier, User
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Verified access token claims keyed by token digest; entries never outlive the token's `exp` claim
+token_claims_cache = TTLCache(max_size=settings.token_cache_size, ttl_seconds=settings.token_cache_ttl_seconds)
+
+# User records keyed by user id; bounds how long a disabled account may still be served from memory
+user_cache = TTLCache(max_size=settings.user_cache_size, ttl_seconds=settings.user_cache_ttl_seconds)
+
+# Concurrent requests of one user missing the user cache share a single database read
+user_lookups = SingleFlight()
+
+# Bumped on every invalidation. A lookup only caches its record if no invalidation happened while it was
+# reading, as the record it read may predate the change that caused the invalidation.
+user_cache_generation = 0
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verifies an access token and returns its claims, reusing previously verified claims when possible.
+
+    :param token: The encoded JWT access token.
+
+    :return: The decoded token claims.
+
+    :raises JWTError: If the token is invalid or expired.
+    """
+
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = token_claims_cache.get(digest)
+    if claims is None:
+        with jwt_decode_duration.time():
+            claims = jwt.decode(token, settings.jwt_secret_key, algorithms=[ALGORITHM])
+        token_claims_cache.set(digest, claims, ttl_seconds=claims["exp"] - time.time())
+
+    return claims
+
+
+async def get_cached_user(user_id: str) -> User | None:
+    """
+    Looks up a user by id, serving recently loaded records from the user cache.
+    Concurrent lookups of the same uncached user share one database read.
+
+    :param user_id: The id of the user to retrieve.
+
+    :return: The User object, or None if no such user exists.
+    """
+
+    async def load_user() -> User | None:
+        generation = user_cache_generation
+        loaded_user = await User.get(user_id)
+        if loaded_user and generation == user_cache_generation:
+            user_cache.set(user_id, loaded_user)
+        return loaded_user
+
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await user_lookups.run(user_id, load_user)
+
+    return user
+
+
+def invalidate_cached_user(user_id: str):
+    """
+    Removes a user from the user cache. This must be called whenever a user record changes,
+    for example when an account is disabled, so the change takes effect immediately.
+
+    :param user_id: The id of the user whose cached record is stale.
+    """
+
+    global user_cache_generation
+    user_cache_generation += 1
+    user_cache.invalidate(user_id)
+    user_lookups.forget(user_id)
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> User:
     """
     Dependency to retrieve the currently authenticated user based on the provided JWT token.
@@ -23,11 +102,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(b
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     try:
-        payload = jwt.decode(credentials.credentials,
-                             settings.jwt_secret_key,
-                             algorithms=[ALGORITHM])
+        payload = decode_access_token(credentials.credentials)
 
-        user = await User.get(payload["sub"])
+        user = await get_cached_user(payload["sub"])
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
@@ -37,3 +114,47 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(b
         return user
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency to restrict an endpoint to users of the admin service tier.
+
+    :param user: The authenticated user.
+
+    :return: The authenticated admin User object.
+    """
+
+    if user.tier != ApiServiceTier.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+
+    return user
+
+
+async def admit_request(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> AsyncIterator[Admission]:
+    """
+    Dependency applying tier-based admission control to an authenticated endpoint.
+    The tier is read from the `scope` claim of the access token, which is usually served from the claims cache,
+    so rejected requests never reach the database. Use it alongside `get_current_user`, which still
+    verifies that the account exists and is active, and declare it before `get_current_user`:
+    FastAPI resolves dependencies in declaration order, and the user lookup must only run once admitted.
+
+    :param credentials: HTTPAuthorizationCredentials object containing the JWT token.
+
+    :return: The admission, whose tier limits cap the number of results.
+    """
+
+    if not credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    try:
+        claims = decode_access_token(credentials.credentials)
+        tier = ApiServiceTier(claims["scope"])
+    except (JWTError, KeyError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+    admission = admission_controller.admit(claims["sub"], tier)
+    try:
+        yield admission
+    finally:
+        admission_controller.release(admission)
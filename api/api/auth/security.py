@@ -1,11 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 import hashlib
 import secrets
+import time
+from typing import Callable, TypeVar
 from beanie import PydanticObjectId
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 
 from api.core.config import settings
+from api.core.metrics import password_hashing_duration, password_hashing_wait
 from api.models.refresh_token import RefreshToken
 
 ALGORITHM = "HS256"
@@ -14,6 +20,8 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+T = TypeVar("T")
+
 def normalize_password(password: str) -> bytes:
     """
     Normalizes the password by encoding it to UTF-8 and hashing it using SHA-256.
@@ -52,6 +60,88 @@ def verify_password(password: str, hash: str) -> bool:
     return pwd_context.verify(normalize_password(password), hash)
 
 
+class PasswordHashingPool:
+    """
+    Runs CPU-heavy password hashing on a dedicated, bounded thread pool instead of the event loop.
+    Argon2 releases the GIL while hashing, so worker threads hash in parallel while the event loop keeps
+    serving other requests. Once every worker is busy and the wait queue is full, new work is rejected
+    immediately so that a burst of logins cannot build an unbounded backlog.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hashing")
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """
+        Runs a hashing function on the worker pool and waits for its result.
+
+        :param function: The blocking function to run, e.g. hash_password or verify_password.
+        :param args: Positional arguments for the function.
+
+        :return: The function's return value.
+
+        :raises HTTPException: 503 with a Retry-After header if the wait queue is full.
+        """
+
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Too many authentication requests, please retry shortly",
+                                headers={"Retry-After": "1"})
+
+        submitted_at = time.perf_counter()
+
+        def timed_call() -> tuple[T, float, float]:
+            started_at = time.perf_counter()
+            result = function(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        self.pending += 1
+        try:
+            result, wait_seconds, hash_seconds = await asyncio.get_running_loop().run_in_executor(self.executor, timed_call)
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        self.total_hash_seconds += hash_seconds
+        self.max_hash_seconds = max(self.max_hash_seconds, hash_seconds)
+        password_hashing_wait.observe(wait_seconds)
+        password_hashing_duration.observe(hash_seconds, function.__name__)
+
+        return result
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "average_hash_seconds": self.total_hash_seconds / self.completed if self.completed else 0.0,
+            "max_hash_seconds": self.max_hash_seconds,
+            "average_wait_seconds": self.total_wait_seconds / self.completed if self.completed else 0.0,
+            "max_wait_seconds": self.max_wait_seconds
+        }
+
+
+password_hashing_pool = PasswordHashingPool(max_workers=settings.password_hashing_workers,
+                                            max_queue=settings.password_hashing_max_queue)
+
+
 def create_access_token(data: dict) -> str:
     """
     Creates an access token using JWT. This is a short-lived token used for authenticating user requests.
@@ -66,6 +156,20 @@ def create_access_token(data: dict) -> str:
 
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=ALGORITHM)
 
+def hash_refresh_token(refresh_token: str) -> str:
+    """
+    Computes the digest under which a refresh token is stored and looked up.
+    Refresh tokens are random and high-entropy, so a fast SHA-256 digest is sufficient;
+    a leaked database does not reveal usable tokens.
+
+    :param refresh_token: The refresh token value given to the client.
+
+    :return: The hex-encoded SHA-256 digest of the token.
+    """
+
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
 async def create_refresh_token(user_id: PydanticObjectId) -> str:
     """
     Creates a secure refresh token. This is a long-lived token used to obtain new access tokens without re-authenticating.
@@ -78,7 +182,7 @@ async def create_refresh_token(user_id: PydanticObjectId) -> str:
     refresh_token_value = secrets.token_urlsafe(32)
     await RefreshToken(
         user_id=user_id,
-        token=refresh_token_value,
+        token_hash=hash_refresh_token(refresh_token_value),
         expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     ).insert()
 
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+import time
+from typing import Any, Hashable
+
+class TTLCache:
+    """
+    Bounded in-process cache combining least-recently-used eviction with per-entry expiry.
+    Hit and miss counters are kept so cache effectiveness can be monitored.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the cached value for a key, or None if it is missing or expired.
+
+        :param key: The cache key.
+
+        :return: The cached value or None.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        :param key: The cache key.
+        :param value: The value to cache.
+        :param ttl_seconds: Lifetime of this entry; capped at the cache-wide TTL.
+        """
+
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
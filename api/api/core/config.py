@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from pathlib import Path
 import os
 
 db_port = os.environ["MONGO_HOST_PORT"]
@@ -13,4 +14,67 @@ class Settings(BaseSettings):
     mongodb_db: str = target_db_name
     jwt_secret_key: str = jwt_secret_key
 
+    # Connection pool and driver options; see the pymongo MongoClient documentation for details.
+    # Compressors are a comma-separated list such as "zstd,zlib"; zstd and snappy need extra packages.
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int | None = None
+    mongo_wait_queue_timeout_ms: int | None = None
+    mongo_connect_timeout_ms: int = 20_000
+    mongo_server_selection_timeout_ms: int = 30_000
+    mongo_compressors: str = ""
+    mongo_read_preference: str = "primary"
+    # Best-effort number of connections to open at startup; mongo_min_pool_size is the guaranteed floor
+    mongo_prewarm_connections: int = 0
+    # Reconcile indexes with the model declarations at startup and warn about hot-path queries scanning a collection
+    mongo_reconcile_indexes: bool = True
+
+    token_cache_size: int = 10_000
+    token_cache_ttl_seconds: float = 300
+    user_cache_size: int = 10_000
+    user_cache_ttl_seconds: float = 30
+
+    password_hashing_workers: int = 4
+    password_hashing_max_queue: int = 32
+
+    result_cache_size: int = 10_000
+    result_cache_ttl_seconds: float = 3600
+
+    export_batch_size: int = 1000
+    max_analysis_text_length: int = 100_000
+
+    # Binary corpus snapshot written by populate_db.py and memory-mapped by every API worker; empty to disable
+    corpus_snapshot_path: str = str(Path(__file__).resolve().parent.parent / "corpus.snapshot")
+
+    # Rebuild the search engine when the corpus version changes, watched through a change stream on replica sets
+    # and polled otherwise. Reloads wait for the debounce delay so that a burst of version bumps triggers a single reload.
+    corpus_reload_enabled: bool = True
+    corpus_reload_poll_seconds: float = 5.0
+    corpus_reload_debounce_seconds: float = 1.0
+
+    # Admission control per service tier: sustained request rate and burst size per user, concurrent requests
+    # per worker and results per query. Once the worker's in-flight requests reach a tier's share of
+    # max_concurrent_requests, that tier's new requests are shed, so free traffic goes first.
+    max_concurrent_requests: int = 128
+    rate_limit_buckets_size: int = 100_000
+    free_requests_per_second: float = 5
+    free_burst: int = 20
+    free_max_concurrent_requests: int = 32
+    free_max_results: int = 25
+    free_shed_threshold: float = 0.75
+    premium_requests_per_second: float = 50
+    premium_burst: int = 100
+    premium_max_concurrent_requests: int = 96
+    premium_max_results: int = 100
+    premium_shed_threshold: float = 0.95
+    admin_requests_per_second: float = 100
+    admin_burst: int = 200
+    admin_max_concurrent_requests: int = 32
+    admin_max_results: int = 100
+    admin_shed_threshold: float = 1.0
+
+    # Requests and database commands at least this slow are logged with their query
+    slow_request_seconds: float = 1.0
+    slow_command_seconds: float = 0.25
+
 settings = Settings()
@@ -1,27 +1,76 @@
 from pymongo import AsyncMongoClient
 from beanie import init_beanie
+import asyncio
 
 from api.core.config import settings
+from api.core.mongo_monitoring import CommandMonitor, ConnectionPoolMonitor
+from api.models.corpus_version import CorpusVersion
 from api.models.idiom import Idiom
 from api.models.refresh_token import RefreshToken
 from api.models.user import User
 
 client: AsyncMongoClient | None = None
 
+pool_monitor = ConnectionPoolMonitor(max_pool_size=settings.mongo_max_pool_size)
+command_monitor = CommandMonitor(slow_command_seconds=settings.slow_command_seconds)
+
+def mongo_client_options() -> dict:
+    """
+    Builds the keyword options for the Mongo client from the application settings.
+
+    :return: Options to pass to AsyncMongoClient.
+    """
+
+    options = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+        "event_listeners": [pool_monitor, command_monitor]
+    }
+
+    if settings.mongo_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongo_max_idle_time_ms
+    if settings.mongo_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongo_wait_queue_timeout_ms
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+
+    return options
+
+
 async def init_db():
     global client
-    client = AsyncMongoClient(settings.mongo_database_connection_uri)
+    client = AsyncMongoClient(settings.mongo_database_connection_uri, **mongo_client_options())
 
+    # Indexes are reconciled by api.core.indexes, which can also rebuild indexes whose options changed
     await init_beanie(
         database=client[settings.mongodb_db],
         document_models=[
+            CorpusVersion,
             Idiom,
             RefreshToken,
             User
-        ]
+        ],
+        skip_indexes=True
     )
 
 
+async def prewarm_pool(connection_count: int):
+    """
+    Opens connections ahead of the first requests by running concurrent pings. This is best-effort:
+    the driver creates at most two connections at a time and hands a finished ping's connection
+    to the next waiting one, so fewer connections than requested may be opened.
+    Set mongo_min_pool_size to keep a guaranteed number of connections open.
+
+    :param connection_count: Upper bound of the number of connections to open.
+    """
+
+    if client and connection_count > 0:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(connection_count)))
+
+
 async def close_db():
     global client
     if client:
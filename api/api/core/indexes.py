@@ -0,0 +1,214 @@
+from dataclasses import dataclass
+from typing import Any
+
+from beanie import Document
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from api.core import database
+from api.core.config import settings
+from api.models.idiom import Idiom
+from api.models.refresh_token import RefreshToken
+from api.models.user import EMAIL_COLLATION, User
+
+INDEXED_MODELS: tuple[type[Document], ...] = (Idiom, RefreshToken, User)
+
+# Index options that change what an index does; others reported by the server, such as the index version, are ignored
+COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+# Another worker reconciling at the same time may already have dropped the index
+INDEX_NOT_FOUND = 27
+
+@dataclass(frozen=True)
+class CanonicalQuery:
+    """
+    A query an endpoint runs on every request, with representative values. Its command is explained
+    as-is, so it must use the same filter, sort and collation as the code it stands for.
+    """
+
+    name: str
+    command: dict[str, Any]
+
+
+# The corpus_version collection holds a single document and full corpus reads are meant to scan, so neither is listed
+CANONICAL_QUERIES = (
+    CanonicalQuery("register and login: user by email",
+                   {"find": User.Settings.name, "filter": {"email": "user@example.com"},
+                    "collation": EMAIL_COLLATION.document, "limit": 1}),
+    CanonicalQuery("authentication: user by id",
+                   {"find": User.Settings.name, "filter": {"_id": ObjectId()}, "limit": 1}),
+    CanonicalQuery("refresh: take refresh token by hash",
+                   {"findAndModify": RefreshToken.Settings.name, "query": {"token_hash": "0" * 64}, "remove": True,
+                    "fields": {"user_id": 1, "expires_at": 1}}),
+    CanonicalQuery("search: idioms by starting letter",
+                   {"find": Idiom.Settings.name, "filter": {"sort_key": {"$gte": "a", "$lt": "b"}},
+                    "sort": {"sort_key": 1}, "limit": 10}),
+    CanonicalQuery("export: idioms changed since a corpus version",
+                   {"find": Idiom.Settings.name, "filter": {"corpus_version": {"$gt": 1}}}),
+    CanonicalQuery("populate: upsert idiom by text",
+                   {"update": Idiom.Settings.name,
+                    "updates": [{"q": {"idiom": "piece of cake"}, "u": {"$set": {"definition": ""}}, "upsert": True}]})
+)
+
+@dataclass(frozen=True)
+class IndexChange:
+    """
+    One index created or dropped while reconciling, or that would be in a dry run.
+    Indexes left in place although they differ from the declarations are reported as well.
+    """
+
+    collection: str
+    index: str
+    action: str
+    error: str | None = None
+
+    def __str__(self) -> str:
+        change = f"{self.collection}.{self.index}: {self.action}"
+        return f"{change} failed: {self.error}" if self.error else change
+
+
+def declared_indexes(model: type[Document]) -> dict[str, IndexModel]:
+    """
+    Collects the indexes declared in a model's settings. Plain field names stand for ascending single-field indexes.
+
+    :param model: The document model.
+
+    :return: Index models keyed by index name.
+    """
+
+    indexes = [index if isinstance(index, IndexModel) else IndexModel([(index, ASCENDING)])
+               for index in getattr(model.Settings, "indexes", [])]
+
+    return {index.document["name"]: index for index in indexes}
+
+
+def index_matches(declared: dict, existing: dict) -> bool:
+    """
+    Checks whether an existing index has the declared keys and options.
+
+    :param declared: Document of the declared index model.
+    :param existing: Index description as returned by `index_information()`.
+
+    :return: True if the existing index can be kept.
+    """
+
+    if list(declared["key"].items()) != [tuple(key) for key in existing["key"]]:
+        return False
+
+    for option in COMPARED_OPTIONS:
+        wanted, actual = declared.get(option), existing.get(option)
+        if option == "collation" and wanted and actual:
+            # The server reports every collation field, including the defaults that were not declared
+            if any(actual.get(field) != value for field, value in wanted.items()):
+                return False
+        elif option in ("unique", "sparse"):
+            if bool(wanted) != bool(actual):
+                return False
+        elif wanted != actual:
+            return False
+
+    return True
+
+
+async def reconcile_indexes(drop_undeclared: bool = False, dry_run: bool = False) -> list[IndexChange]:
+    """
+    Brings the indexes of every collection in line with the model declarations. Missing indexes are created;
+    existing indexes are never changed in place, since an index cannot be rebuilt under the same name without
+    a window in which the collection is unindexed. A declaration whose keys or options change is therefore
+    given a new name, so its replacement is built next to the old index, which is then undeclared.
+    Undeclared indexes are only dropped on request, and only once every declared index of their collection
+    exists, as they may still be serving the queries a failed replacement was meant for. Failures to build
+    an index, e.g. a unique index over duplicate values, are reported rather than raised.
+
+    :param drop_undeclared: Whether to drop indexes that no model declares, e.g. replaced ones or ones added by hand.
+    :param dry_run: Only report the changes that would be made.
+
+    :return: The changes made, or that would be made in a dry run, and the differences left in place.
+    """
+
+    changes = []
+    for model in INDEXED_MODELS:
+        collection = model.get_pymongo_collection()
+        declared = declared_indexes(model)
+        existing = await collection.index_information()
+
+        failed = False
+        for name, index in declared.items():
+            if name in existing:
+                if not index_matches(index.document, existing[name]):
+                    changes.append(IndexChange(collection.name, name, "outdated, declare it under a new name to rebuild it"))
+                continue
+
+            error = None
+            if not dry_run:
+                try:
+                    await collection.create_indexes([index])
+                except OperationFailure as failure:
+                    error = failure.details.get("errmsg", str(failure)) if failure.details else str(failure)
+            failed = failed or error is not None
+            changes.append(IndexChange(collection.name, name, "created", error))
+
+        for name in existing:
+            if name == "_id_" or name in declared:
+                continue
+            if not drop_undeclared or failed:
+                changes.append(IndexChange(collection.name, name, "undeclared, kept"))
+                continue
+
+            changes.append(IndexChange(collection.name, name, "dropped"))
+            if not dry_run:
+                try:
+                    await collection.drop_index(name)
+                except OperationFailure as failure:
+                    if failure.code != INDEX_NOT_FOUND:
+                        raise
+
+    return changes
+
+
+def plan_stages(plan: Any) -> list[str]:
+    """
+    Lists the stages of a query plan tree, including the plans of every shard.
+
+    :param plan: A winning plan from explain output, or any part of it.
+
+    :return: Stage names, outermost first.
+    """
+
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+
+    return stages
+
+
+async def explain_query(query: CanonicalQuery) -> list[str]:
+    """
+    Asks the query planner how it would run a canonical query, without running it.
+
+    :param query: The query to explain.
+
+    :return: Stage names of the winning plan.
+    """
+
+    explanation = await database.client[settings.mongodb_db].command(
+        {"explain": query.command, "verbosity": "queryPlanner"})
+
+    return plan_stages(explanation["queryPlanner"]["winningPlan"])
+
+
+async def find_collection_scans() -> list[str]:
+    """
+    Explains every canonical query and collects those whose plan scans a whole collection.
+
+    :return: Names of the queries that would scan a collection.
+    """
+
+    return [query.name for query in CANONICAL_QUERIES if "COLLSCAN" in await explain_query(query)]
@@ -0,0 +1,206 @@
+from contextlib import contextmanager
+import bisect
+import logging
+import time
+from typing import Iterator
+
+slow_log = logging.getLogger("api.slow")
+
+# Latency buckets in seconds, from sub-millisecond index lookups up to slow database scans
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """
+    Monotonically increasing count, kept separately for every combination of label values.
+    """
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for label_values, value in self.values.items():
+            lines.append(f"{self.name}{format_labels(self.labels, label_values)} {value}")
+
+        return lines
+
+
+class Histogram:
+    """
+    Distribution of observed values over fixed buckets, kept separately for every combination of label values.
+    Observing a value only touches one bucket counter; cumulative counts are computed when rendering.
+    """
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self.series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        """
+        Records one observation.
+
+        :param value: The observed value, in seconds for latency histograms.
+        :param label_values: One value per label, in label order.
+        """
+
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        """
+        Observes the wall-clock duration of the enclosed block.
+
+        :param label_values: One value per label, in label order.
+        """
+
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, *label_values)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = format_labels(self.labels, label_values, 'le="%s"' % ("+Inf" if bound == float("inf") else bound))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, label_values)} {total[0]}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, label_values)} {cumulative}")
+
+        return lines
+
+
+def render_gauges(prefix: str, stats: dict[str, float]) -> list[str]:
+    """
+    Renders a flat statistics dictionary, as returned by the `stats()` methods of caches and pools, as gauges.
+
+    :param prefix: Metric name prefix, e.g. `idioms_user_cache`.
+    :param stats: Statistic names mapped to their current values.
+
+    :return: Prometheus exposition lines.
+    """
+
+    lines = []
+    for key, value in stats.items():
+        lines.append(f"# TYPE {prefix}_{key} gauge")
+        lines.append(f"{prefix}_{key} {float(value)}")
+
+    return lines
+
+
+http_requests = Counter("idioms_http_requests_total",
+                        "HTTP requests handled, by method, route template and status code",
+                        labels=("method", "route", "status"))
+
+http_request_duration = Histogram("idioms_http_request_duration_seconds",
+                                  "HTTP request latency, by method and route template",
+                                  labels=("method", "route"))
+
+mongo_command_duration = Histogram("idioms_mongo_command_duration_seconds",
+                                   "Mongo command round-trip time, by command and collection",
+                                   labels=("command", "collection"))
+
+mongo_command_failures = Counter("idioms_mongo_command_failures_total",
+                                 "Failed Mongo commands, by command and collection",
+                                 labels=("command", "collection"))
+
+jwt_decode_duration = Histogram("idioms_jwt_decode_duration_seconds",
+                                "Time spent verifying access token signatures, excluding cached claims")
+
+password_hashing_duration = Histogram("idioms_password_hashing_duration_seconds",
+                                      "Time spent hashing or verifying passwords on the hashing pool, by function",
+                                      labels=("function",),
+                                      buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+password_hashing_wait = Histogram("idioms_password_hashing_wait_seconds",
+                                  "Time password hashing work waited for a free worker thread")
+
+METRICS = (http_requests, http_request_duration, mongo_command_duration, mongo_command_failures,
+           jwt_decode_duration, password_hashing_duration, password_hashing_wait)
+
+def render_metrics(gauges: dict[str, dict[str, float]]) -> str:
+    """
+    Renders all metrics in the Prometheus text exposition format.
+
+    :param gauges: Additional statistics dictionaries keyed by metric name prefix.
+
+    :return: The exposition document.
+    """
+
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for prefix, stats in gauges.items():
+        lines.extend(render_gauges(prefix, stats))
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route template.
+    Routes are labelled by their path template rather than the concrete path, so
+    `/idioms/search/{search_phrase}` is a single series however many phrases are searched.
+    Requests slower than the configured threshold are logged with their full path and query string.
+    """
+
+    def __init__(self, app, slow_request_seconds: float):
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started_at
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_requests.inc(scope["method"], route_path, str(status_code))
+            http_request_duration.observe(duration, scope["method"], route_path)
+
+            if duration >= self.slow_request_seconds:
+                query_string = scope.get("query_string", b"").decode("latin-1")
+                slow_log.warning("Slow request: %s %s%s -> %d in %.3fs", scope["method"], scope["path"],
+                                 f"?{query_string}" if query_string else "", status_code, duration)
@@ -0,0 +1,127 @@
+from pymongo import monitoring
+
+from api.core.metrics import mongo_command_duration, mongo_command_failures, slow_log
+
+class ConnectionPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection checkouts from the Mongo connection pool.
+    Checkout wait time and the share of the pool in use show whether `maxPoolSize`
+    is large enough for the number of concurrent requests a worker handles.
+    """
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self.open_connections = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_checkout_wait_seconds = 0.0
+        self.max_checkout_wait_seconds = 0.0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.checkouts += 1
+        self.checked_out += 1
+        self.max_checked_out = max(self.max_checked_out, self.checked_out)
+        self.total_checkout_wait_seconds += event.duration
+        self.max_checkout_wait_seconds = max(self.max_checkout_wait_seconds, event.duration)
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "max_pool_size": self.max_pool_size,
+            "open_connections": self.open_connections,
+            "checked_out": self.checked_out,
+            "max_checked_out": self.max_checked_out,
+            "saturation": self.checked_out / self.max_pool_size if self.max_pool_size else 0.0,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "average_checkout_wait_seconds": self.total_checkout_wait_seconds / self.checkouts if self.checkouts else 0.0,
+            "max_checkout_wait_seconds": self.max_checkout_wait_seconds
+        }
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Counts database commands and their round-trip time, including commands currently in flight.
+    Durations are also recorded per command and collection, and commands slower than the
+    threshold are logged together with their query filter.
+    """
+
+    def __init__(self, slow_command_seconds: float):
+        self.slow_command_seconds = slow_command_seconds
+        self.in_flight = 0
+        self.succeeded_commands = 0
+        self.failed_commands = 0
+        self.total_duration_seconds = 0.0
+        # Command name, collection and filter of running commands, keyed by connection and request id
+        self._running: dict[tuple, tuple[str, str, object]] = {}
+
+    def started(self, event):
+        self.in_flight += 1
+        collection = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+        self._running[(event.connection_id, event.request_id)] = (
+            event.command_name,
+            collection if isinstance(collection, str) else "",
+            event.command.get("filter", event.command.get("pipeline", event.command.get("updates")))
+        )
+
+    def _finish(self, event) -> tuple[str, str]:
+        self.in_flight -= 1
+        duration = event.duration_micros / 1_000_000
+        self.total_duration_seconds += duration
+        command_name, collection, query_filter = self._running.pop((event.connection_id, event.request_id),
+                                                                   (event.command_name, "", None))
+        mongo_command_duration.observe(duration, command_name, collection)
+
+        if duration >= self.slow_command_seconds:
+            slow_log.warning("Slow Mongo command: %s on %r took %.3fs, filter: %r",
+                             command_name, collection, duration, query_filter)
+
+        return command_name, collection
+
+    def succeeded(self, event):
+        self.succeeded_commands += 1
+        self._finish(event)
+
+    def failed(self, event):
+        self.failed_commands += 1
+        mongo_command_failures.inc(*self._finish(event))
+
+    def stats(self) -> dict[str, float]:
+        completed = self.succeeded_commands + self.failed_commands
+        return {
+            "in_flight": self.in_flight,
+            "succeeded": self.succeeded_commands,
+            "failed": self.failed_commands,
+            "average_duration_seconds": self.total_duration_seconds / completed if completed else 0.0
+        }
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in flight, later callers with the
+    same key await its result instead of repeating the work. This keeps a burst of identical cache misses,
+    e.g. right after a deploy or cache flush, from becoming a burst of identical database queries.
+
+    The work runs as its own task, so a caller that is cancelled, e.g. by a client disconnecting,
+    does not cancel it for the other callers. Results and exceptions are shared by every caller.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs a coroutine function, or joins the call already in flight for the same key.
+
+        :param key: Identifies calls that produce the same result.
+        :param function: Coroutine function doing the work; only called if no call for the key is in flight.
+
+        :return: The result of the shared call.
+        """
+
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = self._in_flight[key] = asyncio.ensure_future(function())
+            task.add_done_callback(lambda finished_task: self._finish(key, finished_task))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Marks the exception as retrieved, so no warning is logged if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def forget(self, key: Hashable):
+        """
+        Lets the next call for a key start fresh work instead of joining the call in flight,
+        e.g. because the data it is reading has just changed.
+
+        :param key: The key to forget.
+        """
+
+        self._in_flight.pop(key, None)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.calls - self.executions,
+            "coalesced_ratio": (self.calls - self.executions) / self.calls if self.calls else 0.0
+        }
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, status
+
+from api.auth.admission import admission_controller
+from api.auth.endpoint_dependencies import get_admin_user, token_claims_cache, user_cache, user_lookups
+from api.auth.security import password_hashing_pool
+from api.core.database import command_monitor, pool_monitor
+from api.models.user import User
+from api.search.reloader import corpus_reloader
+from api.search.result_cache import result_cache, result_computations
+
+router = APIRouter(prefix="/admin", tags=["Administration"])
+
+def collect_stats() -> dict[str, dict[str, float]]:
+    """
+    Gathers the counters of the in-process caches and their request coalescing, the password hashing pool,
+    the Mongo client, admission control and the corpus reloader.
+
+    :return: Statistics dictionaries keyed by component name.
+    """
+
+    return {
+        "token_claims_cache": token_claims_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "user_lookups": user_lookups.stats(),
+        "password_hashing": password_hashing_pool.stats(),
+        "result_cache": result_cache.stats(),
+        "result_computations": result_computations.stats(),
+        "mongo_pool": pool_monitor.stats(),
+        "mongo_commands": command_monitor.stats(),
+        "admission": admission_controller.stats(),
+        "corpus_reloader": corpus_reloader.stats()
+    }
+
+
+@router.get("/stats",
+            summary="Return operational statistics for the running API instance",
+            description="Reports in-process cache counters, password hashing and Mongo connection pool metrics. Restricted to admin users.",
+            status_code=status.HTTP_200_OK,
+            responses={status.HTTP_403_FORBIDDEN: {"description": "Admin access required"}})
+async def get_stats(user: User = Depends(get_admin_user)) -> dict:
+    return collect_stats()
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
+
+from api.auth.admission import Admission
+from api.auth.endpoint_dependencies import admit_request, get_current_user
+from api.models.user import User
+from api.schemas.analysis import TextAnalysisRequest, TextAnalysisResponse
+from api.search.engine import SearchEngine, get_search_engine
+
+router = APIRouter(prefix="/analysis", tags=["Analysis"])
+
+@router.post("/idioms",
+             summary="Find every idiom used in a passage of text",
+             description="Idioms are matched case and accent-insensitively on whole words, ignoring punctuation. "
+                         "Each occurrence is returned with its character offsets in the submitted text, "
+                         "so overlapping and nested idioms are all reported.",
+             status_code=status.HTTP_200_OK,
+             response_model=TextAnalysisResponse,
+             responses={
+                 status.HTTP_422_UNPROCESSABLE_CONTENT: {"description": "Empty or oversized text"},
+                 status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+             })
+async def analyze_text(analysis_request: TextAnalysisRequest,
+                       admission: Admission = Depends(admit_request),
+                       user: User = Depends(get_current_user),
+                       search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    text = analysis_request.text
+    corpus = search_engine.corpus
+
+    return ORJSONResponse({
+        "occurrences": [
+            {
+                "idiom": corpus.idioms[position],
+                "definition": corpus.definitions[position],
+                "synonyms": corpus.synonyms[position],
+                "start": start,
+                "end": end,
+                "matched_text": text[start:end]
+            }
+            for position, start, end in search_engine.find_idioms(text)
+        ]
+    })
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Response, Request, status
 from datetime import datetime, timezone
+from pymongo.errors import DuplicateKeyError
 
-from api.auth.security import create_access_token, create_refresh_token, hash_password, verify_password
-from api.models.user import User
+from api.auth.endpoint_dependencies import invalidate_cached_user
+from api.auth.security import create_access_token, create_refresh_token, hash_password, hash_refresh_token, password_hashing_pool, verify_password
+from api.models.user import EMAIL_COLLATION, ApiServiceTier, User
 from api.models.refresh_token import RefreshToken
 from api.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
 
@@ -13,13 +15,21 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
              description="Upon successful registration, access and refresh tokens are issued.",
              status_code=status.HTTP_200_OK,
              response_model=TokenResponse,
-             responses={status.HTTP_409_CONFLICT: {"description": "Email already registered"}})
+             responses={
+                 status.HTTP_409_CONFLICT: {"description": "Email already registered"},
+                 status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many authentication requests"}
+             })
 async def register(register_request: RegisterRequest) -> TokenResponse:
-    if await User.find_one({"email": register_request.email}):
+    if await User.find_one({"email": register_request.email}, collation=EMAIL_COLLATION):
         raise HTTPException(status.HTTP_409_CONFLICT, "Email already registered")
 
-    user = User(email=register_request.email, password_hash=hash_password(register_request.password), tier=register_request.service_tier)
-    await user.insert()
+    password_hash = await password_hashing_pool.run(hash_password, register_request.password)
+    user = User(email=register_request.email, password_hash=password_hash, tier=ApiServiceTier.free)
+    try:
+        await user.insert()
+    except DuplicateKeyError:
+        # A concurrent registration for the same email won the race past the check above
+        raise HTTPException(status.HTTP_409_CONFLICT, "Email already registered")
 
     return await issue_tokens(user)
 
@@ -31,15 +41,17 @@ async def register(register_request: RegisterRequest) -> TokenResponse:
              response_model=TokenResponse,
              responses={
                  status.HTTP_401_UNAUTHORIZED: {"description": "Invalid credentials"},
-                 status.HTTP_403_FORBIDDEN: {"description": "User account is disabled"}
+                 status.HTTP_403_FORBIDDEN: {"description": "User account is disabled"},
+                 status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many authentication requests"}
              })
 async def login(data: LoginRequest, response: Response) -> TokenResponse:
-    user = await User.find_one({"email": data.username})
+    user = await User.find_one({"email": data.username}, collation=EMAIL_COLLATION)
 
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user or not await password_hashing_pool.run(verify_password, data.password, user.password_hash):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
 
     if not user.is_active:
+        invalidate_cached_user(str(user.id))
         raise HTTPException(status.HTTP_403_FORBIDDEN, "User account is disabled")
 
     tokens = await issue_tokens(user)
@@ -85,20 +97,24 @@ async def refresh(request: Request, response: Response) -> TokenResponse:
             "Missing refresh token"
         )
 
-    token = await RefreshToken.find_one({"token": refresh_token})
+    # Look up and delete the presented token in a single atomic round trip, so it can never be reused,
+    # even by concurrent requests, and an expired token is removed at the same time it is rejected.
+    token = await RefreshToken.get_pymongo_collection().find_one_and_delete(
+        {"token_hash": hash_refresh_token(refresh_token)},
+        projection={"user_id": 1, "expires_at": 1}
+    )
     if not token:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid refresh token")
 
-    # Check if the token has expired and remove it if so
-    if token.expires_at.astimezone(timezone.utc) < datetime.now(timezone.utc):
-        await token.delete()
+    # Mongo returns naive datetimes that are in UTC
+    if token["expires_at"].replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Refresh token expired, please log in again")
 
-    # Delete the old token, even if still valid, to prevent reuse
-    await token.delete()
-
-    user = await User.get(token.user_id)
+    # Read the user from the database rather than the user cache, so a disabled or deleted account
+    # cannot keep rotating refresh tokens until its cache entry expires
+    user = await User.get(token["user_id"])
     if not user or not user.is_active:
+        invalidate_cached_user(str(token["user_id"]))
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "User not found or disabled")
 
     tokens = await issue_tokens(user)
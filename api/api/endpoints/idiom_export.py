@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
+import orjson
+import zlib
+
+from api.auth.admission import Admission
+from api.auth.endpoint_dependencies import admit_request, get_current_user
+from api.core.config import settings
+from api.models.corpus_version import CorpusVersion
+from api.models.idiom import Idiom as IdiomModel
+from api.models.user import User
+
+router = APIRouter(prefix="/idioms", tags=["Export"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Serialized lines are buffered up to roughly this many bytes before being sent to the client
+STREAM_CHUNK_BYTES = 64 * 1024
+
+async def stream_idioms(since: int, compress: bool) -> AsyncIterator[bytes]:
+    """
+    Streams idioms from the database as newline-delimited JSON.
+    The cursor fetches documents in fixed-size batches, so memory use does not depend on the corpus size.
+
+    :param since: Only idioms changed after this corpus version are streamed.
+    :param compress: Whether to gzip the stream.
+
+    :return: An async iterator over chunks of the response body.
+    """
+
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    cursor = IdiomModel.get_pymongo_collection().find(
+        {"corpus_version": {"$gt": since}} if since else {},
+        {"_id": 0, "idiom": 1, "definition": 1, "synonyms": 1, "corpus_version": 1},
+        batch_size=settings.export_batch_size
+    )
+
+    buffer = bytearray()
+    async for document in cursor:
+        buffer += orjson.dumps(document)
+        buffer += b"\n"
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            yield compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+
+    if compressor:
+        yield compressor.compress(bytes(buffer)) + compressor.flush()
+    elif buffer:
+        yield bytes(buffer)
+
+
+@router.get("/export",
+            summary="Stream the complete idiom collection as newline-delimited JSON",
+            description="Each line holds one idiom with its definition, synonyms and the corpus version it last changed in. "
+                        "The X-Corpus-Version response header can be passed as `since` on the next export to only receive idioms changed after it.",
+            status_code=status.HTTP_200_OK,
+            response_class=StreamingResponse,
+            responses={
+                status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "Newline-delimited JSON stream of idioms"},
+                status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+            })
+async def export_idioms(since: int = Query(0, ge=0, description="Only export idioms changed after this corpus version"),
+                        gzip: bool = Query(False, description="Compress the stream with gzip"),
+                        admission: Admission = Depends(admit_request),
+                        user: User = Depends(get_current_user)) -> StreamingResponse:
+    corpus_version = await CorpusVersion.find_one({})
+
+    headers = {"X-Corpus-Version": str(corpus_version.version if corpus_version else 0)}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(stream_idioms(since, gzip), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -1,98 +1,297 @@
 from fastapi import APIRouter, Depends, status, HTTPException, Path, Query
-import re
-import random
+import asyncio
+from fastapi.responses import ORJSONResponse
 
-from api.schemas.idiom import Idiom as IdiomSchema
+from api.schemas.idiom import DEFAULT_EXAMPLE, IDIOM_FIELDS, MAX_BATCH_QUERIES, BatchSearchRequest, BatchSearchResponse, Idiom as IdiomSchema
 from api.models.idiom import Idiom as IdiomModel
-from api.auth.endpoint_dependencies import get_current_user
+from api.auth.admission import Admission
+from api.auth.endpoint_dependencies import admit_request, get_current_user
 from api.models.user import User
+from api.search.engine import SearchEngine, get_search_engine
+from api.search.normalize import normalize_text, prefix_upper_bound
+from api.search.result_cache import check_corpus_etag, corpus_cache_headers, get_cached_results, get_result_limit
+from api.search.synonym_index import SynonymMatch
 
+# Idiom list endpoints build plain dictionaries and return them as ORJSONResponse objects directly.
+# This skips the pydantic validation FastAPI would otherwise run against the response model;
+# `response_model` is still declared on each route so the OpenAPI documentation stays accurate.
 router = APIRouter(prefix="/idioms", tags=["Searching"])
 
+def get_requested_fields(fields: str | None = Query(None, description="Comma-separated subset of idiom fields to return, e.g. 'idiom,definition'")) -> tuple[str, ...]:
+    """
+    Dependency that parses a sparse fieldset parameter into the idiom fields to serialize.
+
+    :param fields: Comma-separated field names, or None for all fields.
+
+    :return: The requested fields in their canonical output order.
+    """
+
+    if fields is None:
+        return IDIOM_FIELDS
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(IDIOM_FIELDS)
+    if unknown or not requested:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Fields must be a comma-separated subset of: {', '.join(IDIOM_FIELDS)}")
+
+    return tuple(field for field in IDIOM_FIELDS if field in requested)
+
+
+async def find_by_phrase(search_engine: SearchEngine, search_phrase: str, limit: int, fuzzy: bool, fields: tuple[str, ...]) -> list[dict]:
+    """
+    Finds idioms containing the search phrase, serving repeated queries from the result cache.
+
+    :param search_engine: The engine serving the request.
+    :param search_phrase: Partial or complete idiom to look for.
+    :param limit: Maximum number of idioms to return.
+    :param fuzzy: Whether to also return idioms matching after correcting typos.
+    :param fields: Response fields to include.
+
+    :return: The matching idioms as response dictionaries.
+    """
+
+    # Case-insensitive partial-text matching is answered by the in-memory trigram index,
+    # which avoids an unanchored regex scan over the whole collection.
+    async def search() -> list[dict]:
+        return [search_engine.corpus.to_dict(position, fields) for position in search_engine.search(search_phrase, limit, fuzzy)]
+
+    return await get_cached_results(search_engine, ("search", normalize_text(search_phrase), limit, fuzzy, fields), search)
+
+
+async def find_by_letter(search_engine: SearchEngine, starting_letter: str, limit: int, fields: tuple[str, ...]) -> list[dict]:
+    """
+    Finds idioms beginning with a letter in alphabetical order, serving repeated queries from the result cache.
+
+    :param search_engine: The engine serving the request; its corpus version keys the cache.
+    :param starting_letter: The single letter idioms must begin with.
+    :param limit: Maximum number of idioms to return.
+    :param fields: Response fields to include.
+
+    :return: The matching idioms as response dictionaries.
+    """
+
+    # The normalized `sort_key` field is indexed, so a bounded range scan over it
+    # both finds idioms with the requested first letter and returns them already sorted.
+    prefix = normalize_text(starting_letter)
+
+    async def search() -> list[dict]:
+        # Only the requested fields are fetched, as raw documents without Beanie model validation.
+        # `example` is derived rather than stored, and `idiom` is always fetched, so a request for derived
+        # fields alone still projects one small field instead of receiving whole documents.
+        projection = {"_id": 0, "idiom": 1, **{field: 1 for field in fields if field != "example"}}
+        key_range = {"$gte": prefix}
+        upper_bound = prefix_upper_bound(prefix)
+        if upper_bound is not None:
+            key_range["$lt"] = upper_bound
+        cursor = (IdiomModel.get_pymongo_collection()
+                  .find({"sort_key": key_range}, projection)
+                  .sort("sort_key", 1)
+                  .limit(limit))
+        defaults = {"synonyms": [], "example": DEFAULT_EXAMPLE}
+        return [{field: document.get(field, defaults.get(field)) for field in fields} async for document in cursor]
+
+    return await get_cached_results(search_engine, ("by-letter", prefix, limit, fields), search)
+
+
+async def find_by_synonym(search_engine: SearchEngine, synonym: str, match: SynonymMatch, limit: int, fields: tuple[str, ...]) -> list[dict]:
+    """
+    Finds idioms with a matching synonym, serving repeated queries from the result cache.
+
+    :param search_engine: The engine serving the request.
+    :param synonym: Word or phrase that means the same thing as potential idioms.
+    :param match: How the synonym is compared against the stored synonyms.
+    :param limit: Maximum number of idioms to return.
+    :param fields: Response fields to include.
+
+    :return: The matching idioms as response dictionaries.
+    """
+
+    # Synonyms are looked up in the precomputed reverse index instead of
+    # regex matching against the synonyms array of every document.
+    async def search() -> list[dict]:
+        return [search_engine.corpus.to_dict(position, fields) for position in search_engine.search_synonyms(synonym, match, limit)]
+
+    return await get_cached_results(search_engine, ("by-synonym", normalize_text(synonym), match, limit, fields), search)
+
+
 @router.get("/search/{search_phrase}",
          summary="Return all idioms that sufficiently match the provided phrase",
-         description="The search phrase can be a partial or complete match to an idiom.",
+         description="The search phrase can be a partial or complete match to an idiom. "
+                     "With fuzzy matching enabled, idioms containing small misspellings of the phrase are also returned.",
          status_code=status.HTTP_200_OK,
-         responses={status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"}})
+         response_model=list[IdiomSchema],
+         dependencies=[Depends(check_corpus_etag)],
+         responses={
+             status.HTTP_304_NOT_MODIFIED: {"description": "Results unchanged since the provided ETag"},
+             status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"},
+             status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+         })
 async def get_idiom(search_phrase: str = Path(description="partial or complete idiom to retrieve"),
-                    limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return"),
-                    user: User = Depends(get_current_user)) -> list[IdiomSchema]:
-    # Perform case-insensitive partial-text matching using a regex on the `idiom` field.
-    # Escape the search phrase to avoid regex injection and limit results.
-    regex = {"$regex": f".*{re.escape(search_phrase)}.*", "$options": "i"}
-    cursor = IdiomModel.find_many({"idiom": regex})
-    results = await cursor.to_list(length=limit)
+                    limit: int = Depends(get_result_limit),
+                    fuzzy: bool = Query(False, description="Tolerate misspelled words in the search phrase"),
+                    fields: tuple[str, ...] = Depends(get_requested_fields),
+                    admission: Admission = Depends(admit_request),
+                    user: User = Depends(get_current_user),
+                    search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    results = await find_by_phrase(search_engine, search_phrase, limit, fuzzy, fields)
 
     if not results:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idiom not found")
 
-    return [IdiomSchema(idiom=document.idiom,
-                        definition=document.definition,
-                        synonyms=getattr(document, "synonyms", []) or []) for document in results]
+    return ORJSONResponse(results, headers=corpus_cache_headers(search_engine.version, limit))
+
+
+@router.post("/search:batch",
+          summary="Run many idiom searches in a single request",
+          description=f"Accepts up to {MAX_BATCH_QUERIES} search phrases, starting letters and synonyms in total. "
+                      "Results are keyed by each query exactly as it was sent; queries without matches map to an empty list.",
+          status_code=status.HTTP_200_OK,
+          response_model=BatchSearchResponse,
+          responses={
+              status.HTTP_422_UNPROCESSABLE_CONTENT: {"description": "Empty or oversized batch"},
+              status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+          })
+async def search_batch(batch_request: BatchSearchRequest,
+                       fields: tuple[str, ...] = Depends(get_requested_fields),
+                       admission: Admission = Depends(admit_request),
+                       user: User = Depends(get_current_user),
+                       search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    # Authentication is paid once for the whole batch, and the letter lookups
+    # that need the database run concurrently instead of one after another.
+    limit = admission.cap_results(batch_request.limit)
+    letters = list(dict.fromkeys(batch_request.letters))
+    letter_results = await asyncio.gather(*(find_by_letter(search_engine, letter, limit, fields) for letter in letters))
+
+    return ORJSONResponse({
+        "phrases": {phrase: await find_by_phrase(search_engine, phrase, limit, batch_request.fuzzy, fields)
+                    for phrase in batch_request.phrases},
+        "letters": dict(zip(letters, letter_results)),
+        "synonyms": {synonym: await find_by_synonym(search_engine, synonym, batch_request.synonym_match, limit, fields)
+                     for synonym in batch_request.synonyms}
+    })
+
+
+@router.get("/ranked-search/{search_phrase}",
+         summary="Return the idioms most relevant to the provided words, best match first",
+         description="Words are matched against the idiom, its definition and its synonyms. "
+                     "This also works as a reverse dictionary, e.g. searching for a meaning like 'risky behavior'.",
+         status_code=status.HTTP_200_OK,
+         response_model=list[IdiomSchema],
+         dependencies=[Depends(check_corpus_etag)],
+         responses={
+             status.HTTP_304_NOT_MODIFIED: {"description": "Results unchanged since the provided ETag"},
+             status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"},
+             status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+         })
+async def get_ranked_idioms(search_phrase: str = Path(description="words from an idiom or describing its meaning"),
+                            limit: int = Depends(get_result_limit),
+                            fields: tuple[str, ...] = Depends(get_requested_fields),
+                            admission: Admission = Depends(admit_request),
+                            user: User = Depends(get_current_user),
+                            search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    async def search() -> list[dict]:
+        return [search_engine.corpus.to_dict(position, fields) for position in search_engine.search_ranked(search_phrase, limit)]
+
+    results = await get_cached_results(search_engine, ("ranked-search", normalize_text(search_phrase), limit, fields), search)
+
+    if not results:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idiom not found")
+
+    return ORJSONResponse(results, headers=corpus_cache_headers(search_engine.version, limit))
+
+
+@router.get("/suggest",
+         summary="Complete a partially typed idiom for search-as-you-type",
+         description="Idioms starting with the typed text come first, followed by idioms containing a word that starts with it, "
+                     "e.g. 'thin ice' suggests 'skating on thin ice'. Only idiom texts are returned, to keep responses small.",
+         status_code=status.HTTP_200_OK,
+         response_model=list[str],
+         responses={status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}})
+async def suggest_idioms(q: str = Query(min_length=1, max_length=100, description="Text typed so far"),
+                         limit: int = Query(8, ge=1, le=20, description="Maximum number of suggestions to return"),
+                         admission: Admission = Depends(admit_request),
+                         user: User = Depends(get_current_user),
+                         search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    # An empty list is a valid answer while typing, so no 404 is raised
+    corpus = search_engine.corpus
+    return ORJSONResponse([corpus.idioms[position] for position in search_engine.suggest(q, admission.cap_results(limit))])
 
 
 @router.get("/random",
-         summary="Return a random idiom from the collection",
-         description="This is a fun way to learn a new figure of speech that you may not have known.",
+         summary="Return random idioms from the collection",
+         description="This is a fun way to learn a new figure of speech that you may not have known. "
+                     "The response is always a list, also for a single idiom. Providing a seed, e.g. today's date, "
+                     "returns the same idioms for as long as the collection is unchanged, and smaller counts return the first of them.",
          status_code=status.HTTP_200_OK,
-         responses={status.HTTP_404_NOT_FOUND: {"description": "No idioms available"}})
-async def get_random_idiom(user: User = Depends(get_current_user)) -> IdiomSchema:
-    randomNumber = random.random()
+         response_model=list[IdiomSchema],
+         responses={
+             status.HTTP_404_NOT_FOUND: {"description": "No idioms available"},
+             status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+         })
+async def get_random_idiom(count: int = Query(1, ge=1, le=100, description="Number of distinct idioms to return, capped by the service tier"),
+                           seed: str | None = Query(None, description="Seed for a reproducible selection"),
+                           fields: tuple[str, ...] = Depends(get_requested_fields),
+                           admission: Admission = Depends(admit_request),
+                           user: User = Depends(get_current_user),
+                           search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    results = search_engine.sample(admission.cap_results(count), seed)
 
-    cursor = (IdiomModel.find_many(IdiomModel.randomizerId >= randomNumber).sort("randomizerId").limit(1))
-    document = await cursor.to_list(length=1)
-    if not document:
+    if not results:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No idioms available")
 
-    return IdiomSchema(
-        idiom=document[0].idiom,
-        definition=document[0].definition,
-        synonyms=getattr(document, "synonyms", []) or [],
-        example=getattr(document, "example", "Example usage not available.")
-    )
+    return ORJSONResponse([search_engine.corpus.to_dict(position, fields) for position in results])
 
 
 @router.get("/by-letter/{starting_letter}",
          summary="Return all idioms that begin with a requested letter",
          description="Results will be returned in ascending alphabetical order.",
          status_code=status.HTTP_200_OK,
-         responses={status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"}})
+         response_model=list[IdiomSchema],
+         dependencies=[Depends(check_corpus_etag)],
+         responses={
+             status.HTTP_304_NOT_MODIFIED: {"description": "Results unchanged since the provided ETag"},
+             status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"},
+             status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+         })
 async def get_idioms_starting_with_letter(starting_letter: str = Path(description="Single Latin character", regex="[A-Za-z]"),
-                                          limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return"),
-                                          user: User = Depends(get_current_user)) -> list[IdiomSchema]:
+                                          limit: int = Depends(get_result_limit),
+                                          fields: tuple[str, ...] = Depends(get_requested_fields),
+                                          admission: Admission = Depends(admit_request),
+                                          user: User = Depends(get_current_user),
+                                          search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
     if len(starting_letter) > 1:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Query must be a single letter")
-    
-    # Perform case-insensitive partial-text matching using a regex on the `idiom` field.
-    # Escape the search phrase to avoid regex injection and limit results.
-    regex = {"$regex": f"^{re.escape(starting_letter)}.*", "$options": "i"}
-    cursor = IdiomModel.find_many({"idiom": regex})
-    results = await cursor.to_list(length=limit)
+
+    results = await find_by_letter(search_engine, starting_letter, limit, fields)
 
     if not results:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idiom not found")
 
-    return [IdiomSchema(idiom=document.idiom,
-                        definition=document.definition,
-                        synonyms=getattr(document, "synonyms", []) or []) for document in results]
+    return ORJSONResponse(results, headers=corpus_cache_headers(search_engine.version, limit))
 
 
 @router.get("/by-synonym/{synonym}",
          summary="Return all idioms that are synonyms with the requested word or phrase",
          description="This can help discover a colorful figure of speech for a literal word or phrase.",
          status_code=status.HTTP_200_OK,
-         responses={status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"}})
+         response_model=list[IdiomSchema],
+         dependencies=[Depends(check_corpus_etag)],
+         responses={
+             status.HTTP_304_NOT_MODIFIED: {"description": "Results unchanged since the provided ETag"},
+             status.HTTP_404_NOT_FOUND: {"description": "Idiom not found"},
+             status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded or service busy"}
+         })
 async def get_idioms_for_synonym(synonym: str = Path(description="word or phrase that means the same thing as potential idioms"),
-                                 limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return"),
-                                 user: User = Depends(get_current_user)) -> list[IdiomSchema]:
-    # Search by synonym field using case-insensitive regex matching
-    regex = {"$regex": f".*{re.escape(synonym)}.*", "$options": "i"}
-    cursor = IdiomModel.find_many({"synonyms": regex})
-    results = await cursor.to_list(length=limit)
+                                 match: SynonymMatch = Query(SynonymMatch.contains, description="Match synonyms exactly, by prefix or by the words they contain"),
+                                 limit: int = Depends(get_result_limit),
+                                 fields: tuple[str, ...] = Depends(get_requested_fields),
+                                 admission: Admission = Depends(admit_request),
+                                 user: User = Depends(get_current_user),
+                                 search_engine: SearchEngine = Depends(get_search_engine)) -> ORJSONResponse:
+    results = await find_by_synonym(search_engine, synonym, match, limit, fields)
 
     if not results:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idiom not found")
 
-    return [IdiomSchema(idiom=document.idiom,
-                        definition=document.definition,
-                        synonyms=getattr(document, "synonyms", []) or []) for document in results]
+    return ORJSONResponse(results, headers=corpus_cache_headers(search_engine.version, limit))
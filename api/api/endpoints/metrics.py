@@ -0,0 +1,21 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from api.core.metrics import render_metrics
+from api.endpoints.admin import collect_stats
+
+router = APIRouter(tags=["Monitoring"])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics",
+            summary="Expose request, database and authentication metrics in the Prometheus text format",
+            description="Per-route request counts and latency histograms, Mongo command durations per collection, "
+                        "JWT decode and password hashing times, and the counters reported by /admin/stats as gauges. "
+                        "Meant to be scraped by Prometheus from inside the deployment network, so it does not require a token.",
+            status_code=status.HTTP_200_OK,
+            response_class=PlainTextResponse,
+            responses={status.HTTP_200_OK: {"content": {PROMETHEUS_MEDIA_TYPE: {}}, "description": "Prometheus exposition document"}})
+async def get_metrics() -> PlainTextResponse:
+    gauges = {f"idioms_{component}": stats for component, stats in collect_stats().items()}
+    return PlainTextResponse(render_metrics(gauges), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -1,21 +1,50 @@
 from fastapi import FastAPI, HTTPException, status
 from contextlib import asynccontextmanager
+import gc
 
-from api.core.database import init_db, close_db
+from api.auth.security import password_hashing_pool
+from api.core.config import settings
+from api.core.database import init_db, close_db, prewarm_pool
+from api.core.indexes import find_collection_scans, reconcile_indexes
+from api.core.metrics import MetricsMiddleware
+from api.endpoints.admin import router as admin_router
 from api.endpoints.analysis import router as analysis_router
 from api.endpoints.authentication import router as authentication_router
+from api.endpoints.idiom_export import router as idiom_export_router
 from api.endpoints.idiom_search import router as idiom_search_router
+from api.endpoints.metrics import router as metrics_router
 from api.models.idiom import Idiom as IdiomModel
+from api.search.engine import init_search_engine
+from api.search.reloader import corpus_reloader
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Initializing database connection...", flush=True)
     await init_db()
     print("Database connection initialized", flush=True)
+    await prewarm_pool(settings.mongo_prewarm_connections)
+    if settings.mongo_reconcile_indexes:
+        print("Reconciling database indexes...", flush=True)
+        for change in await reconcile_indexes():
+            print(f"Index {change}", flush=True)
+        for query in await find_collection_scans():
+            print(f"Warning: query '{query}' scans a whole collection", flush=True)
+    print("Building idiom search index...", flush=True)
+    await init_search_engine()
+    print("Idiom search index built", flush=True)
+    # Moves the modules and the first engine out of reach of later full collections, which would otherwise rescan
+    # them every time. A replaced engine is still freed by reference counting, as its indexes hold no cycles.
+    # Reloaded engines are not frozen, since every freeze also pins whatever garbage is uncollected at that moment.
+    gc.collect()
+    gc.freeze()
+    if settings.corpus_reload_enabled:
+        await corpus_reloader.start()
     yield
+    await corpus_reloader.stop()
     print("Closing database connection...", flush=True)
     await close_db()
     print("Database connection closed", flush=True)
+    password_hashing_pool.shutdown()
 
 
 api_description = "The English language has a rich tradition of expressions. " \
@@ -34,6 +63,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware, slow_request_seconds=settings.slow_request_seconds)
+
 @app.get("/healthcheck",
          summary="Healthcheck endpoint to verify API is running",
          description="A simple endpoint to verify that the API is running and responsive.",
@@ -53,4 +84,7 @@ async def health_check() -> dict:
 
 app.include_router(authentication_router)
 app.include_router(idiom_search_router)
+app.include_router(idiom_export_router)
 app.include_router(analysis_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import sys
+
+from api.core.database import close_db, init_db
+from api.core.indexes import CANONICAL_QUERIES, explain_query, reconcile_indexes
+
+async def reconcile(drop_undeclared: bool, dry_run: bool) -> bool:
+    """
+    Reconciles the indexes of every collection with the model declarations and prints each change.
+    Undeclared indexes are only dropped once every declared index of their collection exists.
+
+    :param drop_undeclared: Whether to drop indexes that no model declares.
+    :param dry_run: Only print the changes that would be made.
+
+    :return: True if every index was built.
+    """
+
+    changes = await reconcile_indexes(drop_undeclared=drop_undeclared, dry_run=dry_run)
+    for change in changes:
+        print(change)
+    if not changes:
+        print("Indexes are up to date")
+
+    return not any(change.error for change in changes)
+
+
+async def check() -> bool:
+    """
+    Prints the winning plan of every canonical query.
+
+    :return: True if no canonical query scans a whole collection.
+    """
+
+    passed = True
+    for query in CANONICAL_QUERIES:
+        stages = await explain_query(query)
+        scans = "COLLSCAN" in stages
+        passed = passed and not scans
+        print(f"{'FAIL' if scans else 'ok'}  {query.name}: {' <- '.join(stages)}")
+
+    return passed
+
+
+async def run(args: argparse.Namespace) -> bool:
+    await init_db()
+    try:
+        if args.command == "reconcile":
+            return await reconcile(not args.keep_undeclared, args.dry_run)
+        return await check()
+    finally:
+        await close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the MongoDB indexes the API relies on")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    reconcile_parser = subparsers.add_parser("reconcile", help="Create missing indexes, then drop undeclared ones")
+    reconcile_parser.add_argument("--dry-run", action="store_true", help="Only print the changes that would be made")
+    reconcile_parser.add_argument("--keep-undeclared", action="store_true", help="Keep indexes that no model declares")
+    subparsers.add_parser("check", help="Explain the hot-path queries and fail if any of them scans a whole collection")
+    args = parser.parse_args()
+
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
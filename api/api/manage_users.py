@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import sys
+
+from api.core.database import close_db, init_db
+from api.models.user import EMAIL_COLLATION, ApiServiceTier, User
+
+async def set_tier(email: str, tier: ApiServiceTier) -> bool:
+    """
+    Moves an account to another service tier. Registration always creates free accounts,
+    so this is the only way to grant the premium or admin tier.
+    Access tokens carry the tier they were issued with, so the new tier applies to admission limits
+    once the user logs in or refreshes, and to admin checks once the user cache entry expires.
+
+    :param email: Email address of the account.
+    :param tier: The tier to assign.
+
+    :return: True if the account exists.
+    """
+
+    user = await User.find_one({"email": email}, collation=EMAIL_COLLATION)
+    if not user:
+        print(f"No account is registered for {email}")
+        return False
+
+    await user.set({"tier": tier})
+    print(f"{user.email} is now in the {tier.value} tier")
+
+    return True
+
+
+async def run(args: argparse.Namespace) -> bool:
+    await init_db()
+    try:
+        return await set_tier(args.email, ApiServiceTier(args.tier))
+    finally:
+        await close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage user accounts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    set_tier_parser = subparsers.add_parser("set-tier", help="Move an account to another service tier")
+    set_tier_parser.add_argument("email", help="Email address of the account")
+    set_tier_parser.add_argument("tier", choices=[tier.value for tier in ApiServiceTier], help="The tier to assign")
+    args = parser.parse_args()
+
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
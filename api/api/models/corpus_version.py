@@ -0,0 +1,20 @@
+from beanie import Document
+from datetime import datetime
+
+class CorpusVersion(Document):
+    """
+    Defines the single record of the CorpusVersion collection of the MongoDB database.
+    Its version number is bumped by `populate_db.py` every time the idioms collection changes,
+    so that anything derived from the idioms can tell whether it is still current.
+    """
+
+    version: int = 0
+    updated_at: datetime
+
+    class Config:
+        json_schema_extra = {
+            "description": "A CorpusVersion identifies the current revision of the idioms collection."
+        }
+
+    class Settings:
+        name = "corpus_version"
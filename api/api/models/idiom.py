@@ -2,6 +2,7 @@ from beanie import Document
 import random
 from typing import List
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Idiom(Document):
@@ -12,6 +13,9 @@ class Idiom(Document):
     idiom: str
     definition: str
     synonyms: List[str] = []
+    sort_key: str = ""
+    content_hash: str = ""
+    corpus_version: int = 0
     randomizerId: float = Field(default_factory=random.random)
 
     def __str__(self):
@@ -19,4 +23,11 @@ class Idiom(Document):
 
     class Settings:
         name = "idioms"
-        indexes = ["idioms", "randomizerId"]
+        indexes = [
+            # populate_db.py upserts every idiom by its text, and an idiom must only be stored once
+            IndexModel([("idiom", ASCENDING)], unique=True),
+            # Idioms by starting letter: a range scan that also returns them in alphabetical order
+            IndexModel([("sort_key", ASCENDING)]),
+            # Incremental exports of the idioms changed after a corpus version
+            IndexModel([("corpus_version", ASCENDING)])
+        ]
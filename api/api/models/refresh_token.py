@@ -1,14 +1,16 @@
 from beanie import Document, PydanticObjectId
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel
 
 class RefreshToken(Document):
     """
     Defines a record in the RefreshToken collection of the MongoDB database.
     Used to store refresh tokens associated with users for authentication purposes.
+    Only a SHA-256 digest of the token is stored, never the token itself.
     """
 
     user_id: PydanticObjectId
-    token: str
+    token_hash: str
     expires_at: datetime
 
     class Config:
@@ -18,3 +20,11 @@ class RefreshToken(Document):
 
     class Settings:
         name = "refresh_tokens"
+        indexes = [
+            # Records written before tokens were hashed have no `token_hash`; the partial filter keeps
+            # them out of the unique index until the TTL index below removes them.
+            IndexModel([("token_hash", ASCENDING)], unique=True,
+                       partialFilterExpression={"token_hash": {"$exists": True}}),
+            # Lets the server delete expired tokens on its own instead of waiting for them to be presented
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        ]
@@ -1,6 +1,11 @@
 from beanie import Document
 from enum import Enum
 from pydantic import EmailStr
+from pymongo import ASCENDING, IndexModel
+from pymongo.collation import Collation, CollationStrength
+
+# Emails are compared case-insensitively. Queries by email must pass this collation to use the email index.
+EMAIL_COLLATION = Collation(locale="en", strength=CollationStrength.SECONDARY)
 
 class ApiServiceTier(str, Enum):
     """
@@ -30,4 +35,8 @@ class User(Document):
 
     class Settings:
         name = "users"
-        indexes = ["email"]
+        indexes = [
+            # Registration and login look users up by email, and registration relies on emails being unique.
+            # Named explicitly, as it replaces the former case-sensitive, non-unique `email_1` index.
+            IndexModel([("email", ASCENDING)], name="email_unique_case_insensitive", unique=True, collation=EMAIL_COLLATION)
+        ]
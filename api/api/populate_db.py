@@ -1,25 +1,39 @@
 #!/usr/bin/env python3
 
 import asyncio
-from pymongo import AsyncMongoClient
+from bson import ObjectId
+from pymongo import AsyncMongoClient, UpdateOne
 from beanie import init_beanie
-from beanie.odm.operators.update.general import Set
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
+import hashlib
+import json
 import pandas as pd
 import random
+import time
 
 from core.config import settings
+from models.corpus_version import CorpusVersion
 from models.idiom import Idiom
+from search.fuzzy_index import FuzzyIndex
+from search.idiom_matcher import IdiomMatcher
+from search.normalize import normalize_text
+from search.snapshot import corpus_identity, write_snapshot
+from search.ranking import BM25Ranker
+from search.suggestions import SuggestionIndex
+from search.synonym_index import SynonymIndex
+from search.trigram_index import TrigramIndex
 
-def extract_dataframe(input_file: str):
+CHUNK_SIZE = 1000
+
+def format_dataframe(raw_data_frame: pd.DataFrame) -> pd.DataFrame:
     """
-    Parses a provided tab-separated values file containing
-    idioms input data and returns a Pandas dataframe.
-    
-    :param input_file: Path to a tab-separated values (.tsv) file
+    Normalizes the columns of a dataframe of raw idioms input data.
+
+    :param raw_data_frame: Dataframe read from the tab-separated input file
     """
-    
-    raw_data_frame = pd.read_csv(input_file, sep='\t', dtype=str)
+
     raw_data_frame['Idiom'] = raw_data_frame['Idiom'].str.lower()
 
     # Format synonyms into List of separate strings from comma-separated string
@@ -33,53 +47,185 @@ def extract_dataframe(input_file: str):
 
     return raw_data_frame
 
-async def populate_database(mongodb_connection_string: str, dataframe: pd.DataFrame):
+def extract_dataframes(input_file: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
     """
-    Upsert Idiom record entries from a provided Pandas dataframe
+    Parses a provided tab-separated values file containing
+    idioms input data and yields it as a stream of Pandas dataframes,
+    so that the whole file never needs to be held in memory at once.
+
+    :param input_file: Path to a tab-separated values (.tsv) file
+    :param chunk_size: Number of rows per yielded dataframe
+    """
+
+    with pd.read_csv(input_file, sep='\t', dtype=str, chunksize=chunk_size) as reader:
+        for raw_data_frame in reader:
+            yield format_dataframe(raw_data_frame)
+
+def compute_content_hash(idiom: str, definition: str, synonyms: list[str]) -> str:
+    """
+    Computes a digest of the fields of an idiom that come from the input file.
+    Rows whose digest matches the stored one have not changed and can be skipped.
+
+    :param idiom: The idiom text
+    :param definition: The definition of the idiom
+    :param synonyms: The synonyms of the idiom
+    """
+
+    serialized = json.dumps([idiom, definition, synonyms], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+async def populate_database(mongodb_connection_string: str, dataframes: Iterator[pd.DataFrame]):
+    """
+    Upsert Idiom record entries from a stream of Pandas dataframes
     into a Mongo DB database. New entries are inserted if they do
     not exist and existing idioms have their other fields updated.
-    
+    Rows whose content is unchanged are skipped, and existing
+    idioms keep their randomizerId.
+
     :param mongodb_connection_string: a connection string to the target MongoDB database
-    :param dataframe: Pandas dataframe containing information for idiom updates
+    :param dataframes: Pandas dataframes containing information for idiom updates
     """
 
     print("Connecting to mongo DB instance...")
     async with AsyncMongoClient(mongodb_connection_string) as client:
         target_database = client.get_database(settings.mongodb_db)
-        await init_beanie(database=target_database, document_models=[Idiom])
-
-        # Upsert each document per row in the data frame
-        print("Inserting records into collection...")
-        for index, row in dataframe.iterrows():
-            row_as_dictionary = row.to_dict()
-
-            new_idiom = Idiom(idiom=row_as_dictionary["Idiom"],
-                            definition=row_as_dictionary["Definition"],
-                            synonyms=row_as_dictionary["Synonyms"],
-                            randomizerId=random.random())
-            await Idiom.find_one(Idiom.idiom == new_idiom.idiom).upsert(
-                Set({
-                        "definition": new_idiom.definition,
-                        "synonyms": new_idiom.synonyms,
-                        "randomizerId": new_idiom.randomizerId
-                    }),
-                on_insert=new_idiom
-            ) # type: ignore
-
-        stored_idiom_entries = await Idiom.find_all().to_list()
-        for current_idiom in stored_idiom_entries:
-            print(current_idiom.randomizerId, current_idiom.idiom)
+        await init_beanie(database=target_database, document_models=[CorpusVersion, Idiom])
+        collection = Idiom.get_pymongo_collection()
+
+        # Every idiom written by this run is stamped with the next corpus version,
+        # which lets incremental exports pull only what changed since a given version.
+        current_version = await CorpusVersion.find_one({})
+        next_version = (current_version.version if current_version else 0) + 1
+
+        print("Reading content hashes of stored idioms...")
+        stored_hashes = {document["idiom"]: document.get("content_hash")
+                         async for document in collection.find({}, {"_id": 0, "idiom": 1, "content_hash": 1})}
+
+        print("Upserting records into collection...")
+        rows_read = inserted = updated = unchanged = duplicates = 0
+        start_time = time.perf_counter()
+        for dataframe in dataframes:
+            rows_read += len(dataframe)
+
+            # Later rows win if an idiom appears more than once in the same chunk
+            rows_by_idiom = {row["Idiom"]: row for row in dataframe.to_dict("records")}
+            duplicates += len(dataframe) - len(rows_by_idiom)
+
+            operations = []
+            for idiom, row in rows_by_idiom.items():
+                content_hash = compute_content_hash(idiom, row["Definition"], row["Synonyms"])
+                if stored_hashes.get(idiom) == content_hash:
+                    unchanged += 1
+                    continue
+
+                stored_hashes[idiom] = content_hash
+                operations.append(UpdateOne(
+                    {"idiom": idiom},
+                    {
+                        "$set": {
+                            "definition": row["Definition"],
+                            "synonyms": row["Synonyms"],
+                            "sort_key": normalize_text(idiom),
+                            "content_hash": content_hash,
+                            "corpus_version": next_version
+                        },
+                        "$setOnInsert": {"randomizerId": random.random()}
+                    },
+                    upsert=True
+                ))
+
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                inserted += result.upserted_count
+                updated += result.modified_count
+
+        elapsed_seconds = time.perf_counter() - start_time
+
+        changed = bool(inserted or updated)
+        if current_version:
+            corpus_version_id = current_version.id
+            snapshot_version = next_version if changed else current_version.version
+        else:
+            # The id of a new corpus version record is chosen here, so the snapshot can be tagged before the record exists
+            corpus_version_id = ObjectId() if changed else None
+            snapshot_version = next_version if changed else 0
+
+        # The snapshot is written before the corpus version is bumped, so API workers reloading
+        # for the new version find a snapshot of that version instead of rebuilding from the database
+        if settings.corpus_snapshot_path:
+            print("Writing corpus snapshot...")
+            await write_corpus_snapshot(settings.corpus_snapshot_path,
+                                        corpus_identity(settings.mongodb_db, corpus_version_id),
+                                        snapshot_version)
+
+        # Bump the corpus version so the API knows its cached results are stale
+        if changed:
+            await CorpusVersion.get_pymongo_collection().update_one(
+                {},
+                {
+                    "$max": {"version": next_version},
+                    "$set": {"updated_at": datetime.now(timezone.utc)},
+                    "$setOnInsert": {"_id": corpus_version_id}
+                },
+                upsert=True
+            )
+
+    print("Ingest summary:")
+    print(f"  Rows read:  {rows_read}")
+    print(f"  Inserted:   {inserted}")
+    print(f"  Updated:    {updated}")
+    print(f"  Unchanged:  {unchanged}")
+    print(f"  Duplicates: {duplicates}")
+    print(f"  Elapsed:    {elapsed_seconds:.2f} s ({rows_read / elapsed_seconds if elapsed_seconds else 0:.0f} rows/s)")
+
+
+async def write_corpus_snapshot(path: str, corpus_id: str, version: int):
+    """
+    Writes the complete idioms collection and all of its search indexes to the binary corpus snapshot
+    that API workers memory-map at startup and on reload.
+    The database stays the source of truth: workers only use the snapshot if its corpus and version match the database.
+
+    :param path: Destination of the snapshot file
+    :param corpus_id: Identity of the corpus in the database
+    :param version: The corpus version the database is at once the ingest completes
+    """
+
+    documents = await Idiom.get_pymongo_collection().find({}, {"_id": 0, "idiom": 1, "definition": 1, "synonyms": 1}).to_list(length=None)
+
+    # Entries must be in the same order as IdiomCorpus.from_documents produces
+    rows = sorted(((document["idiom"], document["definition"], document.get("synonyms") or []) for document in documents),
+                  key=lambda row: normalize_text(row[0]))
+    idioms = [row[0] for row in rows]
+    definitions = [row[1] for row in rows]
+    synonyms = [row[2] for row in rows]
+    normalized_idioms = [normalize_text(idiom) for idiom in idioms]
+    suggestion_index = SuggestionIndex.build(normalized_idioms)
+
+    write_snapshot(path,
+                   corpus_id=corpus_id,
+                   version=version,
+                   idioms=idioms,
+                   definitions=definitions,
+                   synonyms=synonyms,
+                   normalized_idioms=normalized_idioms,
+                   trigram_postings=TrigramIndex.build(normalized_idioms).postings,
+                   ranking=BM25Ranker.build(idioms, definitions, synonyms).arrays(),
+                   suggestion_suffixes=suggestion_index.suffixes,
+                   suggestion_ids=suggestion_index.suffix_ids,
+                   synonym_index=SynonymIndex.build(synonyms).arrays(),
+                   fuzzy_index=FuzzyIndex.build(normalized_idioms).arrays(),
+                   idiom_matcher=IdiomMatcher.build(normalized_idioms).arrays())
 
 
 def main():
-    print("Load .csv file into data frame...")
+    print("Stream .tsv file into data frames...")
     script_base_dir = Path(__file__).resolve().parent
     path_to_input_data = script_base_dir / "idioms-master-list.tsv"
     print("Input data path:", path_to_input_data)
-    processed_dataframe = extract_dataframe(str(path_to_input_data))
+    processed_dataframes = extract_dataframes(str(path_to_input_data))
 
-    print("Ingest data frame into NoSQL database...")
-    asyncio.run(populate_database(settings.mongo_database_connection_uri, processed_dataframe))
+    print("Ingest data frames into NoSQL database...")
+    asyncio.run(populate_database(settings.mongo_database_connection_uri, processed_dataframes))
     print("Database updates completed")
 
 if __name__ == "__main__":
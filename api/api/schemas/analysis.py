@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+
+from api.core.config import settings
+
+class TextAnalysisRequest(BaseModel):
+    """
+    Schema for requests to find the idioms used in a passage of text.
+    """
+
+    text: str = Field(min_length=1, max_length=settings.max_analysis_text_length,
+                      description="passage of text to analyze", examples=["After the scandal, the senator was skating on thin ice."])
+
+
+class IdiomOccurrence(BaseModel):
+    """
+    Schema for an idiom found in an analyzed text.
+    """
+
+    idiom: str = Field(description="the idiom that occurs in the text", examples=["skating on thin ice"])
+    definition: str = Field(description="definition for the idiom or literal equivalent meaning", examples=["to proceed with risky behavior"])
+    synonyms: list[str] = Field(description="synonyms for the figure of speech", examples=['risk-taking', 'in danger'])
+    start: int = Field(description="offset of the first character of the occurrence in the text", examples=[31])
+    end: int = Field(description="offset just past the last character of the occurrence in the text", examples=[50])
+    matched_text: str = Field(description="the occurrence exactly as written in the text", examples=["skating on thin ice"])
+
+
+class TextAnalysisResponse(BaseModel):
+    """
+    Schema for the idioms found in an analyzed text.
+    """
+
+    occurrences: list[IdiomOccurrence] = Field(description="idiom occurrences ordered by their position in the text")
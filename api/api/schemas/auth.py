@@ -1,18 +1,14 @@
 from pydantic import BaseModel, EmailStr, Field
 
-from api.models.user import ApiServiceTier
-
 class RegisterRequest(BaseModel):
     """
-    Schema for user registration and login requests.
-    Contains a user's email and password fields required for authentication.
+    Schema for user registration requests.
+    Contains a user's email and password fields required for authentication. New accounts always start
+    in the free tier; the tier is not a client choice, as admission limits and admin access depend on it.
     """
 
     email: EmailStr = Field(description="a user email address associated with the account", examples=["john.doe@example.com"])
     password: str = Field(description="a user's secret password", examples=["12345678"])
-    service_tier: ApiServiceTier = Field(default=ApiServiceTier.free,
-                                         description="the API access tier for the user account",
-                                         examples=[ApiServiceTier.free, ApiServiceTier.premium, ApiServiceTier.admin])
 
 class LoginRequest(BaseModel):
     """
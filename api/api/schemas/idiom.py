@@ -1,12 +1,57 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, StringConstraints, model_validator
+from typing import Annotated
+
+from api.search.synonym_index import SynonymMatch
+
+DEFAULT_EXAMPLE = "Example usage not available."
+
+# Response fields of an idiom, in the order they are serialized
+IDIOM_FIELDS = ("idiom", "definition", "synonyms", "example")
+
+# Upper bound on the total number of phrases, letters and synonyms in one batch search request
+MAX_BATCH_QUERIES = 50
 
 class Idiom(BaseModel):
     idiom: str = Field(description="a figure of speech", examples=["skating on thin ice"])
     definition: str = Field(description="definition for the idiom or literal equivalent meaning", examples=["to proceed with risky behavior"])
     synonyms: list[str] = Field(description="synonyms for the figure of speech", examples=['risk-taking', 'in danger'])
-    example: str = Field(description="using the idiom in a sentence, showing an example of properly using it", default="Example usage not available.", examples=["Jason was skating on thin ice after the teacher caught him cheating on the test."])
+    example: str = Field(description="using the idiom in a sentence, showing an example of properly using it", default=DEFAULT_EXAMPLE, examples=["Jason was skating on thin ice after the teacher caught him cheating on the test."])
 
     class Config:
         json_schema_extra = {
             "description": "An Idiom represents a figure of speech along with its definition."
         }
+
+
+class BatchSearchRequest(BaseModel):
+    """
+    Schema for running many idiom lookups in a single request.
+    Each list entry is looked up the same way as with the corresponding single-query endpoint.
+    """
+
+    phrases: list[str] = Field(default=[], description="partial or complete idioms to search for", examples=[["thin ice", "bad break"]])
+    letters: list[Annotated[str, StringConstraints(pattern=r"^[A-Za-z]$")]] = Field(default=[], description="single Latin characters idioms must begin with", examples=[["a", "s"]])
+    synonyms: list[str] = Field(default=[], description="words or phrases that mean the same thing as potential idioms", examples=[["danger"]])
+    synonym_match: SynonymMatch = Field(default=SynonymMatch.contains, description="how synonyms are matched")
+    fuzzy: bool = Field(default=False, description="tolerate misspelled words in the search phrases")
+    limit: int = Field(default=10, ge=1, le=100, description="maximum number of idioms to return per query")
+
+    @model_validator(mode="after")
+    def check_batch_size(self) -> "BatchSearchRequest":
+        query_count = len(self.phrases) + len(self.letters) + len(self.synonyms)
+        if query_count == 0:
+            raise ValueError("At least one phrase, letter or synonym is required")
+        if query_count > MAX_BATCH_QUERIES:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_QUERIES} queries")
+        return self
+
+
+class BatchSearchResponse(BaseModel):
+    """
+    Schema for batch search results, keyed by the query exactly as it was sent.
+    Queries without any matching idiom map to an empty list.
+    """
+
+    phrases: dict[str, list[Idiom]] = Field(description="results for each search phrase")
+    letters: dict[str, list[Idiom]] = Field(description="results for each starting letter")
+    synonyms: dict[str, list[Idiom]] = Field(description="results for each synonym")
@@ -0,0 +1,59 @@
+from typing import Any, Iterable, Sequence
+
+from api.schemas.idiom import DEFAULT_EXAMPLE, IDIOM_FIELDS
+from api.search.normalize import normalize_text
+
+class IdiomCorpus:
+    """
+    Column-oriented copy of the idioms collection, either held in lists or mapped from a corpus snapshot.
+    Entries are ordered alphabetically by their normalized idiom text, so a position
+    in the corpus doubles as a stable document id for every search index built on top of it.
+    """
+
+    def __init__(self, idioms: Sequence[str], definitions: Sequence[str], synonyms: Sequence[list[str]],
+                 normalized_idioms: Sequence[str] | None = None):
+        self.idioms = idioms
+        self.definitions = definitions
+        self.synonyms = synonyms
+        self.normalized_idioms = normalized_idioms if normalized_idioms is not None else [normalize_text(idiom) for idiom in idioms]
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[dict[str, Any]]) -> "IdiomCorpus":
+        """
+        Builds a corpus from raw idiom documents as returned by a Mongo cursor.
+
+        :param documents: Dictionaries with `idiom`, `definition` and optional `synonyms` keys.
+
+        :return: A new corpus sorted by normalized idiom text.
+        """
+
+        rows = sorted(((document["idiom"], document["definition"], document.get("synonyms") or [])
+                       for document in documents),
+                      key=lambda row: normalize_text(row[0]))
+
+        return cls(idioms=[row[0] for row in rows],
+                   definitions=[row[1] for row in rows],
+                   synonyms=[list(row[2]) for row in rows])
+
+    def __len__(self) -> int:
+        return len(self.idioms)
+
+    def to_dict(self, position: int, fields: tuple[str, ...] = IDIOM_FIELDS) -> dict[str, Any]:
+        """
+        Materializes the corpus entry at the given position as a plain response dictionary,
+        without constructing or validating a pydantic model.
+
+        :param position: Position of the entry within the corpus.
+        :param fields: Response fields to include, in output order.
+
+        :return: The requested fields of the idiom.
+        """
+
+        values = {
+            "idiom": self.idioms[position],
+            "definition": self.definitions[position],
+            "synonyms": self.synonyms[position],
+            "example": DEFAULT_EXAMPLE
+        }
+
+        return {field: values[field] for field in fields}
@@ -0,0 +1,237 @@
+from fastapi import HTTPException, status
+import asyncio
+import random
+from typing import Callable
+
+from api.core.config import settings
+from api.models.corpus_version import CorpusVersion
+from api.models.idiom import Idiom as IdiomModel
+from api.search.corpus import IdiomCorpus
+from api.search.fuzzy_index import FuzzyIndex
+from api.search.idiom_matcher import IdiomMatcher
+from api.search.normalize import normalize_text
+from api.search.ranking import BM25Ranker
+from api.search.snapshot import CorpusSnapshot, SnapshotError, corpus_identity
+from api.search.suggestions import SuggestionIndex
+from api.search.synonym_index import SynonymIndex, SynonymMatch
+from api.search.trigram_index import TrigramIndex
+
+# Seeded selections are drawn at this size and truncated, so a seed picks the same idioms whatever the count
+SEEDED_SAMPLE_SIZE = 100
+
+async def build_in_thread(build: Callable[[], "SearchEngine"]) -> "SearchEngine":
+    """
+    Builds a search engine in a worker thread so the event loop keeps serving requests meanwhile.
+    The thread shares the GIL with the loop, so a full rebuild from the database still delays requests:
+    at 100k idioms it takes over ten seconds, adding about 15 ms of event loop lag at the 99th percentile and
+    a few hundred milliseconds while a full garbage collection scans the objects being built.
+    Opening a corpus snapshot takes milliseconds and avoids this.
+
+    :param build: Builds the engine.
+
+    :return: The built engine.
+    """
+
+    return await asyncio.to_thread(build)
+
+
+class SearchEngine:
+    """
+    Holds an in-memory snapshot of the idiom corpus together with the indexes built over it.
+    Instances are immutable once built, so a request can keep using the engine it started with.
+    The corpus version identifies which revision of the idioms collection the engine was built from.
+    """
+
+    def __init__(self, corpus: IdiomCorpus, version: int = 0, trigram_index: TrigramIndex | None = None,
+                 ranker: BM25Ranker | None = None, suggestion_index: SuggestionIndex | None = None,
+                 synonym_index: SynonymIndex | None = None, fuzzy_index: FuzzyIndex | None = None,
+                 idiom_matcher: IdiomMatcher | None = None):
+        self.corpus = corpus
+        self.version = version
+        self.trigram_index = trigram_index or TrigramIndex.build(corpus.normalized_idioms)
+        self.synonym_index = synonym_index or SynonymIndex.build(corpus.synonyms)
+        self.fuzzy_index = fuzzy_index or FuzzyIndex.build(corpus.normalized_idioms)
+        self.ranker = ranker or BM25Ranker.build(corpus.idioms, corpus.definitions, corpus.synonyms)
+        self.idiom_matcher = idiom_matcher or IdiomMatcher.build(corpus.normalized_idioms)
+        self.suggestion_index = suggestion_index or SuggestionIndex.build(corpus.normalized_idioms)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CorpusSnapshot) -> "SearchEngine":
+        """
+        Builds a search engine over a memory-mapped corpus snapshot. The corpus columns and every index
+        except the trigram and ranking vocabularies are used in place from the mapped file, so worker processes
+        share their pages through the OS page cache and opening the snapshot takes no index construction.
+        Corpus entries are decoded on access, which costs a few microseconds per returned result.
+
+        :param snapshot: An opened corpus snapshot.
+
+        :return: A search engine over the snapshot.
+        """
+
+        normalized_idioms = snapshot.normalized_idioms
+        corpus = IdiomCorpus(idioms=snapshot.idioms,
+                             definitions=snapshot.definitions,
+                             synonyms=snapshot.synonyms,
+                             normalized_idioms=normalized_idioms)
+
+        return cls(corpus, snapshot.version,
+                   trigram_index=TrigramIndex(normalized_idioms, snapshot.trigram_postings),
+                   ranker=BM25Ranker.from_arrays(snapshot.ranking_terms, len(corpus), *snapshot.ranking_arrays),
+                   suggestion_index=SuggestionIndex(normalized_idioms, snapshot.suggestion_suffixes, snapshot.suggestion_ids),
+                   synonym_index=SynonymIndex(*snapshot.synonym_index),
+                   fuzzy_index=FuzzyIndex(*snapshot.fuzzy_index),
+                   idiom_matcher=IdiomMatcher(*snapshot.idiom_matcher))
+
+    @classmethod
+    async def load(cls) -> "SearchEngine":
+        """
+        Builds a new search engine for the current corpus version. The corpus snapshot is used
+        if it was written for that corpus and version; otherwise every idiom is read from the database.
+        Index construction runs in a worker thread, so requests keep being served while an engine is rebuilt.
+
+        :return: A fully built search engine.
+        """
+
+        # Read the version first; if the corpus changes while loading, the engine is
+        # labelled with an older version and will be considered stale rather than current.
+        corpus_version = await CorpusVersion.find_one({})
+        version = corpus_version.version if corpus_version else 0
+
+        if settings.corpus_snapshot_path:
+            corpus_id = corpus_identity(settings.mongodb_db, corpus_version.id if corpus_version else None)
+            try:
+                snapshot = CorpusSnapshot(settings.corpus_snapshot_path)
+                if snapshot.corpus_id != corpus_id:
+                    print(f"Ignoring corpus snapshot of corpus {snapshot.corpus_id}, the database holds corpus {corpus_id}", flush=True)
+                elif snapshot.version != version:
+                    print(f"Ignoring corpus snapshot of version {snapshot.version}, the database is at version {version}", flush=True)
+                else:
+                    return await build_in_thread(lambda: cls.from_snapshot(snapshot))
+            except FileNotFoundError:
+                pass
+            except SnapshotError as error:
+                print(f"Ignoring corpus snapshot: {error}", flush=True)
+
+        collection = IdiomModel.get_pymongo_collection()
+        cursor = collection.find({}, {"_id": 0, "idiom": 1, "definition": 1, "synonyms": 1})
+        documents = await cursor.to_list(length=None)
+
+        return await build_in_thread(lambda: cls(IdiomCorpus.from_documents(documents), version))
+
+    def search(self, phrase: str, limit: int, fuzzy: bool = False) -> list[int]:
+        """
+        Case and accent-insensitive substring search over the idiom text.
+        In fuzzy mode, idioms that only match after correcting typos are appended after the exact matches.
+
+        :param phrase: Partial or complete idiom to look for.
+        :param limit: Maximum number of results to return.
+        :param fuzzy: Whether to also return idioms within a bounded edit distance of the phrase.
+
+        :return: Corpus positions of matching idioms.
+        """
+
+        query = normalize_text(phrase)
+        results = self.trigram_index.search(query, limit)
+
+        if fuzzy and len(results) < limit:
+            exact_matches = set(results)
+            for position in self.fuzzy_index.search(query, limit):
+                if position not in exact_matches:
+                    results.append(position)
+                    if len(results) >= limit:
+                        break
+
+        return results
+
+    def search_ranked(self, text: str, limit: int) -> list[int]:
+        """
+        Relevance-ranked search over the idiom text, definition and synonyms.
+
+        :param text: Words describing the idiom or the meaning being looked for.
+        :param limit: Maximum number of results to return.
+
+        :return: Corpus positions of matching idioms, most relevant first.
+        """
+
+        return self.ranker.search(text, limit)
+
+    def sample(self, count: int, seed: str | None = None) -> list[int]:
+        """
+        Draws distinct idioms uniformly at random. Each pick takes constant time,
+        as positions are drawn directly from the corpus without querying or sorting.
+
+        :param count: Number of idioms to draw; capped at the corpus size and, with a seed, at SEEDED_SAMPLE_SIZE.
+        :param seed: Optional seed that makes the selection reproducible for an unchanged corpus.
+            Smaller counts return a prefix of the selection for larger ones, so callers capped at
+            different counts, e.g. by their service tier, see the same first idioms.
+
+        :return: Corpus positions of the drawn idioms.
+        """
+
+        if seed is None:
+            return random.sample(range(len(self.corpus)), min(count, len(self.corpus)))
+
+        # random.sample does not return a prefix of a larger sample for a smaller count, so the size is fixed
+        selection = random.Random(seed).sample(range(len(self.corpus)), min(SEEDED_SAMPLE_SIZE, len(self.corpus)))
+        return selection[:count]
+
+    def search_synonyms(self, synonym: str, match: SynonymMatch, limit: int) -> list[int]:
+        """
+        Finds idioms that list a synonym matching the requested word or phrase.
+
+        :param synonym: Word or phrase that means the same thing as potential idioms.
+        :param match: How the synonym is compared against the stored synonyms.
+        :param limit: Maximum number of results to return.
+
+        :return: Corpus positions of matching idioms in alphabetical order.
+        """
+
+        return self.synonym_index.search(synonym, match, limit)
+
+    def suggest(self, prefix: str, limit: int) -> list[int]:
+        """
+        Completes a partially typed idiom, matching the start of the idiom or of any of its words.
+
+        :param prefix: The text typed so far.
+        :param limit: Maximum number of suggestions.
+
+        :return: Corpus positions of the suggested idioms, full prefix matches first.
+        """
+
+        return self.suggestion_index.suggest(prefix, limit)
+
+    def find_idioms(self, text: str) -> list[tuple[int, int, int]]:
+        """
+        Finds every idiom occurring in a passage of text.
+
+        :param text: The passage to analyze.
+
+        :return: Tuples of corpus position, start offset and end offset (exclusive) of each occurrence in the text.
+        """
+
+        return self.idiom_matcher.find(text)
+
+
+engine: SearchEngine | None = None
+
+async def init_search_engine():
+    """
+    Builds a search engine for the current corpus and makes it the active one. The engine is
+    only published once fully built, and requests already holding the previous engine finish with it.
+    """
+
+    global engine
+    engine = await SearchEngine.load()
+
+
+def get_search_engine() -> SearchEngine:
+    """
+    Dependency to retrieve the search engine built at application startup.
+
+    :return: The active SearchEngine instance.
+    """
+
+    if engine is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Search index not ready")
+
+    return engine
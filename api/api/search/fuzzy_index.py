@@ -0,0 +1,194 @@
+from typing import Sequence
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so its siblings are imported relatively.
+from .normalize import tokenize
+from .postings import PostingLists, find_sorted
+from .trigram_index import contains_sorted
+
+MAX_EDIT_DISTANCE = 2
+
+def max_distance_for(word: str) -> int:
+    """
+    Returns the number of typos tolerated in a word of the given length.
+    Very short words must match exactly, otherwise nearly every short word in the vocabulary would match.
+
+    :param word: A normalized query word.
+
+    :return: The maximum edit distance allowed for the word.
+    """
+
+    if len(word) <= 2:
+        return 0
+    if len(word) <= 4:
+        return 1
+    return MAX_EDIT_DISTANCE
+
+
+def generate_deletes(word: str, max_distance: int) -> set[str]:
+    """
+    Generates every variant of a word with up to `max_distance` characters removed, including the word itself.
+
+    :param word: The word to generate variants for.
+    :param max_distance: The maximum number of characters to remove.
+
+    :return: Set of deletion variants.
+    """
+
+    deletes = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        deletes.update(frontier)
+
+    return deletes
+
+
+def edit_distance(source: str, target: str, max_distance: int) -> int:
+    """
+    Computes the optimal string alignment distance (Levenshtein plus adjacent transpositions) between two words.
+    The computation stops early once the distance is known to exceed `max_distance`.
+
+    :param source: The first word.
+    :param target: The second word.
+    :param max_distance: The largest distance of interest.
+
+    :return: The distance, or `max_distance + 1` if it is larger than `max_distance`.
+    """
+
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: list[int] = []
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return min(previous[-1], max_distance + 1)
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant word lookup over the idiom corpus using a SymSpell deletion dictionary.
+
+    Every word in the idiom vocabulary is stored under all of its variants with up to two characters deleted.
+    A misspelled query word only has to generate its own deletion variants and look them up, so no
+    pairwise edit distance is computed against the vocabulary; only the handful of candidates that share
+    a variant are verified. Idioms are then matched word by word through per-word posting lists.
+
+    Memory cost is dominated by the deletion dictionary. A word of length n has roughly n + n(n-1)/2
+    variants at distance two, so a vocabulary of 10,000 distinct words averaging six characters produces
+    about 250,000 keys. The cost depends on the vocabulary, not on the number of idioms, since idioms
+    mostly reuse common words. The variants are kept as a sorted sequence with flat posting lists
+    rather than a dictionary, so the index can be used in place from a memory-mapped corpus snapshot.
+    """
+
+    def __init__(self, words: Sequence[str], word_postings: PostingLists, deletes: Sequence[str],
+                 delete_postings: PostingLists):
+        self.words = words
+        self.word_postings = word_postings
+        self.deletes = deletes
+        self.delete_postings = delete_postings
+
+    @classmethod
+    def build(cls, texts: Sequence[str]) -> "FuzzyIndex":
+        """
+        Collects the vocabulary of the texts and generates the deletion variants of every word.
+
+        :param texts: Normalized texts; the position of each text is used as its id.
+
+        :return: A new fuzzy index.
+        """
+
+        word_postings: dict[str, list[int]] = {}
+        for idiom_id, text in enumerate(texts):
+            for word in set(tokenize(text)):
+                word_postings.setdefault(word, []).append(idiom_id)
+        words = sorted(word_postings)
+
+        deletes: dict[str, list[int]] = {}
+        for word_id, word in enumerate(words):
+            for variant in generate_deletes(word, max_distance_for(word)):
+                deletes.setdefault(variant, []).append(word_id)
+        variants = sorted(deletes)
+
+        return cls(words, PostingLists.build(word_postings[word] for word in words),
+                   variants, PostingLists.build(deletes.pop(variant) for variant in variants))
+
+    def arrays(self) -> tuple[Sequence[str], PostingLists, Sequence[str], PostingLists]:
+        """
+        Serializes the index for a corpus snapshot.
+
+        :return: The constructor arguments of the index.
+        """
+
+        return self.words, self.word_postings, self.deletes, self.delete_postings
+
+    def lookup_word(self, word: str) -> dict[int, int]:
+        """
+        Finds vocabulary words within the tolerated edit distance of a query word.
+
+        :param word: A normalized query word.
+
+        :return: Mapping of vocabulary word id to its edit distance from the query word.
+        """
+
+        max_distance = max_distance_for(word)
+        matches: dict[int, int] = {}
+        for variant in generate_deletes(word, max_distance):
+            variant_id = find_sorted(self.deletes, variant)
+            if variant_id is None:
+                continue
+            for word_id in self.delete_postings[variant_id]:
+                if word_id in matches:
+                    continue
+                distance = edit_distance(word, self.words[word_id], max_distance)
+                if distance <= max_distance:
+                    matches[word_id] = distance
+
+        return matches
+
+    def search(self, text: str, limit: int) -> list[int]:
+        """
+        Finds idioms containing a close match for every word of the query.
+        Results are ordered by the total number of corrections needed, then alphabetically.
+
+        :param text: Normalized, possibly misspelled query text.
+        :param limit: Maximum number of idiom ids to return.
+
+        :return: Ids of matching idioms.
+        """
+
+        word_matches = [self.lookup_word(word) for word in tokenize(text)]
+        if not word_matches or not all(word_matches):
+            return []
+
+        # Start from the query word with the fewest candidate idioms and only verify
+        # those candidates against the posting lists of the remaining words.
+        word_matches.sort(key=lambda matches: sum(len(self.word_postings[word_id]) for word_id in matches))
+        first, others = word_matches[0], word_matches[1:]
+
+        total_distances: dict[int, int] = {}
+        for word_id, distance in first.items():
+            for idiom_id in self.word_postings[word_id]:
+                if distance < total_distances.get(idiom_id, MAX_EDIT_DISTANCE + 1):
+                    total_distances[idiom_id] = distance
+
+        for matches in others:
+            remaining: dict[int, int] = {}
+            for idiom_id, total in total_distances.items():
+                best = min((distance for word_id, distance in matches.items()
+                            if contains_sorted(self.word_postings[word_id], idiom_id)), default=None)
+                if best is not None:
+                    remaining[idiom_id] = total + best
+            total_distances = remaining
+
+        return sorted(total_distances, key=lambda idiom_id: (total_distances[idiom_id], idiom_id))[:limit]
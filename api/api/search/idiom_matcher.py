@@ -0,0 +1,143 @@
+from array import array
+from typing import Sequence
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so its siblings are imported relatively.
+from .normalize import TOKEN_PATTERN, normalize_with_offsets, tokenize
+from .postings import PostingLists, find_sorted
+
+class IdiomMatcher:
+    """
+    Aho-Corasick automaton that finds every idiom occurring in a passage of text in a single pass.
+
+    The automaton runs over word tokens rather than characters: idioms are short word sequences,
+    so a token alphabet needs far fewer states than a character trie, and matches always start and
+    end on word boundaries. Scanning takes one pass over the text, with a binary search per token and transition,
+    plus time linear in the number of matches, so it hardly depends on how many idioms the corpus holds.
+
+    Token ids are positions in the sorted vocabulary, and transitions are a sorted array of
+    `state * vocabulary size + token id` keys with their target states, both looked up by binary search.
+    Together with the per-state arrays, the automaton is a handful of flat arrays, which is much more
+    compact than a dictionary per state and can be used in place from a memory-mapped corpus snapshot.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], transition_keys: Sequence[int], transition_targets: Sequence[int],
+                 depths: Sequence[int], failures: Sequence[int], output_links: Sequence[int], outputs: PostingLists):
+        self.vocabulary = vocabulary
+        self.stride = max(1, len(vocabulary))
+        self.transition_keys = transition_keys
+        self.transition_targets = transition_targets
+        self.depths = depths
+        self.failures = failures
+        self.output_links = output_links
+        self.outputs = outputs
+
+    @classmethod
+    def build(cls, normalized_idioms: Sequence[str]) -> "IdiomMatcher":
+        """
+        Builds the token trie of all idioms and links every state to its failure and output states.
+
+        :param normalized_idioms: Normalized idiom texts; the position of each idiom is used as its id.
+
+        :return: A new idiom matcher.
+        """
+
+        patterns = [tokenize(idiom) for idiom in normalized_idioms]
+        vocabulary = sorted({token for tokens in patterns for token in tokens})
+        token_ids = {token: token_id for token_id, token in enumerate(vocabulary)}
+        stride = max(1, len(vocabulary))
+
+        transitions: dict[int, int] = {}
+        depths = array("I", [0])
+        outputs: dict[int, list[int]] = {}
+        children: list[list[tuple[int, int]]] = [[]]
+        for idiom_id, tokens in enumerate(patterns):
+            if not tokens:
+                continue
+
+            state = 0
+            for token in tokens:
+                token_id = token_ids[token]
+                next_state = transitions.get(state * stride + token_id)
+                if next_state is None:
+                    next_state = len(depths)
+                    transitions[state * stride + token_id] = next_state
+                    depths.append(depths[state] + 1)
+                    children.append([])
+                    children[state].append((token_id, next_state))
+                state = next_state
+            outputs.setdefault(state, []).append(idiom_id)
+
+        # Breadth-first pass computing, for every state, the longest proper suffix that is also a state
+        # (failure link) and the nearest state along the failure chain that completes an idiom (output link)
+        failures = array("I", bytes(4 * len(depths)))
+        output_links = array("I", bytes(4 * len(depths)))
+        queue = [state for _, state in children[0]]
+        for state in queue:
+            for token_id, child in children[state]:
+                failure = failures[state]
+                while failure and failure * stride + token_id not in transitions:
+                    failure = failures[failure]
+                target = transitions.get(failure * stride + token_id, 0)
+                failures[child] = target
+                output_links[child] = target if target in outputs else output_links[target]
+                queue.append(child)
+
+        transition_keys = array("Q", sorted(transitions))
+        transition_targets = array("I", (transitions[key] for key in transition_keys))
+
+        return cls(vocabulary, transition_keys, transition_targets, depths, failures, output_links,
+                   PostingLists.build(outputs.get(state, ()) for state in range(len(depths))))
+
+    def arrays(self) -> tuple[Sequence[str], Sequence[int], Sequence[int], Sequence[int], Sequence[int], Sequence[int],
+                              PostingLists]:
+        """
+        Serializes the automaton for a corpus snapshot.
+
+        :return: The constructor arguments of the matcher.
+        """
+
+        return (self.vocabulary, self.transition_keys, self.transition_targets, self.depths, self.failures,
+                self.output_links, self.outputs)
+
+    def _next_state(self, state: int, token_id: int) -> int:
+        while True:
+            position = find_sorted(self.transition_keys, state * self.stride + token_id)
+            if position is not None:
+                return self.transition_targets[position]
+            if not state:
+                return 0
+            state = self.failures[state]
+
+    def find(self, text: str) -> list[tuple[int, int, int]]:
+        """
+        Finds all idiom occurrences in a text, including overlapping and nested ones.
+
+        :param text: The raw text to scan.
+
+        :return: Tuples of idiom id, start offset and end offset (exclusive) in the original text,
+            ordered by start offset and longest match first.
+        """
+
+        normalized, origins = normalize_with_offsets(text)
+        token_spans = [(match.start(), match.end()) for match in TOKEN_PATTERN.finditer(normalized)]
+
+        matches = []
+        state = 0
+        for end_token, (span_start, span_end) in enumerate(token_spans):
+            token_id = find_sorted(self.vocabulary, normalized[span_start:span_end])
+            # A word that appears in no idiom cannot continue any partial match
+            state = 0 if token_id is None else self._next_state(state, token_id)
+
+            output_state = state if self.outputs[state] else self.output_links[state]
+            while output_state:
+                start = token_spans[end_token - self.depths[output_state] + 1][0]
+                for idiom_id in self.outputs[output_state]:
+                    matches.append((idiom_id, start, span_end))
+                output_state = self.output_links[output_state]
+
+        if origins is not None:
+            matches = [(idiom_id, origins[start], origins[end - 1] + 1) for idiom_id, start, end in matches]
+
+        matches.sort(key=lambda match: (match[1], -match[2], match[0]))
+        return matches
@@ -0,0 +1,88 @@
+import re
+import sys
+import unicodedata
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+SURROGATES_START = 0xD800
+SURROGATES_END = 0xDFFF
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for case-insensitive and accent-insensitive comparisons.
+    Characters are case-folded, combining accent marks are removed and runs of whitespace are collapsed.
+
+    :param text: The raw text to normalize.
+
+    :return: The normalized text.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(character for character in decomposed if not unicodedata.combining(character))
+
+    return " ".join(folded.casefold().split())
+
+
+def normalize_with_offsets(text: str) -> tuple[str, list[int] | None]:
+    """
+    Normalizes text like `normalize_text`, but keeps every character and records where each one came from,
+    so that positions found in the normalized text can be mapped back to the original text.
+    Whitespace is not collapsed; it separates the same word tokens as in the normalized text.
+
+    :param text: The raw text to normalize.
+
+    :return: The normalized text and the original position of each of its characters,
+        or None instead of the positions if they are identical to the normalized ones.
+    """
+
+    # ASCII text only needs case folding, which maps every character to exactly one character
+    if text.isascii():
+        return text.lower(), None
+
+    characters = []
+    origins = []
+    for position, character in enumerate(text):
+        for decomposed in unicodedata.normalize("NFKD", character):
+            if not unicodedata.combining(decomposed):
+                for folded in decomposed.casefold():
+                    characters.append(folded)
+                    origins.append(position)
+
+    return "".join(characters), origins
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Computes the smallest string that sorts after every string starting with the given prefix.
+    Together with the prefix itself it bounds a range scan over a sorted key.
+
+    :param prefix: A normalized prefix.
+
+    :return: The exclusive upper bound of the prefix range, or None if the range extends to the end of the keys,
+        as for an empty prefix or one made only of the highest code point.
+    """
+
+    # Strings starting with a prefix that ends in the highest code point all sort before
+    # the prefix without it, with its last remaining character incremented
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+
+    code_point = ord(stripped[-1]) + 1
+    # Lone surrogates cannot be encoded, e.g. into a BSON query, and no valid text contains them
+    if SURROGATES_START <= code_point <= SURROGATES_END:
+        code_point = SURROGATES_END + 1
+
+    return stripped[:-1] + chr(code_point)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits normalized text into word tokens, dropping punctuation such as hyphens.
+
+    :param text: Normalized text to tokenize.
+
+    :return: The word tokens in order of appearance.
+    """
+
+    return TOKEN_PATTERN.findall(text)
@@ -0,0 +1,61 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable, Iterator, Sequence
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so it must only depend on the standard library.
+
+def find_sorted(keys: Sequence[Any], key: Any) -> int | None:
+    """
+    Looks up a key in a sorted sequence using binary search. Unlike a dictionary, this also works
+    on keys stored in a memory-mapped snapshot, without decoding all of them first.
+
+    :param keys: Sorted sequence of distinct keys.
+    :param key: The key to look for.
+
+    :return: Position of the key, or None if it is not present.
+    """
+
+    position = bisect_left(keys, key)
+    return position if position < len(keys) and keys[position] == key else None
+
+
+class PostingLists(Sequence[memoryview]):
+    """
+    Read-only sequence of id lists stored back to back in one flat array, plus an array of end offsets.
+    One pair of arrays takes far less memory than an array object per list, and is exactly what a corpus
+    snapshot stores, so an index can use either built arrays or views into the mapped file.
+    Lists are returned as zero-copy memoryview slices.
+    """
+
+    def __init__(self, offsets: Sequence[int], ids: array | memoryview):
+        self.offsets = offsets
+        self.ids = memoryview(ids)
+
+    @classmethod
+    def build(cls, lists: Iterable[Iterable[int]]) -> "PostingLists":
+        """
+        Concatenates id lists into the flat layout.
+
+        :param lists: The id lists in position order.
+
+        :return: New posting lists.
+        """
+
+        offsets = array("I", [0])
+        ids = array("I")
+        for ids_of_list in lists:
+            ids.extend(ids_of_list)
+            offsets.append(len(ids))
+
+        return cls(offsets, ids)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> memoryview:
+        return self.ids[self.offsets[position]:self.offsets[position + 1]]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for position in range(len(self)):
+            yield self[position]
@@ -0,0 +1,149 @@
+from typing import Sequence
+
+import numpy as np
+from scipy.sparse import csc_matrix
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so its siblings are imported relatively.
+from .normalize import normalize_text, tokenize
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequencies are weighted per field, so a word in the idiom itself counts
+# more towards relevance than the same word in its definition.
+IDIOM_FIELD_WEIGHT = 3.0
+SYNONYMS_FIELD_WEIGHT = 2.0
+DEFINITION_FIELD_WEIGHT = 1.0
+
+# Types of the weight matrix arrays as stored in a corpus snapshot
+WEIGHT_TYPE = np.float64
+INDEX_TYPE = np.int32
+
+class BM25Ranker:
+    """
+    Okapi BM25 relevance ranking over the idiom, definition and synonyms of every corpus entry.
+
+    The full BM25 contribution of every (document, term) pair is precomputed into a sparse
+    column-oriented matrix. Scoring a query is then a column slice and a weighted bincount,
+    followed by a `partition` top-k selection, with no Python loop over documents.
+    """
+
+    def __init__(self, terms: Sequence[str], weights: csc_matrix):
+        self.vocabulary = {term: term_id for term_id, term in enumerate(terms)}
+        self.weights = weights
+        self.document_count = weights.shape[0]
+
+    @classmethod
+    def build(cls, idioms: Sequence[str], definitions: Sequence[str], synonyms: Sequence[Sequence[str]]) -> "BM25Ranker":
+        """
+        Tokenizes every corpus entry and precomputes the BM25 weight of each of its terms.
+
+        :param idioms: Idiom texts in corpus order.
+        :param definitions: Definitions in corpus order.
+        :param synonyms: Synonym lists in corpus order.
+
+        :return: A new ranker.
+        """
+
+        vocabulary: dict[str, int] = {}
+        rows: list[int] = []
+        columns: list[int] = []
+        frequencies: list[float] = []
+
+        for document_id, (idiom, definition, idiom_synonyms) in enumerate(zip(idioms, definitions, synonyms)):
+            weighted_counts: dict[int, float] = {}
+            for text, weight in ((idiom, IDIOM_FIELD_WEIGHT),
+                                 (definition, DEFINITION_FIELD_WEIGHT),
+                                 (" ".join(idiom_synonyms), SYNONYMS_FIELD_WEIGHT)):
+                for token in tokenize(normalize_text(text)):
+                    term_id = vocabulary.setdefault(token, len(vocabulary))
+                    weighted_counts[term_id] = weighted_counts.get(term_id, 0.0) + weight
+
+            rows.extend([document_id] * len(weighted_counts))
+            columns.extend(weighted_counts.keys())
+            frequencies.extend(weighted_counts.values())
+
+        document_count = len(idioms)
+        row_ids = np.asarray(rows, dtype=np.int64)
+        column_ids = np.asarray(columns, dtype=np.int64)
+        term_frequencies = np.asarray(frequencies, dtype=np.float64)
+
+        document_lengths = np.bincount(row_ids, weights=term_frequencies, minlength=document_count)
+        average_length = document_lengths.mean() if document_count else 0.0
+        document_frequencies = np.bincount(column_ids, minlength=len(vocabulary))
+        inverse_document_frequencies = np.log1p((document_count - document_frequencies + 0.5)
+                                                / (document_frequencies + 0.5))
+
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * document_lengths[row_ids] / (average_length or 1.0))
+        scores = (inverse_document_frequencies[column_ids]
+                  * term_frequencies * (BM25_K1 + 1) / (term_frequencies + length_norm))
+
+        return cls(list(vocabulary), csc_matrix((scores, (row_ids, column_ids)), shape=(document_count, len(vocabulary))))
+
+    @classmethod
+    def from_arrays(cls, terms: Sequence[str], document_count: int, data: memoryview, indices: memoryview,
+                    indptr: memoryview) -> "BM25Ranker":
+        """
+        Restores a ranker from the arrays returned by `arrays()`, e.g. as mapped from a corpus snapshot.
+        The weight matrix uses the buffers in place, so worker processes mapping the same file share it.
+
+        :param terms: Vocabulary in term id order.
+        :param document_count: Number of corpus entries.
+        :param data: Weights of the stored matrix entries.
+        :param indices: Row of every stored entry.
+        :param indptr: Start of every column within `data` and `indices`.
+
+        :return: The restored ranker.
+        """
+
+        weights = csc_matrix((np.frombuffer(data, dtype=WEIGHT_TYPE),
+                              np.frombuffer(indices, dtype=INDEX_TYPE),
+                              np.frombuffer(indptr, dtype=INDEX_TYPE)),
+                             shape=(document_count, len(terms)), copy=False)
+
+        return cls(terms, weights)
+
+    def arrays(self) -> tuple[list[str], bytes, bytes, bytes]:
+        """
+        Serializes the ranker for a corpus snapshot.
+
+        :return: The vocabulary in term id order, followed by the weight, row index and column pointer arrays.
+        """
+
+        return (list(self.vocabulary),
+                self.weights.data.astype(WEIGHT_TYPE).tobytes(),
+                self.weights.indices.astype(INDEX_TYPE).tobytes(),
+                self.weights.indptr.astype(INDEX_TYPE).tobytes())
+
+    def search(self, text: str, limit: int) -> list[int]:
+        """
+        Ranks corpus entries by their BM25 relevance to the query text.
+
+        :param text: Free-text query, e.g. a description of the meaning being looked for.
+        :param limit: Maximum number of ids to return.
+
+        :return: Ids of matching entries, most relevant first.
+        """
+
+        term_ids = sorted({self.vocabulary[token] for token in tokenize(normalize_text(text)) if token in self.vocabulary})
+        if not term_ids:
+            return []
+
+        query_columns = self.weights[:, term_ids]
+        scores = np.bincount(query_columns.indices, weights=query_columns.data, minlength=self.document_count)
+
+        if limit <= 0:
+            return []
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            # Keeps every candidate scoring at least the limit-th best score, so that of several entries tied
+            # at the cut-off, the alphabetically first ones are returned rather than an arbitrary few
+            candidate_scores = scores[candidates]
+            cutoff = np.partition(candidate_scores, len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[candidate_scores >= cutoff]
+
+        # Stable sort on the negated scores keeps ties in alphabetical corpus order
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+        return ranked.tolist()
@@ -0,0 +1,110 @@
+from pymongo.errors import PyMongoError
+import asyncio
+import time
+
+from api.core import database
+from api.core.config import settings
+from api.models.corpus_version import CorpusVersion
+from api.search import engine
+from api.search.result_cache import result_cache
+
+class CorpusReloader:
+    """
+    Background task keeping the search engine in step with the corpus version bumped by `populate_db.py`.
+    On a replica set or sharded cluster, changes to the corpus version document are pushed through a change
+    stream; a standalone mongod has no change streams, so the version is polled instead. Either way, a stale
+    engine is rebuilt off the event loop and swapped in only once complete.
+    """
+
+    def __init__(self, poll_seconds: float, debounce_seconds: float):
+        self.poll_seconds = poll_seconds
+        self.debounce_seconds = debounce_seconds
+        self.uses_change_stream = False
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_reload_seconds = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        """
+        Picks the change detection method supported by the server and starts watching in the background.
+        """
+
+        hello = await database.client.admin.command("hello")
+        self.uses_change_stream = "setName" in hello or hello.get("msg") == "isdbgrid"
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def reload_if_stale(self) -> bool:
+        """
+        Rebuilds the search engine if its corpus version differs from the database's.
+        If the rebuild fails, the current engine keeps serving requests.
+
+        :return: True if a new engine was swapped in.
+        """
+
+        corpus_version = await CorpusVersion.find_one({})
+        version = corpus_version.version if corpus_version else 0
+        if engine.engine is not None and engine.engine.version == version:
+            return False
+
+        started_at = time.perf_counter()
+        try:
+            await engine.init_search_engine()
+        except Exception as error:
+            self.failed_reloads += 1
+            print(f"Failed to reload the search index for corpus version {version}: {error}", flush=True)
+            return False
+
+        self.reloads += 1
+        self.last_reload_seconds = time.perf_counter() - started_at
+        # Results of older versions can no longer be hit, so free their memory now rather than waiting for expiry
+        result_cache.clear()
+        print(f"Reloaded the search index for corpus version {engine.engine.version} "
+              f"in {self.last_reload_seconds:.2f}s", flush=True)
+        return True
+
+    async def _watch(self):
+        async with await CorpusVersion.get_pymongo_collection().watch() as stream:
+            # Changes made before the stream was opened, e.g. while reconnecting, are not replayed
+            await self.reload_if_stale()
+            async for _ in stream:
+                await asyncio.sleep(self.debounce_seconds)
+                await self.reload_if_stale()
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            await self.reload_if_stale()
+
+    async def _run(self):
+        while True:
+            try:
+                if self.uses_change_stream:
+                    await self._watch()
+                else:
+                    await self._poll()
+            except PyMongoError as error:
+                print(f"Corpus reloader lost its database connection, retrying: {error}", flush=True)
+                await asyncio.sleep(self.poll_seconds)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "uses_change_stream": self.uses_change_stream,
+            "corpus_version": engine.engine.version if engine.engine else 0,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_reload_seconds": self.last_reload_seconds
+        }
+
+
+corpus_reloader = CorpusReloader(poll_seconds=settings.corpus_reload_poll_seconds,
+                                 debounce_seconds=settings.corpus_reload_debounce_seconds)
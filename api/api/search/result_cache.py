@@ -0,0 +1,129 @@
+from fastapi import Depends, HTTPException, Query, Request, status
+from typing import Any, Awaitable, Callable, Hashable
+
+from api.auth.admission import Admission
+from api.auth.endpoint_dependencies import admit_request, get_current_user
+from api.core.cache import TTLCache
+from api.core.config import settings
+from api.core.single_flight import SingleFlight
+from api.models.user import User
+from api.search.engine import SearchEngine, get_search_engine
+
+# Responses only change when the corpus does, so clients must revalidate but may reuse their copy after a 304
+CACHE_CONTROL = "private, no-cache"
+
+# Query results keyed by corpus version, endpoint and normalized parameters.
+# Entries of older corpus versions are never hit again and age out of the LRU order.
+result_cache = TTLCache(max_size=settings.result_cache_size, ttl_seconds=settings.result_cache_ttl_seconds)
+
+# Identical queries missing the result cache at the same time are computed once
+result_computations = SingleFlight()
+
+def get_result_limit(limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return, capped by the service tier"),
+                     admission: Admission = Depends(admit_request)) -> int:
+    """
+    Dependency that resolves the number of results a list endpoint returns, after the caller's tier cap.
+    The same response URL can hold a different number of results once an account changes tier,
+    so the effective limit is part of both the result cache key and the entity tag.
+
+    :param limit: The number of results the client asked for.
+    :param admission: The admitted request, whose tier caps the limit.
+
+    :return: The effective limit.
+    """
+
+    return admission.cap_results(limit)
+
+
+def corpus_etag(version: int, limit: int) -> str:
+    """
+    Builds the entity tag of a response generated from the given corpus version.
+
+    :param version: The corpus version.
+    :param limit: The effective result limit of the response.
+
+    :return: A quoted strong ETag value.
+    """
+
+    return f'"corpus-{version}-limit-{limit}"'
+
+
+def corpus_cache_headers(version: int, limit: int) -> dict[str, str]:
+    """
+    Builds the cache validator headers for a response generated from the given corpus version.
+
+    :param version: The corpus version.
+    :param limit: The effective result limit of the response.
+
+    :return: ETag and Cache-Control headers.
+    """
+
+    return {"ETag": corpus_etag(version, limit), "Cache-Control": CACHE_CONTROL}
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Checks an If-None-Match request header against the current entity tag.
+
+    :param if_none_match: Raw value of the If-None-Match header, if any.
+    :param etag: The current entity tag.
+
+    :return: True if the client's copy is still current.
+    """
+
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def check_corpus_etag(request: Request,
+                            admission: Admission = Depends(admit_request),
+                            user: User = Depends(get_current_user),
+                            limit: int = Depends(get_result_limit),
+                            search_engine: SearchEngine = Depends(get_search_engine)):
+    """
+    Dependency that answers conditional requests for corpus-derived responses.
+    Authenticated clients presenting a current ETag receive an empty 304 Not Modified response.
+    Endpoints using it must take their limit from `get_result_limit` and add `corpus_cache_headers` to their own responses.
+
+    :param request: The incoming request.
+    :param admission: Revalidations count against the caller's rate limit; resolved first, so rejected requests skip the user lookup.
+    :param user: The authenticated user; validation only happens after authentication.
+    :param limit: The effective result limit, which identifies the response content together with the corpus version.
+    :param search_engine: The engine whose corpus version identifies the response content.
+    """
+
+    if etag_matches(request.headers.get("if-none-match"), corpus_etag(search_engine.version, limit)):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED,
+                            headers=corpus_cache_headers(search_engine.version, limit))
+
+
+async def get_cached_results(search_engine: SearchEngine,
+                             key: Hashable,
+                             compute: Callable[[], Awaitable[list[Any]]]) -> list[Any]:
+    """
+    Returns cached results for a query of the engine's corpus version, computing and caching them on a miss.
+    Empty results are cached as well, so repeated misses do not reach the indexes or the database,
+    and concurrent misses for the same query share one computation.
+
+    :param search_engine: The engine serving the request; its corpus version is part of the cache key.
+    :param key: Endpoint name and normalized query parameters, including the effective limit.
+    :param compute: Coroutine function producing the results on a cache miss.
+
+    :return: The query results.
+    """
+
+    versioned_key = (search_engine.version, key)
+
+    async def compute_and_cache() -> list[Any]:
+        computed_results = await compute()
+        result_cache.set(versioned_key, computed_results)
+        return computed_results
+
+    results = result_cache.get(versioned_key)
+    if results is None:
+        results = await result_computations.run(versioned_key, compute_and_cache)
+
+    return results
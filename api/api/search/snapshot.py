@@ -0,0 +1,276 @@
+from array import array
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+import mmap
+import os
+import struct
+import sys
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so it must only depend on the standard library and siblings that do the same, imported relatively.
+from .postings import PostingLists
+
+MAGIC = b"IDIOMSNP"
+FORMAT_VERSION = 5
+HEADER = struct.Struct("<8sIIQI")
+SECTION_ENTRY = struct.Struct("<32sQQ")
+SECTION_ALIGNMENT = 8
+BYTE_ORDERS = {"little": 0, "big": 1}
+
+class SnapshotError(Exception):
+    """
+    Raised when a snapshot file is truncated or was written in an incompatible format.
+    """
+
+
+class StringTable(Sequence[str]):
+    """
+    Read-only sequence of strings stored as one UTF-8 blob plus an array of end offsets.
+    Strings are decoded on access, so the table itself occupies no memory beyond the mapped file.
+    """
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        if position < 0:
+            position += len(self)
+        return str(self.blob[self.offsets[position]:self.offsets[position + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(len(self)):
+            yield self[position]
+
+
+class SynonymLists(Sequence[list[str]]):
+    """
+    Read-only sequence of the synonym lists of every idiom. Each distinct synonym is stored once in a
+    string table, and every idiom holds a slice of synonym ids into it.
+    """
+
+    def __init__(self, offsets: memoryview, synonym_ids: memoryview, synonyms: StringTable):
+        self.offsets = offsets
+        self.synonym_ids = synonym_ids
+        self.synonyms = synonyms
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> list[str]:
+        return [self.synonyms[synonym_id] for synonym_id in self.synonym_ids[self.offsets[position]:self.offsets[position + 1]]]
+
+    def __iter__(self) -> Iterator[list[str]]:
+        for position in range(len(self)):
+            yield self[position]
+
+
+class PostingsMap(Mapping[str, memoryview]):
+    """
+    Read-only mapping from index keys to sorted posting lists of document ids.
+    The keys are decoded into a dictionary once, as decoding them during every lookup would cost
+    more than the lookup itself; the posting lists stay in the mapped file.
+    """
+
+    def __init__(self, keys: StringTable, offsets: memoryview, postings: memoryview):
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.offsets = offsets
+        self.postings = postings
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.positions)
+
+    def __getitem__(self, key: str) -> memoryview:
+        position = self.positions[key]
+        return self.postings[self.offsets[position]:self.offsets[position + 1]]
+
+
+def corpus_identity(database: str, corpus_version_id: object) -> str:
+    """
+    Identifies the corpus a snapshot belongs to. Version numbers restart in every database, so a snapshot
+    written for another database, or for a corpus that was dropped and repopulated, could otherwise carry
+    a matching version.
+
+    :param database: Name of the database holding the idioms.
+    :param corpus_version_id: Id of the corpus version record, which is recreated along with the corpus.
+
+    :return: The corpus identity stored in the snapshot.
+    """
+
+    return f"{database}/{corpus_version_id}"
+
+
+def _string_table(strings: Sequence[str]) -> tuple[array, bytes]:
+    offsets = array("I", [0])
+    encoded = bytearray()
+    for string in strings:
+        encoded += string.encode("utf-8")
+        offsets.append(len(encoded))
+
+    return offsets, bytes(encoded)
+
+
+def _flatten(arrays: Sequence) -> list:
+    # Posting lists are stored as their offsets and ids sections
+    flattened = []
+    for item in arrays:
+        flattened.extend((array("I", item.offsets), item.ids) if isinstance(item, PostingLists) else (item,))
+
+    return flattened
+
+
+def write_snapshot(path: str | Path,
+                   corpus_id: str,
+                   version: int,
+                   idioms: Sequence[str],
+                   definitions: Sequence[str],
+                   synonyms: Sequence[Sequence[str]],
+                   normalized_idioms: Sequence[str],
+                   trigram_postings: Mapping[str, Sequence[int]],
+                   ranking: tuple[Sequence[str], bytes, bytes, bytes],
+                   suggestion_suffixes: Sequence[str],
+                   suggestion_ids: array,
+                   synonym_index: tuple[Sequence[str], PostingLists, Sequence[str], PostingLists],
+                   fuzzy_index: tuple[Sequence[str], PostingLists, Sequence[str], PostingLists],
+                   idiom_matcher: tuple[Sequence[str], array, array, array, array, array, PostingLists]):
+    """
+    Writes a corpus snapshot. The file is written next to its destination and then renamed over it,
+    so workers opening the snapshot never see a partially written file.
+
+    :param path: Destination of the snapshot file.
+    :param corpus_id: Identity of the corpus, as returned by `corpus_identity`.
+    :param version: Corpus version the snapshot was built from.
+    :param idioms: Idiom texts, ordered by their normalized text as in `IdiomCorpus`.
+    :param definitions: Definitions in corpus order.
+    :param synonyms: Synonym lists in corpus order.
+    :param normalized_idioms: Normalized idiom texts in corpus order.
+    :param trigram_postings: Trigram index postings over the normalized idioms, including the shorter keys.
+    :param ranking: Vocabulary and weight matrix arrays of the relevance ranker, as returned by `BM25Ranker.arrays()`.
+    :param suggestion_suffixes: Sorted word-boundary suffixes of the suggestion index.
+    :param suggestion_ids: Corpus position of the idiom every suffix belongs to.
+    :param synonym_index: Arrays of the synonym index, as returned by `SynonymIndex.arrays()`.
+    :param fuzzy_index: Arrays of the fuzzy index, as returned by `FuzzyIndex.arrays()`.
+    :param idiom_matcher: Arrays of the idiom matcher, as returned by `IdiomMatcher.arrays()`.
+    """
+
+    synonym_ids: dict[str, int] = {}
+    idiom_synonym_offsets = array("I", [0])
+    idiom_synonym_ids = array("I")
+    for idiom_synonyms in synonyms:
+        idiom_synonym_ids.extend(synonym_ids.setdefault(synonym, len(synonym_ids)) for synonym in idiom_synonyms)
+        idiom_synonym_offsets.append(len(idiom_synonym_ids))
+
+    trigrams = sorted(trigram_postings)
+    posting_offsets = array("I", [0])
+    posting_ids = array("I")
+    for trigram in trigrams:
+        posting_ids.extend(trigram_postings[trigram])
+        posting_offsets.append(len(posting_ids))
+
+    sections: dict[str, bytes | array] = {"corpus": corpus_id.encode("utf-8")}
+    ranking_terms, sections["ranking.data"], sections["ranking.indices"], sections["ranking.indptr"] = ranking
+    for name, strings in (("idioms", idioms), ("definitions", definitions),
+                          ("normalized", normalized_idioms), ("synonyms", list(synonym_ids)), ("trigrams", trigrams),
+                          ("ranking_terms", ranking_terms), ("suffixes", suggestion_suffixes)):
+        sections[f"{name}.offsets"], sections[f"{name}.blob"] = _string_table(strings)
+    sections["idiom_synonyms.offsets"] = idiom_synonym_offsets
+    sections["idiom_synonyms.ids"] = idiom_synonym_ids
+    sections["postings.offsets"] = posting_offsets
+    sections["postings.ids"] = posting_ids
+    sections["suffix_ids"] = suggestion_ids
+
+    (synonym_phrases, sections["synonym_phrase_postings.offsets"], sections["synonym_phrase_postings.ids"],
+     synonym_tokens, sections["synonym_token_postings.offsets"], sections["synonym_token_postings.ids"]) = _flatten(synonym_index)
+    (fuzzy_words, sections["fuzzy_word_postings.offsets"], sections["fuzzy_word_postings.ids"],
+     fuzzy_deletes, sections["fuzzy_delete_postings.offsets"], sections["fuzzy_delete_postings.ids"]) = _flatten(fuzzy_index)
+    (matcher_vocabulary, sections["matcher.transition_keys"], sections["matcher.transition_targets"],
+     sections["matcher.depths"], sections["matcher.failures"], sections["matcher.output_links"],
+     sections["matcher_outputs.offsets"], sections["matcher_outputs.ids"]) = _flatten(idiom_matcher)
+    for name, strings in (("synonym_phrases", synonym_phrases), ("synonym_tokens", synonym_tokens),
+                          ("fuzzy_words", fuzzy_words), ("fuzzy_deletes", fuzzy_deletes),
+                          ("matcher_vocabulary", matcher_vocabulary)):
+        sections[f"{name}.offsets"], sections[f"{name}.blob"] = _string_table(strings)
+
+    position = HEADER.size + SECTION_ENTRY.size * len(sections)
+    table = bytearray()
+    payload = bytearray()
+    for name, data in sections.items():
+        data = data.tobytes() if isinstance(data, (array, memoryview)) else data
+        padding = -(position + len(payload)) % SECTION_ALIGNMENT
+        payload += b"\0" * padding
+        table += SECTION_ENTRY.pack(name.encode("ascii"), position + len(payload), len(data))
+        payload += data
+
+    temporary_path = Path(f"{path}.tmp")
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDERS[sys.byteorder], version, len(sections)))
+        snapshot_file.write(table)
+        snapshot_file.write(payload)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temporary_path, path)
+
+
+class CorpusSnapshot:
+    """
+    A corpus snapshot mapped read-only into memory. Every worker process mapping the same file
+    shares its pages through the OS page cache. Opening it parses the section table and decodes
+    the trigram keys; every other section is a view into the mapped file.
+    """
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as snapshot_file:
+            try:
+                self.buffer = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                raise SnapshotError(f"Snapshot {path} is empty") from error
+
+        view = memoryview(self.buffer)
+        if len(view) < HEADER.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+
+        magic, format_version, byte_order, self.version, section_count = HEADER.unpack_from(view)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise SnapshotError(f"Snapshot {path} has an unsupported format")
+        if byte_order != BYTE_ORDERS[sys.byteorder]:
+            raise SnapshotError(f"Snapshot {path} was written on a machine with a different byte order")
+
+        sections = {}
+        for entry in range(section_count):
+            name, offset, length = SECTION_ENTRY.unpack_from(view, HEADER.size + entry * SECTION_ENTRY.size)
+            if offset + length > len(view):
+                raise SnapshotError(f"Snapshot {path} is truncated")
+            sections[name.rstrip(b"\0").decode("ascii")] = view[offset:offset + length]
+
+        def ids(name: str) -> memoryview:
+            return sections[name].cast("I")
+
+        def strings(name: str) -> StringTable:
+            return StringTable(ids(f"{name}.offsets"), sections[f"{name}.blob"])
+
+        def postings(name: str) -> PostingLists:
+            return PostingLists(ids(f"{name}.offsets"), ids(f"{name}.ids"))
+
+        self.corpus_id = str(sections["corpus"], "utf-8")
+        self.idioms = strings("idioms")
+        self.definitions = strings("definitions")
+        self.normalized_idioms = strings("normalized")
+        self.synonyms = SynonymLists(ids("idiom_synonyms.offsets"), ids("idiom_synonyms.ids"), strings("synonyms"))
+        self.trigram_postings = PostingsMap(strings("trigrams"), ids("postings.offsets"), ids("postings.ids"))
+        self.ranking_terms = strings("ranking_terms")
+        self.ranking_arrays = (sections["ranking.data"], sections["ranking.indices"], sections["ranking.indptr"])
+        self.suggestion_suffixes = strings("suffixes")
+        self.suggestion_ids = ids("suffix_ids")
+        self.synonym_index = (strings("synonym_phrases"), postings("synonym_phrase_postings"),
+                              strings("synonym_tokens"), postings("synonym_token_postings"))
+        self.fuzzy_index = (strings("fuzzy_words"), postings("fuzzy_word_postings"),
+                            strings("fuzzy_deletes"), postings("fuzzy_delete_postings"))
+        self.idiom_matcher = (strings("matcher_vocabulary"), sections["matcher.transition_keys"].cast("Q"),
+                              ids("matcher.transition_targets"), ids("matcher.depths"), ids("matcher.failures"),
+                              ids("matcher.output_links"), postings("matcher_outputs"))
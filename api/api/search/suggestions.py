@@ -0,0 +1,86 @@
+from array import array
+from bisect import bisect_left
+from typing import Sequence
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so its siblings are imported relatively.
+from .normalize import TOKEN_PATTERN, normalize_text, prefix_upper_bound
+
+class SuggestionIndex:
+    """
+    Typeahead index answering "which idioms complete this prefix" with two binary searches.
+
+    Two sorted key arrays are kept: the full normalized idioms, and every suffix of an idiom that starts
+    at a word boundary, so that "thin ice" completes to "skating on thin ice". All keys starting with
+    a prefix form one contiguous range of a sorted array, and the first keys of that range are already
+    the alphabetically first completions. A lookup therefore costs O(log n) string comparisons
+    plus the number of suggestions returned, regardless of how many idioms match the prefix.
+    """
+
+    def __init__(self, normalized_idioms: Sequence[str], suffixes: Sequence[str], suffix_ids: Sequence[int]):
+        # The corpus is sorted by normalized idiom, so the full keys are already in order
+        self.idioms = normalized_idioms
+        self.suffixes = suffixes
+        self.suffix_ids = suffix_ids
+
+    @classmethod
+    def build(cls, normalized_idioms: Sequence[str]) -> "SuggestionIndex":
+        """
+        Collects and sorts the word-boundary suffixes of every idiom.
+
+        :param normalized_idioms: Normalized idiom texts in corpus order.
+
+        :return: A new suggestion index.
+        """
+
+        # Suffixes are sorted per first character and the buckets concatenated, which gives the same order as
+        # one sort but in short steps, so a rebuild in a background thread never holds the GIL for long
+        buckets: dict[str, list[tuple[str, int]]] = {}
+        for idiom_id, idiom in enumerate(normalized_idioms):
+            for match in TOKEN_PATTERN.finditer(idiom):
+                if match.start() > 0:
+                    buckets.setdefault(idiom[match.start()], []).append((idiom[match.start():], idiom_id))
+
+        suffixes = []
+        suffix_ids = array("I")
+        for first_character in sorted(buckets):
+            bucket = sorted(buckets.pop(first_character))
+            suffixes.extend(suffix for suffix, _ in bucket)
+            suffix_ids.extend(idiom_id for _, idiom_id in bucket)
+
+        return cls(normalized_idioms, suffixes, suffix_ids)
+
+    def suggest(self, prefix: str, limit: int) -> list[int]:
+        """
+        Finds idioms completing a typed prefix. Idioms starting with the prefix come first,
+        followed by idioms containing a word that starts with it, each group in alphabetical order.
+
+        :param prefix: The text typed so far.
+        :param limit: Maximum number of suggestions.
+
+        :return: Corpus positions of the suggested idioms.
+        """
+
+        query = normalize_text(prefix)
+        if not query:
+            return []
+
+        upper_bound = prefix_upper_bound(query)
+        start = bisect_left(self.idioms, query)
+        end = len(self.idioms) if upper_bound is None else bisect_left(self.idioms, upper_bound, lo=start)
+        results = list(range(start, min(end, start + limit)))
+        if len(results) >= limit:
+            return results
+
+        seen = set(results)
+        start = bisect_left(self.suffixes, query)
+        end = len(self.suffixes) if upper_bound is None else bisect_left(self.suffixes, upper_bound, lo=start)
+        for position in range(start, end):
+            idiom_id = self.suffix_ids[position]
+            if idiom_id not in seen:
+                seen.add(idiom_id)
+                results.append(idiom_id)
+                if len(results) >= limit:
+                    break
+
+        return results
@@ -0,0 +1,152 @@
+from bisect import bisect_left
+from enum import Enum
+from heapq import merge
+from typing import Iterable, Sequence
+
+# This module is shared with populate_db.py, which imports it without the `api` package prefix,
+# so its siblings are imported relatively.
+from .normalize import normalize_text, prefix_upper_bound, tokenize
+from .postings import PostingLists, find_sorted
+
+class SynonymMatch(str, Enum):
+    """
+    Defines how a requested word or phrase is compared against the synonyms of an idiom.
+    """
+
+    exact = "exact"
+    prefix = "prefix"
+    contains = "contains"
+
+
+def _take_distinct(sorted_postings: Iterable[Sequence[int]], limit: int) -> list[int]:
+    results: list[int] = []
+    for idiom_id in merge(*sorted_postings):
+        if results and results[-1] == idiom_id:
+            continue
+        results.append(idiom_id)
+        if len(results) >= limit:
+            break
+
+    return results
+
+
+def _prefix_range(keys: Sequence[str], prefix: str) -> tuple[int, int]:
+    start = bisect_left(keys, prefix)
+    upper_bound = prefix_upper_bound(prefix)
+
+    return start, len(keys) if upper_bound is None else bisect_left(keys, upper_bound, lo=start)
+
+
+class SynonymIndex:
+    """
+    Reverse index from normalized synonym phrases to the idioms that list them.
+    Every distinct phrase is stored once in sorted order, which allows exact and prefix lookups
+    through a binary search. A second sorted list of the word tokens of all phrases, each with
+    the phrases containing it, answers token-contains lookups without scanning every phrase.
+    Both are plain sorted sequences and flat posting lists, so the index can be used in place
+    from a memory-mapped corpus snapshot.
+    """
+
+    def __init__(self, phrases: Sequence[str], idiom_postings: PostingLists, tokens: Sequence[str],
+                 token_postings: PostingLists):
+        self.phrases = phrases
+        self.idiom_postings = idiom_postings
+        self.tokens = tokens
+        self.token_postings = token_postings
+
+    @classmethod
+    def build(cls, synonyms: Sequence[Sequence[str]]) -> "SynonymIndex":
+        """
+        Normalizes and sorts the synonym phrases of every idiom, and collects their word tokens.
+
+        :param synonyms: Synonym lists in corpus order.
+
+        :return: A new synonym index.
+        """
+
+        idiom_ids_by_phrase: dict[str, list[int]] = {}
+        for idiom_id, idiom_synonyms in enumerate(synonyms):
+            for synonym in idiom_synonyms:
+                phrase = normalize_text(synonym)
+                if phrase:
+                    idiom_ids = idiom_ids_by_phrase.setdefault(phrase, [])
+                    if not idiom_ids or idiom_ids[-1] != idiom_id:
+                        idiom_ids.append(idiom_id)
+
+        phrases = sorted(idiom_ids_by_phrase)
+        token_postings: dict[str, list[int]] = {}
+        for phrase_id, phrase in enumerate(phrases):
+            for token in set(tokenize(phrase)):
+                token_postings.setdefault(token, []).append(phrase_id)
+        tokens = sorted(token_postings)
+
+        return cls(phrases, PostingLists.build(idiom_ids_by_phrase[phrase] for phrase in phrases),
+                   tokens, PostingLists.build(token_postings[token] for token in tokens))
+
+    def arrays(self) -> tuple[Sequence[str], PostingLists, Sequence[str], PostingLists]:
+        """
+        Serializes the index for a corpus snapshot.
+
+        :return: The constructor arguments of the index.
+        """
+
+        return self.phrases, self.idiom_postings, self.tokens, self.token_postings
+
+    def search(self, synonym: str, match: SynonymMatch, limit: int) -> list[int]:
+        """
+        Finds idioms that have a synonym matching the requested word or phrase.
+
+        :param synonym: Word or phrase to look for.
+        :param match: How the synonym is compared against stored synonym phrases.
+        :param limit: Maximum number of idiom ids to return.
+
+        :return: Ids of matching idioms in ascending order.
+        """
+
+        query = normalize_text(synonym)
+        if not query:
+            return []
+
+        if match == SynonymMatch.exact:
+            phrase_id = find_sorted(self.phrases, query)
+            phrase_ids: Iterable[int] = [] if phrase_id is None else [phrase_id]
+        elif match == SynonymMatch.prefix:
+            phrase_ids = range(*_prefix_range(self.phrases, query))
+        else:
+            phrase_ids = self._phrases_containing(tokenize(query))
+
+        return _take_distinct((self.idiom_postings[phrase_id] for phrase_id in phrase_ids), limit)
+
+    def _phrases_containing(self, query_tokens: list[str]) -> list[int]:
+        if not query_tokens:
+            return []
+
+        # Every query token must be a whole token of the phrase, except the last one which
+        # may still be partially typed and is therefore matched as a token prefix.
+        *complete_tokens, partial_token = query_tokens
+        candidate_sets = []
+        for token in complete_tokens:
+            token_id = find_sorted(self.tokens, token)
+            if token_id is None:
+                return []
+            candidate_sets.append(set(self.token_postings[token_id]))
+
+        partial_matches = set()
+        for token_id in range(*_prefix_range(self.tokens, partial_token)):
+            partial_matches.update(self.token_postings[token_id])
+        candidate_sets.append(partial_matches)
+
+        candidates = set.intersection(*candidate_sets)
+        return [phrase_id for phrase_id in candidates
+                if _contains_token_sequence(tokenize(self.phrases[phrase_id]), query_tokens)]
+
+
+def _contains_token_sequence(phrase_tokens: list[str], query_tokens: list[str]) -> bool:
+    *complete_tokens, partial_token = query_tokens
+    width = len(query_tokens)
+    for start in range(len(phrase_tokens) - width + 1):
+        window = phrase_tokens[start:start + width]
+        if window[:-1] == complete_tokens and window[-1].startswith(partial_token):
+            return True
+
+    return False
@@ -0,0 +1,111 @@
+from array import array
+from bisect import bisect_left
+from typing import Sequence
+
+TRIGRAM_LENGTH = 3
+
+def extract_trigrams(text: str) -> set[str]:
+    """
+    Returns the distinct character trigrams contained in the given text.
+
+    :param text: Normalized text to split into trigrams.
+
+    :return: Set of all overlapping three character substrings.
+    """
+
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+
+def extract_index_keys(text: str) -> set[str]:
+    """
+    Returns the distinct substrings of one to three characters contained in the given text.
+
+    :param text: Normalized text to index.
+
+    :return: Set of all overlapping substrings up to the trigram length.
+    """
+
+    return {text[i:i + length] for length in range(1, TRIGRAM_LENGTH + 1) for i in range(len(text) - length + 1)}
+
+
+def contains_sorted(postings: Sequence[int], document_id: int) -> bool:
+    """
+    Checks whether a sorted posting list contains a document id using binary search.
+
+    :param postings: Sorted sequence of document ids.
+    :param document_id: The id to look for.
+
+    :return: True if the id is present, False otherwise.
+    """
+
+    position = bisect_left(postings, document_id)
+    return position < len(postings) and postings[position] == document_id
+
+
+class TrigramIndex:
+    """
+    Character-trigram inverted index for substring search over a list of normalized texts.
+    Every trigram maps to a sorted posting list of the ids (list positions) of the texts containing it.
+    A substring query only has to intersect the posting lists of its own trigrams, so the work per
+    query depends on how selective the query is rather than on the size of the corpus.
+    Substrings of one and two characters are indexed as well, so that shorter queries are answered
+    directly by their own posting list.
+    """
+
+    def __init__(self, texts: Sequence[str], postings: dict[str, Sequence[int]]):
+        self.texts = texts
+        self.postings = postings
+
+    @classmethod
+    def build(cls, texts: Sequence[str]) -> "TrigramIndex":
+        """
+        Builds the inverted index for the given texts.
+
+        :param texts: Normalized texts; the position of each text is used as its id.
+
+        :return: A new trigram index.
+        """
+
+        postings: dict[str, array] = {}
+        for document_id, text in enumerate(texts):
+            for key in extract_index_keys(text):
+                postings.setdefault(key, array("I")).append(document_id)
+
+        # Ids are appended in increasing order, so every posting list is already sorted
+        return cls(texts, postings)
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """
+        Finds the texts that contain the query as a substring.
+
+        :param query: Normalized substring to look for.
+        :param limit: Maximum number of ids to return.
+
+        :return: Ids of matching texts in ascending order.
+        """
+
+        if not query:
+            return []
+
+        if len(query) < TRIGRAM_LENGTH:
+            # The posting list of a short query lists exactly the texts containing it
+            return list(self.postings.get(query, ())[:limit])
+
+        posting_lists = []
+        for trigram in extract_trigrams(query):
+            posting_list = self.postings.get(trigram)
+            if not posting_list:
+                return []
+            posting_lists.append(posting_list)
+
+        posting_lists.sort(key=len)
+        smallest, others = posting_lists[0], posting_lists[1:]
+
+        results = []
+        for document_id in smallest:
+            if all(contains_sorted(other, document_id) for other in others) and query in self.texts[document_id]:
+                results.append(document_id)
+                if len(results) >= limit:
+                    break
+
+        return results
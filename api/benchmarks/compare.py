@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+
+# Median latency is compared; it is far less sensitive to scheduler noise than the mean or the tail
+COMPARED_STATISTIC = "median_seconds"
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """
+    Compares the benchmarks present in both result documents.
+
+    :param baseline: Result document of the reference run.
+    :param current: Result document of the run under test.
+    :param threshold: Relative slowdown above which a benchmark counts as regressed, e.g. 0.2 for 20%.
+
+    :return: One comparison per shared benchmark, with the ratio of current to baseline median latency.
+    """
+
+    comparisons = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if not reference or not reference[COMPARED_STATISTIC]:
+            continue
+
+        ratio = result[COMPARED_STATISTIC] / reference[COMPARED_STATISTIC]
+        comparisons.append({
+            "name": name,
+            "baseline_seconds": reference[COMPARED_STATISTIC],
+            "current_seconds": result[COMPARED_STATISTIC],
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold
+        })
+
+    return comparisons
+
+
+def print_comparisons(comparisons: list[dict]):
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>9}")
+    for comparison in comparisons:
+        print(f"{comparison['name']:<48} "
+              f"{comparison['baseline_seconds'] * 1000:>10.3f}ms "
+              f"{comparison['current_seconds'] * 1000:>10.3f}ms "
+              f"{(comparison['ratio'] - 1) * 100:>+8.1f}%"
+              f"{'  REGRESSION' if comparison['regressed'] else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files and flag regressions")
+    parser.add_argument("baseline", help="Result file of the reference run")
+    parser.add_argument("current", help="Result file of the run under test")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        comparisons = compare_results(json.load(baseline_file), json.load(current_file), args.threshold)
+
+    print_comparisons(comparisons)
+    sys.exit(1 if any(comparison["regressed"] for comparison in comparisons) else 0)
+
+if __name__ == "__main__":
+    main()
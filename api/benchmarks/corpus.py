@@ -0,0 +1,100 @@
+import random
+import pandas as pd
+
+# Relative letter frequencies of English text, in percent. Words drawn from them share trigrams about as often
+# as real idioms do, so the substring search has to be about as selective as it is on the master list.
+LETTER_FREQUENCIES = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1, "r": 6.0,
+    "d": 4.3, "l": 4.0, "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2, "g": 2.0, "y": 2.0,
+    "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8, "j": 0.15, "x": 0.15, "q": 0.1, "z": 0.07
+}
+
+# Relative frequencies of English word lengths, from one to twelve letters, in percent
+WORD_LENGTH_FREQUENCIES = (3.0, 17.0, 20.0, 16.0, 11.0, 9.0, 8.0, 6.0, 4.0, 3.0, 2.0, 1.0)
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    """
+    Builds a vocabulary of distinct pseudo-words with English letter and word length frequencies.
+
+    :param size: Number of words to generate.
+    :param rng: Random number generator to draw letters from.
+
+    :return: The generated words, in random order.
+    """
+
+    letters = list(LETTER_FREQUENCIES)
+    letter_weights = list(LETTER_FREQUENCIES.values())
+    lengths = range(1, len(WORD_LENGTH_FREQUENCIES) + 1)
+
+    words = {}
+    while len(words) < size:
+        length = rng.choices(lengths, weights=WORD_LENGTH_FREQUENCIES)[0]
+        words["".join(rng.choices(letters, weights=letter_weights, k=length))] = None
+
+    return list(words)
+
+
+def zipf_weights(size: int) -> list[float]:
+    """
+    Cumulative weights making the word of rank r about 1/r as frequent as the most frequent one,
+    as word frequencies are in natural language.
+
+    :param size: Number of words.
+
+    :return: Cumulative weights for `random.choices`.
+    """
+
+    total = 0.0
+    weights = []
+    for rank in range(1, size + 1):
+        total += 1 / rank
+        weights.append(total)
+
+    return weights
+
+
+def make_rows(size: int, seed: int = 0) -> list[dict]:
+    """
+    Generates a synthetic idiom corpus shaped like the master list:
+    short multi-word idioms, longer definitions and a few short synonym phrases each.
+    The same size and seed always produce the same corpus, so results are comparable between runs.
+
+    :param size: Number of distinct idioms to generate.
+    :param seed: Seed for the random number generator.
+
+    :return: Rows with `Idiom`, `Definition` and `Synonyms` keys.
+    """
+
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(min(max(500, size // 20), 20_000), rng)
+    word_weights = zipf_weights(len(vocabulary))
+    synonym_phrases = [" ".join(rng.sample(vocabulary, rng.randint(1, 3))) for _ in range(max(100, size // 5))]
+
+    rows = []
+    idioms = set()
+    while len(rows) < size:
+        idiom = " ".join(rng.choices(vocabulary, cum_weights=word_weights, k=rng.randint(2, 6)))
+        if idiom in idioms:
+            continue
+
+        idioms.add(idiom)
+        rows.append({
+            "Idiom": idiom,
+            "Definition": " ".join(rng.choices(vocabulary, cum_weights=word_weights, k=rng.randint(6, 16))).capitalize() + ".",
+            "Synonyms": rng.sample(synonym_phrases, rng.randint(0, 4))
+        })
+
+    return rows
+
+
+def make_dataframes(rows: list[dict], chunk_size: int) -> list[pd.DataFrame]:
+    """
+    Splits generated rows into dataframes formatted like the output of `extract_dataframes`.
+
+    :param rows: Rows generated by `make_rows`.
+    :param chunk_size: Number of rows per dataframe.
+
+    :return: The dataframes, in order.
+    """
+
+    return [pd.DataFrame(rows[start:start + chunk_size]) for start in range(0, len(rows), chunk_size)]
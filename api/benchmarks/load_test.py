@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, redirect_stdout
+from dataclasses import dataclass, field
+import io
+import json
+import os
+from pathlib import Path
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from benchmarks.corpus import make_dataframes, make_rows
+from benchmarks.mongo import find_free_port, throwaway_mongod
+from benchmarks.run import configure_environment
+
+ROUTES = ("login", "refresh", "search", "random", "by-letter")
+DEFAULT_MIX = "login=1,refresh=2,search=10,random=4,by-letter=3"
+DEFAULT_SLOS = ("p99=1000", "error_rate=0.01")
+PERCENTILES = (50, 95, 99)
+LOAD_TEST_PASSWORD = "load-test-password"
+
+# Searches only count as errors for unexpected status codes; a phrase without matches is a valid answer
+EXPECTED_STATUS = {
+    "login": {200},
+    "refresh": {200},
+    "search": {200, 404},
+    "random": {200},
+    "by-letter": {200, 404}
+}
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+    def record(self, latency: float, status_code: int, expected: bool):
+        self.latencies.append(latency)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if not expected:
+            self.errors += 1
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    access_token: str = ""
+    refresh_token: str = ""
+
+    def update_tokens(self, response: httpx.Response):
+        tokens = response.json()
+        self.access_token = tokens["access_token"]
+        self.refresh_token = tokens["refresh_token"]
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """
+    Parses a request mix such as `search=10,login=1` into route weights.
+
+    :param mix: Comma-separated route=weight pairs.
+
+    :return: Relative weights keyed by route.
+
+    :raises ValueError: If a route is unknown or no route has a positive weight.
+    """
+
+    weights = {}
+    for entry in mix.split(","):
+        route, _, weight = entry.partition("=")
+        if route.strip() not in ROUTES:
+            raise ValueError(f"Unknown route {route!r}; expected one of {', '.join(ROUTES)}")
+        weights[route.strip()] = float(weight)
+
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("The request mix needs at least one route with a positive weight")
+
+    return weights
+
+
+def parse_slos(slos: list[str]) -> dict[str | None, dict[str, float]]:
+    """
+    Parses SLO thresholds. `p95=250` applies to every route, `login:p95=800` overrides it for one route.
+    Latency thresholds are in milliseconds, error rates are fractions.
+
+    :param slos: Threshold specifications.
+
+    :return: Thresholds keyed by route, with None holding the thresholds shared by all routes.
+    """
+
+    thresholds: dict[str | None, dict[str, float]] = {None: {}}
+    for slo in slos:
+        target, _, value = slo.partition("=")
+        route, _, metric = target.rpartition(":")
+        if metric not in ("p50", "p95", "p99", "error_rate"):
+            raise ValueError(f"Unknown SLO metric {metric!r}; expected p50, p95, p99 or error_rate")
+        if route and route not in ROUTES:
+            raise ValueError(f"Unknown route {route!r} in SLO {slo!r}")
+        thresholds.setdefault(route or None, {})[metric] = float(value)
+
+    return thresholds
+
+
+def percentile(ordered: list[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+
+    :param ordered: Values sorted in ascending order.
+    :param percent: Percentile between 0 and 100.
+
+    :return: The percentile value, or 0.0 for an empty list.
+    """
+
+    if not ordered:
+        return 0.0
+
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+class LoadTest:
+    """
+    Closed-loop load generator: every virtual user sends its next request as soon as the previous one completes,
+    choosing the route at random according to the request mix. Each virtual user has its own account,
+    so refresh token rotation never races between users.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, weights: dict[str, float], phrases: list[str], seed: int, tier: str,
+                 assign_tier: Callable[[str, str], Awaitable] | None = None):
+        self.client = client
+        self.tier = tier
+        self.assign_tier = assign_tier
+        self.routes = list(weights)
+        self.weights = list(weights.values())
+        self.phrases = phrases
+        self.seed = seed
+        self.stats = {route: RouteStats() for route in self.routes}
+
+    async def sign_up(self, user: VirtualUser):
+        """
+        Registers a virtual user, or logs in if an earlier run against the same server already registered it.
+        Registration always creates a free account, so other tiers are assigned in the database and picked up
+        by logging in again.
+        """
+
+        response = await self.client.post("/auth/register", json={"email": user.email, "password": LOAD_TEST_PASSWORD})
+        if response.status_code == 409:
+            response = await self.client.post("/auth/login", json={"username": user.email, "password": LOAD_TEST_PASSWORD})
+        response.raise_for_status()
+
+        if self.assign_tier and self.tier != "free":
+            await self.assign_tier(user.email, self.tier)
+            response = await self.client.post("/auth/login", json={"username": user.email, "password": LOAD_TEST_PASSWORD})
+            response.raise_for_status()
+        user.update_tokens(response)
+
+    async def send(self, route: str, user: VirtualUser, rng: random.Random) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {user.access_token}"}
+        if route == "login":
+            return await self.client.post("/auth/login", json={"username": user.email, "password": LOAD_TEST_PASSWORD})
+        if route == "refresh":
+            return await self.client.post("/auth/refresh", headers={"Cookie": f"refresh_token={user.refresh_token}"})
+        if route == "search":
+            return await self.client.get(f"/idioms/search/{rng.choice(self.phrases)}", headers=headers)
+        if route == "random":
+            return await self.client.get("/idioms/random", headers=headers)
+
+        return await self.client.get(f"/idioms/by-letter/{rng.choice('abcdefghijklmnopqrstuvwxyz')}", headers=headers)
+
+    async def run_user(self, user: VirtualUser, deadline: float, rng: random.Random):
+        while time.perf_counter() < deadline:
+            route = rng.choices(self.routes, self.weights)[0]
+            started_at = time.perf_counter()
+            try:
+                response = await self.send(route, user, rng)
+                status_code = response.status_code
+            except httpx.HTTPError:
+                status_code = 0
+            self.stats[route].record(time.perf_counter() - started_at, status_code, status_code in EXPECTED_STATUS[route])
+
+            if route in ("login", "refresh") and status_code == 200:
+                user.update_tokens(response)
+
+    async def run(self, concurrency: int, duration_seconds: float) -> float:
+        """
+        Signs up the virtual users, then drives traffic until the duration has passed.
+
+        :param concurrency: Number of virtual users sending requests at the same time.
+        :param duration_seconds: How long to generate load for.
+
+        :return: The measured wall-clock duration in seconds.
+        """
+
+        users = [VirtualUser(email=f"load-test-{self.tier}-{index}@example.com") for index in range(concurrency)]
+        await asyncio.gather(*(self.sign_up(user) for user in users))
+
+        started_at = time.perf_counter()
+        deadline = started_at + duration_seconds
+        await asyncio.gather(*(self.run_user(user, deadline, random.Random(self.seed + index)) for index, user in enumerate(users)))
+
+        return time.perf_counter() - started_at
+
+    def report(self, elapsed_seconds: float) -> dict[str, dict]:
+        report = {}
+        for route, stats in self.stats.items():
+            ordered = sorted(stats.latencies)
+            report[route] = {
+                "requests": len(ordered),
+                "errors": stats.errors,
+                "error_rate": stats.errors / len(ordered) if ordered else 0.0,
+                "throughput_per_second": len(ordered) / elapsed_seconds,
+                **{f"p{percent}": percentile(ordered, percent) * 1000 for percent in PERCENTILES},
+                "status_codes": {str(code): count for code, count in sorted(stats.status_codes.items())}
+            }
+
+        return report
+
+
+def check_slos(report: dict[str, dict], thresholds: dict[str | None, dict[str, float]]) -> list[str]:
+    """
+    Compares the per-route results against the SLO thresholds.
+
+    :param report: Per-route results of the load test.
+    :param thresholds: Thresholds as returned by `parse_slos`.
+
+    :return: A description of every breached threshold.
+    """
+
+    breaches = []
+    for route, results in report.items():
+        if not results["requests"]:
+            continue
+
+        for metric, limit in {**thresholds[None], **thresholds.get(route, {})}.items():
+            if results[metric] > limit:
+                breaches.append(f"{route}: {metric} {results[metric]:.4g} exceeds {limit:.4g}")
+
+    return breaches
+
+
+def print_report(report: dict[str, dict], elapsed_seconds: float):
+    total = sum(results["requests"] for results in report.values())
+    print(f"{total} requests in {elapsed_seconds:.1f} s ({total / elapsed_seconds:.1f} req/s)")
+    print(f"{'route':<10} {'requests':>9} {'req/s':>8} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, results in report.items():
+        print(f"{route:<10} {results['requests']:>9} {results['throughput_per_second']:>8.1f} "
+              f"{results['error_rate'] * 100:>7.2f}% {results['p50']:>9.2f} {results['p95']:>9.2f} {results['p99']:>9.2f}")
+
+
+async def seed_database(size: int, seed: int) -> list[str]:
+    """
+    Replaces the load test database contents with a synthetic corpus.
+
+    :param size: Number of idioms to ingest.
+    :param seed: Seed for corpus generation.
+
+    :return: Search phrases taken from the generated idioms.
+    """
+
+    import populate_db
+    from pymongo import AsyncMongoClient
+    from api.core.config import settings
+
+    async with AsyncMongoClient(settings.mongo_database_connection_uri) as client:
+        await client.drop_database(settings.mongodb_db)
+
+    rows = make_rows(size, seed)
+    with redirect_stdout(io.StringIO()):
+        await populate_db.populate_database(settings.mongo_database_connection_uri,
+                                            iter(make_dataframes(rows, populate_db.CHUNK_SIZE)))
+
+    return [row["Idiom"].split()[0] for row in random.Random(seed).sample(rows, min(len(rows), 500))]
+
+
+async def assign_tier(email: str, tier: str):
+    from pymongo import AsyncMongoClient
+    from api.core.config import settings
+
+    async with AsyncMongoClient(settings.mongo_database_connection_uri) as client:
+        await client[settings.mongodb_db]["users"].update_one({"email": email}, {"$set": {"tier": tier}})
+
+
+async def drop_database():
+    from pymongo import AsyncMongoClient
+    from api.core.config import settings
+
+    async with AsyncMongoClient(settings.mongo_database_connection_uri) as client:
+        await client.drop_database(settings.mongodb_db)
+
+
+@asynccontextmanager
+async def asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Serves the application in-process through an ASGI transport, running its lifespan around the test.
+    Client and server share one event loop, so this measures the application code rather than the network stack.
+    """
+
+    from api.main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test") as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(workers: int, startup_timeout_seconds: float = 60.0) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Serves the application with uvicorn in a child process, as in production, and connects to it over HTTP.
+    """
+
+    port = find_free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-access-log"],
+        cwd=Path(__file__).resolve().parent.parent, env=os.environ.copy()
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30.0) as client:
+            deadline = time.monotonic() + startup_timeout_seconds
+            while True:
+                try:
+                    if (await client.get("/healthcheck")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become healthy")
+                await asyncio.sleep(0.2)
+
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def run_load_test(args: argparse.Namespace, weights: dict[str, float]) -> tuple[dict[str, dict], float]:
+    async with AsyncExitStack() as stack:
+        tier_assignment = None
+        if args.base_url:
+            client = await stack.enter_async_context(httpx.AsyncClient(base_url=args.base_url, timeout=30.0))
+            phrases = args.phrases
+        else:
+            tier_assignment = assign_tier
+            phrases = await seed_database(args.corpus_size, args.seed)
+            stack.push_async_callback(drop_database)
+            if args.server == "uvicorn":
+                client = await stack.enter_async_context(uvicorn_client(args.workers))
+            else:
+                client = await stack.enter_async_context(asgi_client())
+
+        load_test = LoadTest(client, weights, phrases, args.seed, args.tier, tier_assignment)
+        elapsed_seconds = await load_test.run(args.concurrency, args.duration)
+
+    return load_test.report(elapsed_seconds), elapsed_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the API with concurrent mixed traffic and check latency and error SLOs")
+    parser.add_argument("--concurrency", type=int, default=20, help="Number of concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load to generate")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Relative route weights, default {DEFAULT_MIX}")
+    parser.add_argument("--slo", action="append", help="Threshold such as p95=250 or login:p99=2000 (milliseconds) "
+                                                       f"or error_rate=0.01; default {' '.join(DEFAULT_SLOS)}")
+    parser.add_argument("--server", choices=("asgi", "uvicorn"), default="asgi",
+                        help="Serve the app in-process through ASGI or in a uvicorn child process")
+    parser.add_argument("--workers", type=int, default=1, help="Number of uvicorn worker processes")
+    parser.add_argument("--base-url", help="Load test an already running server instead; its data is left untouched")
+    parser.add_argument("--phrases", nargs="+", default=["time", "hand", "break", "cat", "water", "head"],
+                        help="Search phrases to use with --base-url")
+    parser.add_argument("--tier", choices=("free", "premium", "admin"),
+                        help="Service tier of the virtual users; each tier has its own rate limits and result caps. "
+                             "Premium by default; with --base-url, accounts are registered as free and only the free tier is supported")
+    parser.add_argument("--corpus-size", type=int, default=10_000, help="Number of synthetic idioms to seed")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for corpus generation and route selection")
+    parser.add_argument("--mongo-uri", help="Use this Mongo server instead of starting a throwaway mongod")
+    parser.add_argument("--database", default="idioms_load_test", help="Database to seed; it is dropped before and after the run")
+    parser.add_argument("--output", help="File to write the JSON report to")
+    args = parser.parse_args()
+    if args.tier is None:
+        args.tier = "free" if args.base_url else "premium"
+    elif args.base_url and args.tier != "free":
+        parser.error("--tier must be free with --base-url, as the tier of a registered account can only be changed on the server")
+
+    weights = parse_mix(args.mix)
+    thresholds = parse_slos(args.slo or list(DEFAULT_SLOS))
+
+    with ExitStack() as stack:
+        if not args.base_url:
+            mongo_uri = args.mongo_uri or stack.enter_context(throwaway_mongod())
+            snapshot_directory = stack.enter_context(tempfile.TemporaryDirectory(prefix="idioms-load-test-snapshot-"))
+            configure_environment(mongo_uri, args.database, Path(snapshot_directory) / "corpus.snapshot")
+        report, elapsed_seconds = asyncio.run(run_load_test(args, weights))
+
+    print_report(report, elapsed_seconds)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"elapsed_seconds": elapsed_seconds, "routes": report}, output_file, indent=2)
+
+    breaches = check_slos(report, thresholds)
+    for breach in breaches:
+        print(f"SLO breached: {breach}")
+    sys.exit(1 if breaches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+from pymongo import MongoClient
+
+def find_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def throwaway_mongod(startup_timeout_seconds: float = 30.0) -> Iterator[str]:
+    """
+    Starts a private `mongod` on a free local port with its data in a temporary directory,
+    and removes both once the block exits. Nothing outside the temporary directory is touched.
+
+    :param startup_timeout_seconds: How long to wait for the server to accept connections.
+
+    :return: A connection string for the server.
+
+    :raises RuntimeError: If no `mongod` executable is on the PATH or it does not start in time.
+    """
+
+    executable = shutil.which("mongod")
+    if not executable:
+        raise RuntimeError("mongod was not found on the PATH; install MongoDB or pass --mongo-uri")
+
+    port = find_free_port()
+    uri = f"mongodb://127.0.0.1:{port}/"
+    with tempfile.TemporaryDirectory(prefix="idioms-benchmark-") as data_directory:
+        process = subprocess.Popen(
+            [executable, "--dbpath", data_directory, "--port", str(port), "--bind_ip", "127.0.0.1",
+             "--logpath", str(Path(data_directory) / "mongod.log"), "--quiet"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            deadline = time.monotonic() + startup_timeout_seconds
+            with MongoClient(uri, serverSelectionTimeoutMS=500) as client:
+                while True:
+                    try:
+                        client.admin.command("ping")
+                        break
+                    except Exception:
+                        if process.poll() is not None or time.monotonic() > deadline:
+                            raise RuntimeError(f"mongod did not accept connections within {startup_timeout_seconds:.0f} s")
+
+            yield uri
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+from contextlib import ExitStack, redirect_stdout
+from datetime import datetime, timezone
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from benchmarks.compare import compare_results, print_comparisons
+from benchmarks.corpus import make_dataframes, make_rows
+from benchmarks.mongo import throwaway_mongod
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+API_PACKAGE_DIR = Path(__file__).resolve().parent.parent / "api"
+
+def configure_environment(mongo_uri: str, database: str, snapshot_path: Path):
+    """
+    Points the API settings at the benchmark database. This must run before any `api` module is
+    imported, because the settings are read from the environment when `api.core.config` is imported.
+
+    :param mongo_uri: Connection string of the benchmark Mongo server.
+    :param database: Name of the database to create and drop.
+    :param snapshot_path: Where to write the corpus snapshot, so the one served in production is left alone.
+    """
+
+    os.environ["MONGO_DATABASE_CONNECTION_URI"] = mongo_uri
+    os.environ["MONGO_APP_DB"] = database
+    os.environ["CORPUS_SNAPSHOT_PATH"] = str(snapshot_path)
+    os.environ.setdefault("MONGO_HOST_PORT", "27017")
+    os.environ.setdefault("MONGO_APP_USER", "benchmark")
+    os.environ.setdefault("MONGO_APP_PASSWORD", "benchmark")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+    # populate_db.py is a script run from inside the package directory and imports its siblings without the package prefix
+    if str(API_PACKAGE_DIR) not in sys.path:
+        sys.path.append(str(API_PACKAGE_DIR))
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """
+    Reduces individual call timings to summary statistics.
+
+    :param timings: Duration of every measured call in seconds.
+
+    :return: Iteration count and latency statistics in seconds.
+    """
+
+    ordered = sorted(timings)
+    mean = statistics.fmean(ordered)
+    return {
+        "iterations": len(ordered),
+        "mean_seconds": mean,
+        "median_seconds": statistics.median(ordered),
+        "p95_seconds": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_seconds": ordered[0],
+        "max_seconds": ordered[-1],
+        "operations_per_second": 1 / mean if mean else 0.0
+    }
+
+
+async def measure(function: Callable[[int], Awaitable], iterations: int, warmup: int = 0,
+                  before_each: Callable[[], None] | None = None) -> dict[str, float]:
+    """
+    Times repeated calls of a coroutine function.
+
+    :param function: Called with the iteration number, so it can cycle through a list of queries.
+    :param iterations: Number of measured calls.
+    :param warmup: Number of unmeasured calls made first.
+    :param before_each: Untimed setup run before every call, e.g. to clear a cache.
+
+    :return: Summary statistics of the measured calls.
+    """
+
+    for iteration in range(warmup):
+        await function(iteration)
+
+    timings = []
+    for iteration in range(iterations):
+        if before_each:
+            before_each()
+        started_at = time.perf_counter()
+        await function(iteration)
+        timings.append(time.perf_counter() - started_at)
+
+    return summarize(timings)
+
+
+async def run_corpus_benchmarks(size: int, iterations: int, seed: int, results: dict[str, dict]):
+    """
+    Ingests a synthetic corpus of the given size and benchmarks the ingest and the search endpoints against it.
+
+    :param size: Number of idioms in the corpus.
+    :param iterations: Number of measured calls per endpoint benchmark.
+    :param seed: Seed for corpus generation and query selection.
+    :param results: Result dictionary to add the benchmarks to.
+    """
+
+    import populate_db
+    from api.core import database
+    from api.core.config import settings
+    from api.endpoints.idiom_search import find_by_phrase, find_by_synonym
+    from api.schemas.idiom import IDIOM_FIELDS
+    from api.search import engine
+    from api.search.result_cache import result_cache
+    from api.search.synonym_index import SynonymMatch
+
+    await database.client.drop_database(settings.mongodb_db)
+    result_cache.clear()
+    rows = make_rows(size, seed)
+
+    async def ingest(_: int):
+        with redirect_stdout(io.StringIO()):
+            await populate_db.populate_database(settings.mongo_database_connection_uri,
+                                                iter(make_dataframes(rows, populate_db.CHUNK_SIZE)))
+
+    # The first ingest inserts every idiom; the second finds all of them unchanged
+    results[f"populate_database[insert,n={size}]"] = await measure(ingest, 1)
+    results[f"populate_database[unchanged,n={size}]"] = await measure(ingest, 1)
+    results[f"search_engine_load[n={size}]"] = await measure(lambda _: engine.init_search_engine(), 1)
+
+    search_engine = engine.get_search_engine()
+    rng = random.Random(seed)
+    sampled_rows = rng.sample(rows, min(len(rows), 200))
+    phrases = [" ".join(row["Idiom"].split()[:2]) for row in sampled_rows]
+    synonyms = [row["Synonyms"][0].split()[0] for row in sampled_rows if row["Synonyms"]]
+
+    # The search functions behind the endpoints are measured rather than the endpoint functions themselves,
+    # whose authentication and admission parameters are FastAPI dependencies that only resolve within a request.
+    def search(iteration: int):
+        return find_by_phrase(search_engine, phrases[iteration % len(phrases)], 10, False, IDIOM_FIELDS)
+
+    def search_synonym(iteration: int):
+        return find_by_synonym(search_engine, synonyms[iteration % len(synonyms)], SynonymMatch.contains, 10, IDIOM_FIELDS)
+
+    async def random_idioms(iteration: int):
+        return [search_engine.corpus.to_dict(position, IDIOM_FIELDS) for position in search_engine.sample(10)]
+
+    results[f"get_idiom[cold,n={size}]"] = await measure(search, iterations, warmup=10, before_each=result_cache.clear)
+    results[f"get_idiom[cached,n={size}]"] = await measure(search, iterations, warmup=len(phrases))
+    results[f"get_idioms_for_synonym[cold,n={size}]"] = await measure(search_synonym, iterations, warmup=10, before_each=result_cache.clear)
+    results[f"get_random_idiom[n={size}]"] = await measure(random_idioms, iterations, warmup=10)
+
+
+async def run_auth_benchmarks(iterations: int, results: dict[str, dict]):
+    """
+    Benchmarks access token verification and token issuing for a benchmark user.
+
+    :param iterations: Number of measured calls per benchmark.
+    :param results: Result dictionary to add the benchmarks to.
+    """
+
+    from fastapi.security import HTTPAuthorizationCredentials
+    from api.auth.endpoint_dependencies import get_current_user, token_claims_cache, user_cache
+    from api.auth.security import create_access_token, hash_password
+    from api.endpoints.authentication import issue_tokens
+    from api.models.user import User
+
+    user = await User(email="benchmark@example.com", password_hash=hash_password("benchmark")).insert()
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer",
+                                               credentials=create_access_token({"sub": str(user.id), "scope": user.tier.value}))
+
+    def clear_auth_caches():
+        token_claims_cache.clear()
+        user_cache.clear()
+
+    results["get_current_user[cold]"] = await measure(lambda _: get_current_user(credentials), iterations,
+                                                      warmup=10, before_each=clear_auth_caches)
+    results["get_current_user[cached]"] = await measure(lambda _: get_current_user(credentials), iterations, warmup=10)
+    results["issue_tokens"] = await measure(lambda _: issue_tokens(user), iterations, warmup=10)
+
+
+async def run_benchmarks(sizes: list[int], iterations: int, seed: int) -> dict[str, dict]:
+    from api.core import database
+    from api.core.config import settings
+
+    results = {}
+    await database.init_db()
+    try:
+        for size in sizes:
+            print(f"Benchmarking corpus of {size} idioms...", flush=True)
+            await run_corpus_benchmarks(size, iterations, seed, results)
+
+        print("Benchmarking authentication...", flush=True)
+        await run_auth_benchmarks(iterations, results)
+    finally:
+        await database.client.drop_database(settings.mongodb_db)
+        await database.close_db()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search, authentication and ingest hot paths against synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Corpus sizes to benchmark")
+    parser.add_argument("--iterations", type=int, default=200, help="Measured calls per endpoint benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for corpus generation and query selection")
+    parser.add_argument("--mongo-uri", help="Use this Mongo server instead of starting a throwaway mongod")
+    parser.add_argument("--database", default="idioms_benchmark", help="Database to use; it is dropped before and after the run")
+    parser.add_argument("--output", default="benchmark-results.json", help="File to write the JSON results to")
+    parser.add_argument("--baseline", help="Result file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        mongo_uri = args.mongo_uri or stack.enter_context(throwaway_mongod())
+        snapshot_directory = stack.enter_context(tempfile.TemporaryDirectory(prefix="idioms-benchmark-snapshot-"))
+        configure_environment(mongo_uri, args.database, Path(snapshot_directory) / "corpus.snapshot")
+        results = asyncio.run(run_benchmarks(args.sizes, args.iterations, args.seed))
+
+    document = {
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "iterations": args.iterations,
+            "seed": args.seed
+        },
+        "benchmarks": results
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(document, output_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            comparisons = compare_results(json.load(baseline_file), document, args.threshold)
+        print_comparisons(comparisons)
+        if any(comparison["regressed"] for comparison in comparisons):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+
+# Settings are read from the environment when api.core.config is imported, so defaults must be set first
+os.environ.setdefault("MONGO_HOST_PORT", "27017")
+os.environ.setdefault("MONGO_APP_USER", "test")
+os.environ.setdefault("MONGO_APP_PASSWORD", "test")
+os.environ.setdefault("MONGO_APP_DB", "idioms_test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("CORPUS_SNAPSHOT_PATH", "")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.auth.endpoint_dependencies import token_claims_cache, user_cache
+from api.auth.security import create_access_token
+from api.main import app
+from api.search import engine
+from api.search.corpus import IdiomCorpus
+from api.search.engine import SearchEngine
+from api.search.result_cache import result_cache
+
+IDIOMS = [
+    {"idiom": "piece of cake", "definition": "Something very easy.", "synonyms": ["easy", "simple"]},
+    {"idiom": "on thin ice", "definition": "In a risky situation.", "synonyms": ["risky"]},
+    {"idiom": "break the ice", "definition": "To start a conversation.", "synonyms": ["begin"]}
+]
+
+@pytest.fixture
+def client():
+    """
+    Test client with an in-memory search engine. The lifespan is not run, so no database connection is made;
+    tests replace the database calls they exercise.
+    """
+
+    engine.engine = SearchEngine(IdiomCorpus.from_documents(IDIOMS), 1)
+    yield TestClient(app)
+    engine.engine = None
+    for cache in (token_claims_cache, user_cache, result_cache):
+        cache.clear()
+
+
+def auth_headers(user_id: str = "0123456789abcdef01234567", tier: str = "free") -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user_id, 'scope': tier})}"}
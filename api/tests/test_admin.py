@@ -0,0 +1,46 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from beanie import PydanticObjectId
+
+from api import manage_users
+from api.models.user import ApiServiceTier, User
+from tests.conftest import auth_headers
+
+def make_user(tier: ApiServiceTier) -> User:
+    return User.model_construct(id=PydanticObjectId(), email="user@example.com", password_hash="", tier=tier, is_active=True)
+
+
+def test_stats_check_the_stored_tier_rather_than_the_token_scope(client, monkeypatch):
+    user = make_user(ApiServiceTier.free)
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=user))
+
+    response = client.get("/admin/stats", headers=auth_headers(str(user.id), tier="admin"))
+
+    assert response.status_code == 403
+
+
+def test_stats_are_served_to_admins(client, monkeypatch):
+    user = make_user(ApiServiceTier.admin)
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=user))
+
+    response = client.get("/admin/stats", headers=auth_headers(str(user.id), tier="admin"))
+
+    assert response.status_code == 200
+    assert "admission" in response.json()
+
+
+def test_set_tier_updates_the_stored_account(monkeypatch):
+    user = make_user(ApiServiceTier.free)
+    user_set = AsyncMock()
+    monkeypatch.setattr(User, "find_one", AsyncMock(return_value=user))
+    monkeypatch.setattr(User, "set", user_set)
+
+    assert asyncio.run(manage_users.set_tier("USER@example.com", ApiServiceTier.admin))
+    user_set.assert_awaited_once_with({"tier": ApiServiceTier.admin})
+
+
+def test_set_tier_fails_for_unknown_accounts(monkeypatch):
+    monkeypatch.setattr(User, "find_one", AsyncMock(return_value=None))
+
+    assert not asyncio.run(manage_users.set_tier("nobody@example.com", ApiServiceTier.admin))
@@ -0,0 +1,32 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from api.auth.admission import admission_controller
+from api.models.user import User
+from tests.conftest import auth_headers
+
+ADMITTED_REQUESTS = [
+    ("get", "/idioms/search/ice", None),
+    ("get", "/idioms/ranked-search/ice", None),
+    ("get", "/idioms/by-letter/p", None),
+    ("get", "/idioms/by-synonym/easy", None),
+    ("get", "/idioms/random", None),
+    ("get", "/idioms/suggest?q=thin", None),
+    ("post", "/idioms/search:batch", {"phrases": ["ice"]}),
+    ("post", "/analysis/idioms", {"text": "It was a piece of cake."}),
+    ("get", "/idioms/export", None)
+]
+
+@pytest.mark.parametrize("method, path, body", ADMITTED_REQUESTS)
+def test_rejected_requests_skip_the_user_lookup(client, monkeypatch, method, path, body):
+    user_get = AsyncMock()
+    monkeypatch.setattr(User, "get", user_get)
+    # A saturated worker sheds every tier
+    monkeypatch.setattr(admission_controller, "in_flight", admission_controller.max_concurrent_requests)
+
+    response = client.request(method, path, json=body, headers=auth_headers())
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    user_get.assert_not_awaited()
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from beanie import PydanticObjectId
+
+from api.auth.endpoint_dependencies import decode_access_token, user_cache
+from api.auth.security import password_hashing_pool
+from api.endpoints import authentication
+from api.models.refresh_token import RefreshToken
+from api.models.user import ApiServiceTier, User
+
+def test_refresh_rejects_a_disabled_user_still_in_the_user_cache(client, monkeypatch):
+    user_id = PydanticObjectId()
+    active_user = User.model_construct(id=user_id, email="user@example.com", password_hash="", is_active=True)
+    disabled_user = User.model_construct(id=user_id, email="user@example.com", password_hash="", is_active=False)
+    user_cache.set(str(user_id), active_user)
+
+    collection = MagicMock()
+    collection.find_one_and_delete = AsyncMock(return_value={"user_id": user_id,
+                                                             "expires_at": datetime.now(timezone.utc) + timedelta(days=1)})
+    monkeypatch.setattr(RefreshToken, "get_pymongo_collection", MagicMock(return_value=collection))
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=disabled_user))
+
+    client.cookies.set("refresh_token", "token")
+    response = client.post("/auth/refresh")
+
+    assert response.status_code == 401
+    assert user_cache.get(str(user_id)) is None
+
+
+def test_register_creates_a_free_account_whatever_tier_is_requested(client, monkeypatch):
+    async def insert(user):
+        user.id = PydanticObjectId()
+        return user
+
+    monkeypatch.setattr(User, "get_pymongo_collection", MagicMock())
+    monkeypatch.setattr(User, "find_one", AsyncMock(return_value=None))
+    monkeypatch.setattr(User, "insert", insert)
+    monkeypatch.setattr(password_hashing_pool, "run", AsyncMock(return_value="hash"))
+    monkeypatch.setattr(authentication, "create_refresh_token", AsyncMock(return_value="refresh"))
+
+    response = client.post("/auth/register", json={"email": "user@example.com", "password": "secret", "service_tier": "admin"})
+
+    assert response.status_code == 200
+    assert decode_access_token(response.json()["access_token"])["scope"] == ApiServiceTier.free
@@ -0,0 +1,71 @@
+import pytest
+
+from api.search.fuzzy_index import FuzzyIndex, edit_distance, max_distance_for
+
+TEXTS = ["piece of cake", "peace and quiet", "break the ice", "spill the beans", "on thin ice"]
+
+@pytest.fixture(scope="module")
+def index() -> FuzzyIndex:
+    return FuzzyIndex.build(TEXTS)
+
+
+def matched_words(index: FuzzyIndex, word: str) -> dict[str, int]:
+    return {index.words[word_id]: distance for word_id, distance in index.lookup_word(word).items()}
+
+
+@pytest.mark.parametrize("source, target, max_distance, distance", [
+    ("spill", "spill", 2, 0),
+    ("spil", "spill", 2, 1),
+    ("beens", "beans", 2, 1),
+    ("teh", "the", 1, 1),
+    ("quite", "quiet", 2, 1),
+    ("bxxns", "beans", 2, 2),
+    ("bxxxs", "beans", 2, 3),
+    ("abcdef", "badcfe", 2, 3)
+])
+def test_edit_distance(source, target, max_distance, distance):
+    assert edit_distance(source, target, max_distance) == distance
+
+
+@pytest.mark.parametrize("word, max_distance", [("of", 0), ("ice", 1), ("thin", 1), ("peace", 2), ("spilled", 2)])
+def test_max_distance_grows_with_word_length(word, max_distance):
+    assert max_distance_for(word) == max_distance
+
+
+def test_lookup_finds_words_one_edit_away(index):
+    assert matched_words(index, "spil") == {"spill": 1}
+    assert matched_words(index, "beens") == {"beans": 1}
+
+
+def test_lookup_finds_words_two_edits_away(index):
+    assert matched_words(index, "bxxns") == {"beans": 2}
+    assert matched_words(index, "brkae") == {"break": 2}
+
+
+def test_lookup_counts_a_transposition_as_one_edit(index):
+    assert matched_words(index, "quite") == {"quiet": 1}
+    assert matched_words(index, "tihn") == {"thin": 1}
+
+
+def test_lookup_stops_at_the_maximum_distance(index):
+    assert matched_words(index, "bxxxs") == {}
+    # Words of up to two characters must match exactly
+    assert matched_words(index, "og") == {}
+
+
+def test_search_orders_by_total_corrections(index):
+    # "peace" matches itself exactly and "piece" with two substitutions
+    assert index.search("peace", 10) == [1, 0]
+
+
+def test_search_orders_equal_distances_by_corpus_position(index):
+    assert index.search("pece", 10) == [0, 1]
+
+
+def test_search_requires_a_match_for_every_word(index):
+    assert index.search("brek teh ice", 10) == [2]
+    assert index.search("spill the bxxxs", 10) == []
+
+
+def test_search_stops_at_limit(index):
+    assert index.search("pece", 1) == [0]
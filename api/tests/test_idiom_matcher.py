@@ -0,0 +1,46 @@
+from api.search.idiom_matcher import IdiomMatcher
+
+IDIOMS = ["break the ice", "ice age", "on thin ice", "piece of", "piece of cake", "skating on thin ice", "the ice age"]
+
+def find(text: str) -> list[tuple[str, str]]:
+    return [(IDIOMS[idiom_id], text[start:end]) for idiom_id, start, end in IdiomMatcher.build(IDIOMS).find(text)]
+
+
+def test_finds_overlapping_idioms():
+    assert find("Break the ice age") == [
+        ("break the ice", "Break the ice"),
+        ("the ice age", "the ice age"),
+        ("ice age", "ice age")
+    ]
+
+
+def test_finds_an_idiom_that_is_a_prefix_of_another():
+    assert find("a piece of cake") == [("piece of cake", "piece of cake"), ("piece of", "piece of")]
+    assert find("a piece of pie") == [("piece of", "piece of")]
+
+
+def test_finds_an_idiom_that_is_a_suffix_of_another():
+    assert find("skating on thin ice") == [("skating on thin ice", "skating on thin ice"), ("on thin ice", "on thin ice")]
+
+
+def test_finds_matches_at_text_boundaries():
+    assert find("ice age") == [("ice age", "ice age")]
+    assert find("on thin ice") == [("on thin ice", "on thin ice")]
+
+
+def test_matches_across_punctuation_and_case():
+    assert find("It was a PIECE, of cake!") == [("piece of cake", "PIECE, of cake"), ("piece of", "PIECE, of")]
+    assert find("Café? Break the ice.") == [("break the ice", "Break the ice")]
+
+
+def test_matches_only_whole_words():
+    assert find("iceage") == []
+    assert find("thin ices") == []
+
+
+def test_maps_matches_back_to_the_original_text():
+    assert find("Ｐiece of cake") == [("piece of cake", "Ｐiece of cake"), ("piece of", "Ｐiece of")]
+
+
+def test_finds_nothing_in_empty_text():
+    assert find("") == []
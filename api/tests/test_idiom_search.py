@@ -0,0 +1,67 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from api.models.idiom import Idiom as IdiomModel
+from api.models.user import User
+from api.schemas.idiom import DEFAULT_EXAMPLE
+from tests.conftest import auth_headers
+
+def test_suggestions_require_an_existing_user(client, monkeypatch):
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=None))
+
+    response = client.get("/idioms/suggest?q=thin", headers=auth_headers())
+
+    assert response.status_code == 401
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, limit: int):
+        self.documents = self.documents[:limit]
+        return self
+
+    async def __aiter__(self):
+        for document in self.documents:
+            yield document
+
+
+def test_by_letter_projects_a_single_field_for_derived_fields_only(client, monkeypatch):
+    collection = MagicMock()
+    collection.find.return_value = FakeCursor([{"idiom": "piece of cake"}])
+    monkeypatch.setattr(IdiomModel, "get_pymongo_collection", MagicMock(return_value=collection))
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=User.model_construct(is_active=True)))
+
+    response = client.get("/idioms/by-letter/p?fields=example", headers=auth_headers())
+
+    assert response.status_code == 200
+    assert response.json() == [{"example": DEFAULT_EXAMPLE}]
+    _, projection = collection.find.call_args.args
+    assert projection == {"_id": 0, "idiom": 1}
+
+
+def test_suggestions_accept_the_highest_code_point(client, monkeypatch):
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=User.model_construct(is_active=True)))
+
+    response = client.get("/idioms/suggest", params={"q": "ice\U0010FFFF"}, headers=auth_headers())
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+
+def test_etag_depends_on_the_tier_capped_limit(client, monkeypatch):
+    monkeypatch.setattr(User, "get", AsyncMock(return_value=User.model_construct(is_active=True)))
+
+    free = client.get("/idioms/ranked-search/easy?limit=50", headers=auth_headers(tier="free"))
+    etag = free.headers["ETag"]
+    revalidated = client.get("/idioms/ranked-search/easy?limit=50", headers={**auth_headers(tier="free"), "If-None-Match": etag})
+    upgraded = client.get("/idioms/ranked-search/easy?limit=50", headers={**auth_headers(tier="premium"), "If-None-Match": etag})
+
+    assert free.status_code == 200
+    assert revalidated.status_code == 304
+    assert upgraded.status_code == 200
+    assert upgraded.headers["ETag"] != etag
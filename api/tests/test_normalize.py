@@ -0,0 +1,22 @@
+import pytest
+
+from api.search.normalize import prefix_upper_bound
+
+@pytest.mark.parametrize("prefix, upper_bound", [
+    ("ab", "ac"),
+    ("a\U0010FFFF", "b"),
+    ("a\U0010FFFF\U0010FFFF", "b"),
+    ("\U0010FFFF", None),
+    ("", None),
+    ("퟿", "")
+])
+def test_prefix_upper_bound(prefix, upper_bound):
+    assert prefix_upper_bound(prefix) == upper_bound
+
+
+@pytest.mark.parametrize("prefix", ["ab", "a\U0010FFFF", "퟿"])
+def test_prefix_upper_bound_sorts_after_every_completion(prefix):
+    upper_bound = prefix_upper_bound(prefix)
+
+    for completion in ("", "a", "\U0010FFFF", "\U0010FFFF" * 3):
+        assert prefix + completion < upper_bound
@@ -0,0 +1,84 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+import pandas as pd
+import pytest
+
+# populate_db.py is a script run from inside the package directory and imports its siblings without the package prefix
+API_PACKAGE_DIR = Path(__file__).resolve().parent.parent / "api"
+if str(API_PACKAGE_DIR) not in sys.path:
+    sys.path.append(str(API_PACKAGE_DIR))
+
+import populate_db
+
+class FakeClient:
+    def __init__(self, *args):
+        pass
+
+    async def __aenter__(self):
+        return MagicMock()
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeCursor:
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    """
+    Runs an ingest of one new idiom against a fake database and records the order of the snapshot write and the version bump.
+    """
+
+    events = []
+    monkeypatch.setattr(populate_db, "AsyncMongoClient", FakeClient)
+    monkeypatch.setattr(populate_db, "init_beanie", AsyncMock())
+    monkeypatch.setattr(populate_db.settings, "corpus_snapshot_path", "corpus.snapshot")
+
+    idioms = MagicMock()
+    idioms.find.return_value = FakeCursor()
+    idioms.bulk_write = AsyncMock(return_value=SimpleNamespace(upserted_count=1, modified_count=0))
+    monkeypatch.setattr(populate_db.Idiom, "get_pymongo_collection", MagicMock(return_value=idioms))
+
+    versions = MagicMock()
+    versions.update_one = AsyncMock(side_effect=lambda *args, **kwargs: events.append(("bump", args[1])))
+    monkeypatch.setattr(populate_db.CorpusVersion, "get_pymongo_collection", MagicMock(return_value=versions))
+
+    async def write_corpus_snapshot(path: str, corpus_id: str, version: int):
+        events.append(("snapshot", corpus_id, version))
+    monkeypatch.setattr(populate_db, "write_corpus_snapshot", write_corpus_snapshot)
+
+    def run(current_version) -> list[tuple]:
+        monkeypatch.setattr(populate_db.CorpusVersion, "find_one", AsyncMock(return_value=current_version))
+        dataframe = populate_db.format_dataframe(pd.DataFrame([{"Idiom": "Piece of cake", "Definition": "Easy.", "Synonyms": "easy"}]))
+        asyncio.run(populate_db.populate_database("mongodb://test", iter([dataframe])))
+        return events
+
+    return run
+
+
+def test_snapshot_is_written_before_the_version_is_bumped(ingest):
+    corpus_version_id = ObjectId()
+
+    snapshot, bump = ingest(SimpleNamespace(id=corpus_version_id, version=3))
+
+    assert snapshot == ("snapshot", f"{populate_db.settings.mongodb_db}/{corpus_version_id}", 4)
+    assert bump[0] == "bump"
+    assert bump[1]["$max"] == {"version": 4}
+
+
+def test_first_ingest_tags_the_snapshot_with_the_id_of_the_new_version_record(ingest):
+    snapshot, bump = ingest(None)
+
+    assert snapshot[2] == 1
+    assert snapshot[1] == f"{populate_db.settings.mongodb_db}/{bump[1]['$setOnInsert']['_id']}"
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+
+from api.search.normalize import tokenize
+from api.search.ranking import (BM25_B, BM25_K1, DEFINITION_FIELD_WEIGHT, IDIOM_FIELD_WEIGHT, SYNONYMS_FIELD_WEIGHT,
+                                BM25Ranker)
+
+IDIOMS = ["break the ice", "on thin ice", "piece of cake", "ice ice baby"]
+
+def build(idioms: list[str]) -> BM25Ranker:
+    return BM25Ranker.build(idioms, [""] * len(idioms), [[]] * len(idioms))
+
+
+def scores(ranker: BM25Ranker, text: str) -> list[float]:
+    term_ids = [ranker.vocabulary[token] for token in tokenize(text)]
+    return np.asarray(ranker.weights[:, term_ids].sum(axis=1)).ravel().tolist()
+
+
+def test_scores_match_hand_computed_bm25():
+    # "ice" occurs in 3 of 4 idioms, every idiom is 3 words long, and each idiom word counts 3 times
+    idf = math.log(1 + (4 - 3 + 0.5) / (3 + 0.5))
+    length_norm = BM25_K1 * (1 - BM25_B + BM25_B * 9 / 9)
+    once = idf * 3 * (BM25_K1 + 1) / (3 + length_norm)
+    twice = idf * 6 * (BM25_K1 + 1) / (6 + length_norm)
+
+    assert scores(build(IDIOMS), "ice") == pytest.approx([once, once, 0.0, twice])
+    assert once == pytest.approx(0.56049, abs=1e-5)
+    assert twice == pytest.approx(0.65390, abs=1e-5)
+
+
+def test_scores_weight_fields_and_normalize_lengths():
+    idioms = ["cold feet", "break the ice", "skating on thin ice"]
+    definitions = ["Nervous, as if standing on ice.", "To start a conversation.", "In a risky situation."]
+    synonyms = [["nervous"], ["icebreaker", "ice"], []]
+    ranker = BM25Ranker.build(idioms, definitions, synonyms)
+
+    counts = []
+    for idiom, definition, idiom_synonyms in zip(idioms, definitions, synonyms):
+        weighted: dict[str, float] = {}
+        for text, weight in ((idiom, IDIOM_FIELD_WEIGHT), (definition.lower(), DEFINITION_FIELD_WEIGHT),
+                             (" ".join(idiom_synonyms), SYNONYMS_FIELD_WEIGHT)):
+            for token in tokenize(text):
+                weighted[token] = weighted.get(token, 0.0) + weight
+        counts.append(weighted)
+    average_length = sum(sum(weighted.values()) for weighted in counts) / len(counts)
+    document_frequency = sum("ice" in weighted for weighted in counts)
+    idf = math.log(1 + (len(counts) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    expected = []
+    for weighted in counts:
+        frequency = weighted.get("ice", 0.0)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * sum(weighted.values()) / average_length)
+        expected.append(idf * frequency * (BM25_K1 + 1) / (frequency + length_norm))
+
+    assert scores(ranker, "ice") == pytest.approx(expected)
+    # Occurrences in the idiom and its synonyms add up; one in the definition alone counts least
+    assert ranker.search("ice", 10) == [1, 2, 0]
+
+
+@pytest.mark.parametrize("limit", [3, 4, 10])
+def test_search_returns_every_match_when_the_limit_allows(limit):
+    assert build(IDIOMS).search("ice", limit) == [3, 0, 1]
+
+
+def test_search_with_zero_limit_returns_nothing():
+    assert build(IDIOMS).search("ice", 0) == []
+
+
+@pytest.mark.parametrize("limit, expected", [(1, [3]), (2, [3, 4]), (3, [3, 4, 5]), (4, [3, 4, 5, 0]), (5, [3, 4, 5, 0, 1])])
+def test_search_cut_off_keeps_ties_in_corpus_order(limit, expected):
+    # Shorter idioms score higher; "ice age" and "cold ice" tie, as do "break the ice" and "on thin ice"
+    ranker = build(IDIOMS + ["ice age", "cold ice"])
+
+    assert ranker.search("ice", limit) == expected
+
+
+def test_search_ignores_unknown_terms():
+    assert build(IDIOMS).search("volcano", 10) == []
@@ -0,0 +1,51 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from api.models.corpus_version import CorpusVersion
+from api.search import engine, reloader
+from api.search.reloader import CorpusReloader
+
+class StopPolling(Exception):
+    pass
+
+
+@pytest.fixture
+def poll(monkeypatch):
+    """
+    Runs the polling loop of a reloader until it has slept the given number of times, and returns its actions.
+    """
+
+    monkeypatch.setattr(engine, "engine", SimpleNamespace(version=1))
+
+    def run(database_version: int, sleeps: int) -> list[tuple[str, float]]:
+        actions = []
+        monkeypatch.setattr(CorpusVersion, "find_one", AsyncMock(return_value=SimpleNamespace(version=database_version)))
+
+        async def sleep(seconds: float):
+            if len(actions) == sleeps:
+                raise StopPolling
+            actions.append(("sleep", seconds))
+        monkeypatch.setattr(reloader, "asyncio", SimpleNamespace(sleep=sleep))
+
+        corpus_reloader = CorpusReloader(poll_seconds=5, debounce_seconds=1)
+        async def reload_if_stale() -> bool:
+            actions.append(("reload", 0))
+            return True
+        corpus_reloader.reload_if_stale = reload_if_stale
+
+        with pytest.raises(StopPolling):
+            asyncio.run(corpus_reloader._poll())
+        return actions
+
+    return run
+
+
+def test_poll_debounces_a_version_change_before_reloading(poll):
+    assert poll(database_version=2, sleeps=2) == [("sleep", 5), ("sleep", 1), ("reload", 0)]
+
+
+def test_poll_keeps_polling_while_the_engine_is_current(poll):
+    assert poll(database_version=1, sleeps=3) == [("sleep", 5), ("sleep", 5), ("sleep", 5)]
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+import pytest
+
+from api.core.config import settings
+from api.models.corpus_version import CorpusVersion
+from api.models.idiom import Idiom
+from api.search.corpus import IdiomCorpus
+from api.search.engine import SearchEngine
+from api.search.fuzzy_index import FuzzyIndex
+from api.search.idiom_matcher import IdiomMatcher
+from api.search.ranking import BM25Ranker
+from api.search.snapshot import CorpusSnapshot, corpus_identity, write_snapshot
+from api.search.suggestions import SuggestionIndex
+from api.search.synonym_index import SynonymIndex, SynonymMatch
+from api.search.trigram_index import TrigramIndex
+from tests.conftest import IDIOMS
+
+DATABASE_IDIOMS = [{"idiom": "spill the beans", "definition": "To reveal a secret.", "synonyms": ["reveal"]}]
+
+@pytest.fixture
+def corpus_version(monkeypatch):
+    record = SimpleNamespace(id=ObjectId(), version=3)
+    monkeypatch.setattr(CorpusVersion, "find_one", AsyncMock(return_value=record))
+    collection = MagicMock()
+    collection.find.return_value.to_list = AsyncMock(return_value=DATABASE_IDIOMS)
+    monkeypatch.setattr(Idiom, "get_pymongo_collection", lambda: collection)
+
+    return record
+
+
+def snapshot_for(path, corpus_id: str, version: int):
+    corpus = IdiomCorpus.from_documents(IDIOMS)
+    suggestion_index = SuggestionIndex.build(corpus.normalized_idioms)
+    write_snapshot(path, corpus_id=corpus_id, version=version, idioms=corpus.idioms, definitions=corpus.definitions,
+                   synonyms=corpus.synonyms, normalized_idioms=corpus.normalized_idioms,
+                   trigram_postings=TrigramIndex.build(corpus.normalized_idioms).postings,
+                   ranking=BM25Ranker.build(corpus.idioms, corpus.definitions, corpus.synonyms).arrays(),
+                   suggestion_suffixes=suggestion_index.suffixes, suggestion_ids=suggestion_index.suffix_ids,
+                   synonym_index=SynonymIndex.build(corpus.synonyms).arrays(),
+                   fuzzy_index=FuzzyIndex.build(corpus.normalized_idioms).arrays(),
+                   idiom_matcher=IdiomMatcher.build(corpus.normalized_idioms).arrays())
+
+
+def test_load_uses_snapshot_of_the_same_corpus(tmp_path, monkeypatch, corpus_version):
+    path = tmp_path / "corpus.snapshot"
+    snapshot_for(path, corpus_identity(settings.mongodb_db, corpus_version.id), corpus_version.version)
+    monkeypatch.setattr(settings, "corpus_snapshot_path", str(path))
+
+    search_engine = asyncio.run(SearchEngine.load())
+
+    assert list(search_engine.corpus.idioms) == sorted(idiom["idiom"] for idiom in IDIOMS)
+
+
+@pytest.mark.parametrize("database, version", [("idioms_benchmark", 3), (settings.mongodb_db, 2)])
+def test_load_ignores_snapshot_of_another_corpus(tmp_path, monkeypatch, corpus_version, database, version):
+    path = tmp_path / "corpus.snapshot"
+    snapshot_for(path, corpus_identity(database, corpus_version.id), version)
+    monkeypatch.setattr(settings, "corpus_snapshot_path", str(path))
+
+    search_engine = asyncio.run(SearchEngine.load())
+
+    assert list(search_engine.corpus.idioms) == ["spill the beans"]
+
+
+def test_snapshot_engine_answers_like_a_built_one(tmp_path):
+    path = tmp_path / "corpus.snapshot"
+    snapshot_for(path, corpus_identity(settings.mongodb_db, ObjectId()), 1)
+
+    built = SearchEngine(IdiomCorpus.from_documents(IDIOMS), 1)
+    loaded = SearchEngine.from_snapshot(CorpusSnapshot(path))
+
+    for query in ("ice", "of cake", "thin", "peice of cak", "brek teh"):
+        assert loaded.search(query, 10, fuzzy=True) == built.search(query, 10, fuzzy=True)
+        assert loaded.suggestion_index.suggest(query, 10) == built.suggestion_index.suggest(query, 10)
+    for synonym in ("easy", "ris", "begin"):
+        for match in SynonymMatch:
+            assert loaded.search_synonyms(synonym, match, 10) == built.search_synonyms(synonym, match, 10)
+    for text in ("It was a piece of cake to break the ice.", "Skating on thin ice!"):
+        assert loaded.find_idioms(text) == built.find_idioms(text)
+    for text in ("risky situation", "easy", "conversation start"):
+        assert loaded.search_ranked(text, 10) == built.search_ranked(text, 10)
+    assert [loaded.corpus.to_dict(position) for position in range(len(IDIOMS))] == \
+           [built.corpus.to_dict(position) for position in range(len(IDIOMS))]
+
+
+def test_seeded_sample_is_a_prefix_of_larger_counts():
+    idioms = [{"idiom": f"idiom {number}", "definition": "", "synonyms": []} for number in range(500)]
+    search_engine = SearchEngine(IdiomCorpus.from_documents(idioms), 1)
+
+    largest = search_engine.sample(100, "2026-10-18")
+
+    assert len(set(largest)) == 100
+    for count in (1, 5, 25):
+        assert search_engine.sample(count, "2026-10-18") == largest[:count]
+    assert search_engine.sample(25, "2026-10-19") != largest[:25]
+
+
+def test_seeded_sample_is_capped_at_the_corpus_size():
+    search_engine = SearchEngine(IdiomCorpus.from_documents(IDIOMS), 1)
+
+    assert sorted(search_engine.sample(10, "seed")) == list(range(len(IDIOMS)))
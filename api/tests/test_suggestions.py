@@ -0,0 +1,63 @@
+import pytest
+
+from api.search.suggestions import SuggestionIndex
+
+IDIOMS = sorted(["break the ice", "cafe au lait", "on thin ice", "piece of cake", "skating on thin ice", "the ice age",
+                 "thin skinned", "tit for tat", "zut\U0010FFFF", "zut\U0010FFFF alors"])
+
+@pytest.fixture(scope="module")
+def index() -> SuggestionIndex:
+    return SuggestionIndex.build(IDIOMS)
+
+
+def suggest(index: SuggestionIndex, prefix: str, limit: int = 10) -> list[str]:
+    return [IDIOMS[idiom_id] for idiom_id in index.suggest(prefix, limit)]
+
+
+def test_build_keeps_only_suffixes_at_word_boundaries(index):
+    assert [IDIOMS[idiom_id] for suffix, idiom_id in zip(index.suffixes, index.suffix_ids) if suffix == "thin ice"] == \
+           ["on thin ice", "skating on thin ice"]
+    assert "hin ice" not in index.suffixes
+    assert index.suffixes == sorted(index.suffixes)
+
+
+def test_suggests_idioms_starting_with_the_prefix_before_mid_phrase_hits(index):
+    assert suggest(index, "thin") == ["thin skinned", "on thin ice", "skating on thin ice"]
+    assert suggest(index, "on thin") == ["on thin ice", "skating on thin ice"]
+
+
+def test_orders_mid_phrase_hits_by_suffix_then_corpus_position(index):
+    assert suggest(index, "ice") == ["break the ice", "on thin ice", "skating on thin ice", "the ice age"]
+    assert suggest(index, "cake") == ["piece of cake"]
+
+
+def test_suggests_each_idiom_once(index):
+    # "tit for tat" starts with the prefix and also contains a word starting with it
+    assert suggest(index, "t") == ["the ice age", "thin skinned", "tit for tat", "break the ice", "on thin ice",
+                                   "skating on thin ice"]
+
+
+@pytest.mark.parametrize("limit, expected", [
+    (0, []),
+    (1, ["the ice age"]),
+    (2, ["the ice age", "thin skinned"]),
+    (3, ["the ice age", "thin skinned", "tit for tat"]),
+    (4, ["the ice age", "thin skinned", "tit for tat", "break the ice"])
+])
+def test_stops_at_limit(index, limit, expected):
+    assert suggest(index, "t", limit) == expected
+
+
+@pytest.mark.parametrize("prefix", ["", "   "])
+def test_empty_prefix_suggests_nothing(index, prefix):
+    assert suggest(index, prefix) == []
+
+
+@pytest.mark.parametrize("prefix", ["Café", "CAFÉ AU", "ｃａｆｅ"])
+def test_normalizes_non_ascii_prefixes(index, prefix):
+    assert suggest(index, prefix) == ["cafe au lait"]
+
+
+def test_prefix_ending_in_the_highest_code_point(index):
+    assert suggest(index, "zut\U0010FFFF") == ["zut\U0010FFFF", "zut\U0010FFFF alors"]
+    assert suggest(index, "\U0010FFFF") == []
@@ -0,0 +1,57 @@
+import pytest
+
+from api.search.synonym_index import SynonymIndex, SynonymMatch
+
+SYNONYMS = [
+    ["start a conversation", "icebreaker"],
+    ["at risk", "in danger", "risky"],
+    ["very easy", "a breeze", "easy as pie"],
+    ["Café crème", "easy"],
+    ["ice-cold", "risk taker"],
+    ["ice\U0010FFFF", "ice\U0010FFFF\U0010FFFF cold"]
+]
+
+@pytest.fixture(scope="module")
+def index() -> SynonymIndex:
+    return SynonymIndex.build(SYNONYMS)
+
+
+@pytest.mark.parametrize("synonym, match, idiom_ids", [
+    ("easy", SynonymMatch.exact, [3]),
+    ("  Very   EASY ", SynonymMatch.exact, [2]),
+    ("cafe creme", SynonymMatch.exact, [3]),
+    ("very", SynonymMatch.exact, []),
+    ("easy", SynonymMatch.prefix, [2, 3]),
+    ("ri", SynonymMatch.prefix, [1, 4]),
+    ("CAF", SynonymMatch.prefix, [3]),
+    ("easy", SynonymMatch.contains, [2, 3]),
+    ("as p", SynonymMatch.contains, [2]),
+    ("pie", SynonymMatch.contains, [2]),
+    ("a conv", SynonymMatch.contains, [0]),
+    ("conversation start", SynonymMatch.contains, []),
+    ("crème", SynonymMatch.contains, [3])
+])
+def test_search(index, synonym, match, idiom_ids):
+    assert index.search(synonym, match, 10) == idiom_ids
+
+
+def test_contains_matches_the_last_word_as_a_prefix(index):
+    # "icebreaker" starts with the partial word, "ice-cold" contains it as a whole word
+    assert index.search("ice", SynonymMatch.contains, 10) == [0, 4, 5]
+    assert index.search("danger in", SynonymMatch.contains, 10) == []
+
+
+@pytest.mark.parametrize("match", list(SynonymMatch))
+def test_search_with_empty_text_returns_nothing(index, match):
+    assert index.search(" ", match, 10) == []
+
+
+def test_search_stops_at_limit_in_ascending_order(index):
+    assert index.search("e", SynonymMatch.prefix, 10) == [2, 3]
+    assert index.search("i", SynonymMatch.prefix, 10) == [0, 1, 4, 5]
+    assert index.search("i", SynonymMatch.prefix, 3) == [0, 1, 4]
+
+
+def test_prefix_ending_in_the_highest_code_point(index):
+    assert index.search("ice\U0010FFFF", SynonymMatch.prefix, 10) == [5]
+    assert index.search("\U0010FFFF", SynonymMatch.prefix, 10) == []
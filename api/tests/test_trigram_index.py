@@ -0,0 +1,15 @@
+import pytest
+
+from api.search.trigram_index import TrigramIndex
+
+TEXTS = ["break the ice", "on thin ice", "piece of cake", "spill the beans", "zip it"]
+
+@pytest.mark.parametrize("query", ["i", "ce", "zi", "the", "thin ice", "qz", "x", " t"])
+def test_search_matches_a_scan(query):
+    index = TrigramIndex.build(TEXTS)
+
+    assert index.search(query, 10) == [document_id for document_id, text in enumerate(TEXTS) if query in text]
+
+
+def test_short_query_stops_at_limit():
+    assert TrigramIndex.build(TEXTS).search("e", 2) == [0, 1]
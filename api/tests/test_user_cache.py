@@ -0,0 +1,66 @@
+import asyncio
+
+from beanie import PydanticObjectId
+
+from api.auth.endpoint_dependencies import get_cached_user, invalidate_cached_user, user_cache
+from api.models.user import User
+
+def make_user(user_id: PydanticObjectId, is_active: bool) -> User:
+    return User.model_construct(id=user_id, email="user@example.com", password_hash="", is_active=is_active)
+
+
+def test_lookup_in_flight_during_invalidation_does_not_cache_its_stale_record(monkeypatch):
+    user_id = PydanticObjectId()
+    records = [make_user(user_id, is_active=True), make_user(user_id, is_active=False)]
+    first_read_started = asyncio.Event()
+    release_first_read = asyncio.Event()
+
+    async def get(_):
+        record = records.pop(0)
+        if record.is_active:
+            first_read_started.set()
+            await release_first_read.wait()
+        return record
+
+    monkeypatch.setattr(User, "get", get)
+
+    async def scenario():
+        stale_lookup = asyncio.create_task(get_cached_user(str(user_id)))
+        await first_read_started.wait()
+
+        # The account is disabled while the first read is still in flight
+        invalidate_cached_user(str(user_id))
+        release_first_read.set()
+        await stale_lookup
+
+        assert user_cache.get(str(user_id)) is None
+        return await get_cached_user(str(user_id))
+
+    try:
+        assert asyncio.run(scenario()).is_active is False
+        assert user_cache.get(str(user_id)).is_active is False
+    finally:
+        user_cache.clear()
+
+
+def test_concurrent_lookups_share_one_read(monkeypatch):
+    user_id = PydanticObjectId()
+    reads = 0
+
+    async def get(_):
+        nonlocal reads
+        reads += 1
+        await asyncio.sleep(0.01)
+        return make_user(user_id, is_active=True)
+
+    monkeypatch.setattr(User, "get", get)
+
+    async def scenario():
+        return await asyncio.gather(*(get_cached_user(str(user_id)) for _ in range(20)))
+
+    try:
+        users = asyncio.run(scenario())
+        assert reads == 1
+        assert all(user is users[0] for user in users)
+    finally:
+        user_cache.clear()
@@ -0,0 +1,23 @@
+import { NextRequest, NextResponse } from "next/server";
+import { ApiError, suggestIdioms } from "@/lib/api";
+
+// Relays typeahead requests from the browser, which cannot read the httpOnly access token cookie
+export async function GET(request: NextRequest) {
+  const accessToken = request.cookies.get("access_token")?.value;
+  const prefix = request.nextUrl.searchParams.get("q")?.trim() ?? "";
+
+  if (!accessToken) {
+    return NextResponse.json({ error: "Not authenticated" }, { status: 401 });
+  }
+
+  if (!prefix) {
+    return NextResponse.json([]);
+  }
+
+  try {
+    return NextResponse.json(await suggestIdioms(prefix, accessToken));
+  } catch (error) {
+    const status = error instanceof ApiError ? error.status : 502;
+    return NextResponse.json({ error: "Suggest failed" }, { status });
+  }
+}
@@ -1,4 +1,4 @@
-import { ApiError, getRandomIdiom, searchIdioms } from "@/lib/api";
+import { ApiError, getRandomIdioms, searchIdioms } from "@/lib/api";
 import { IdiomList } from "@/components/IdiomList";
 import { SearchBar } from "@/components/SearchBar";
 import { AppHeader } from "@/components/AppHeader";
@@ -25,8 +25,7 @@ export default async function Home({ searchParams }: HomeProps) {
 
   if (isRandom && token) {
     try {
-      const idiom = await getRandomIdiom(token);
-      results = [idiom];
+      results = await getRandomIdioms(token);
     } catch (error) {
       if (error instanceof ApiError && error.status === 401) {
         results = [];
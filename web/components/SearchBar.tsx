@@ -3,6 +3,9 @@
 import { useRouter } from "next/navigation";
 import { useEffect, useState } from "react";
 
+// Delay after the last keystroke before suggestions are requested
+const SUGGEST_DEBOUNCE_MS = 150;
+
 type SearchBarProps = {
   initialQuery?: string;
   initialLimit?: number;
@@ -11,6 +14,7 @@ type SearchBarProps = {
 export function SearchBar({ initialQuery = "", initialLimit = 10 }: SearchBarProps) {
   const [query, setQuery] = useState(initialQuery);
   const [limit, setLimit] = useState(initialLimit);
+  const [suggestions, setSuggestions] = useState<string[]>([]);
   const router = useRouter();
 
   useEffect(() => {
@@ -18,6 +22,33 @@ export function SearchBar({ initialQuery = "", initialLimit = 10 }: SearchBarPro
     setLimit(initialLimit);
   }, [initialQuery, initialLimit]);
 
+  useEffect(() => {
+    const prefix = query.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const res = await fetch(`/api/suggest?q=${encodeURIComponent(prefix)}`, {
+          signal: controller.signal,
+        });
+        if (res.ok) {
+          setSuggestions(await res.json());
+        }
+      } catch {
+        // Suggestions are best effort; aborted or failed requests leave the list unchanged
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [query]);
+
   function onSubmit(e: React.SubmitEvent) {
     e.preventDefault();
     if (!query.trim()) return;
@@ -35,8 +66,15 @@ export function SearchBar({ initialQuery = "", initialLimit = 10 }: SearchBarPro
           className="flex-1 border rounded px-4 py-2"
           placeholder="Search idioms..."
           value={query}
+          list="idiom-suggestions"
+          autoComplete="off"
           onChange={(e) => setQuery(e.target.value)}
         />
+        <datalist id="idiom-suggestions">
+          {suggestions.map((suggestion) => (
+            <option key={suggestion} value={suggestion} />
+          ))}
+        </datalist>
         <button
           className="bg-black text-white px-4 py-2 rounded"
           type="submit"
@@ -104,6 +104,26 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/idioms/suggest": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Complete a partially typed idiom for search-as-you-type
+         * @description Idioms starting with the typed text come first, followed by idioms containing a word that starts with it, e.g. 'thin ice' suggests 'skating on thin ice'. Only idiom texts are returned, to keep responses small.
+         */
+        get: operations["suggest_idioms_idioms_suggest_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/idioms/random": {
         parameters: {
             query?: never;
@@ -112,8 +132,8 @@ export interface paths {
             cookie?: never;
         };
         /**
-         * Return a random idiom from the collection
-         * @description This is a fun way to learn a new figure of speech that you may not have known.
+         * Return random idioms from the collection
+         * @description This is a fun way to learn a new figure of speech that you may not have known. Providing a seed, e.g. today's date, returns the same idioms for as long as the collection is unchanged.
          */
         get: operations["get_random_idiom_idioms_random_get"];
         put?: never;
@@ -510,9 +530,55 @@ export interface operations {
             };
         };
     };
+    suggest_idioms_idioms_suggest_get: {
+        parameters: {
+            query: {
+                /** @description Text typed so far */
+                q: string;
+                /** @description Maximum number of suggestions to return */
+                limit?: number;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": string[];
+                };
+            };
+            /** @description Rate limit exceeded or service busy */
+            429: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_random_idiom_idioms_random_get: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description Number of distinct idioms to return */
+                count?: number;
+                /** @description Seed for a reproducible selection */
+                seed?: string | null;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -525,7 +591,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Idiom"];
+                    "application/json": components["schemas"]["Idiom"][];
                 };
             };
             /** @description No idioms available */
@@ -535,6 +601,15 @@ export interface operations {
                 };
                 content?: never;
             };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
         };
     };
     get_idioms_starting_with_letter_idioms_by_letter__starting_letter__get: {
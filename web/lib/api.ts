@@ -22,6 +22,9 @@ type TokenResponse =
 type SearchResponse =
   paths["/idioms/search/{search_phrase}"]["get"]["responses"]["200"]["content"]["application/json"];
 
+type SuggestResponse =
+  paths["/idioms/suggest"]["get"]["responses"]["200"]["content"]["application/json"];
+
 type RandomResponse =
   paths["/idioms/random"]["get"]["responses"]["200"]["content"]["application/json"];
 
@@ -108,10 +111,32 @@ export async function searchIdioms(
   return res.json();
 }
 
-export async function getRandomIdiom(
-  token: string
+export async function suggestIdioms(
+  prefix: string,
+  token: string,
+  limit = 8
+): Promise<SuggestResponse> {
+  const url = `${API_URL}/idioms/suggest?q=${encodeURIComponent(prefix)}&limit=${limit}`;
+
+  const res = await fetch(url, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+    cache: "no-store",
+  });
+
+  if (!res.ok) {
+    throw new ApiError(res.status, `Suggest failed: ${res.status}`);
+  }
+
+  return res.json();
+}
+
+export async function getRandomIdioms(
+  token: string,
+  count = 1
 ): Promise<RandomResponse> {
-  const res = await fetch(`${API_URL}/idioms/random`, {
+  const res = await fetch(`${API_URL}/idioms/random?count=${count}`, {
     headers: {
       Authorization: `Bearer ${token}`,
     },